@@ -0,0 +1,83 @@
+"""Time the agent's intent routing.
+
+Times IntentRouter.route against the previous per-request sequence of
+regex scans over the routing corpus from tests/test_intent_router.py,
+which is where routing correctness is checked. Needs no database or LLM.
+Run from the financial_assistant directory:
+
+    python -m benchmarks.bench_intent_router --rounds 2000
+"""
+import argparse
+import re
+import time
+from src.agent.intent_router import IntentRouter
+from src.market.symbol_index import get_shared_symbol_index
+from tests.test_intent_router import CORPUS
+
+
+def legacy_route(query: str) -> str:
+    """The routing process_request did before IntentRouter, rebuilt per call as it was."""
+    query_lower = query.lower().strip()
+    words = query.lower().split()
+    if 'buy' in words or 'sell' in words:
+        return "trade"
+    casual_patterns = {
+        r'\b(hi|hello|hey)\b': "greeting",
+        r'\b(how are you|how\'s it going)\b': "how_are_you",
+        r'\b(thank you|thanks)\b': "thanks",
+        r'\b(bye|goodbye)\b': "goodbye",
+    }
+    for pattern, intent in casual_patterns.items():
+        if re.search(pattern, query_lower):
+            return intent
+    market_patterns = {
+        r'\b(how.*market|what.*market|market.*today)\b': "market_summary",
+        r'\b(market.*analysis|market.*overview)\b': "market_summary",
+    }
+    for pattern, intent in market_patterns.items():
+        if re.search(pattern, query_lower):
+            return intent
+    simple_commands = {
+        'balance', 'portfolio', 'my balance', 'show balance', 'check balance',
+        'show portfolio', 'my portfolio', 'watchlist', 'my watchlist', 'help',
+    }
+    if query_lower in simple_commands:
+        return "command"
+    watchlist_patterns = [
+        (r'add\s+(\w+)\s+to\s+watchlist', 'watch_add'),
+        (r'watch\s+(\w+)', 'watch_add'),
+        (r'remove\s+(\w+)\s+from\s+watchlist', 'watch_remove'),
+        (r'unwatch\s+(\w+)', 'watch_remove')
+    ]
+    for pattern, intent in watchlist_patterns:
+        if re.search(pattern, query_lower):
+            return intent
+    if query_lower.startswith('quote '):
+        return "quote"
+    return "llm"
+
+
+def per_query_us(route, rounds: int) -> float:
+    queries = [query for query, _, _ in CORPUS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            route(query)
+    return (time.perf_counter() - start) / (rounds * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    router = IntentRouter(get_shared_symbol_index())
+
+    legacy = per_query_us(legacy_route, args.rounds)
+    compiled = per_query_us(router.route, args.rounds)
+    print(f"legacy sequential scans  {legacy:7.2f} us/query")
+    print(f"IntentRouter.route       {compiled:7.2f} us/query  ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Compare a burst of LLM requests sent straight to the server with the same burst through LLMScheduler.
+
+The server is simulated: it runs ``--slots`` generations at once (like
+OLLAMA_NUM_PARALLEL) and queues the rest first come, first served, with no
+idea of priority or of clients that have already given up; a client only
+notices its deadline once its first token arrives. The burst mixes trade,
+account and chat questions, some of them asked by several users at once.
+For each mode it reports how many requests got a first token within the
+deadline, were turned away up front, or timed out, and time-to-first-token
+percentiles overall and for trade questions. Needs no Ollama. Run from the
+financial_assistant directory:
+
+    python -m benchmarks.bench_llm_scheduler --requests 60 --slots 2
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from src.agent.llm_scheduler import (
+    LLMScheduler, SchedulerBusy, RequestExpired, PRIORITY_TRADE, PRIORITY_ACCOUNT, PRIORITY_CHAT
+)
+
+
+class SimulatedServer:
+    def __init__(self, slots: int, prefill: float, token_time: float, tokens: int):
+        self.prefill = prefill
+        self.token_time = token_time
+        self.tokens = tokens
+        self.generations = 0
+        self._slots = threading.Semaphore(slots)
+        self._lock = threading.Lock()
+
+    def stream(self, inputs):
+        with self._slots:
+            with self._lock:
+                self.generations += 1
+            time.sleep(self.prefill)
+            for i in range(self.tokens):
+                yield f"{inputs['query']}:{i} "
+                time.sleep(self.token_time)
+
+
+def make_burst(count: int, duplicates: float, seed: int):
+    """(priority, query) pairs; a share of chat questions repeat an earlier one."""
+    rng = random.Random(seed)
+    burst = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.15:
+            burst.append((PRIORITY_TRADE, f"trade-{i}"))
+        elif roll < 0.45:
+            burst.append((PRIORITY_ACCOUNT, f"account-{i}"))
+        elif rng.random() < duplicates and any(p == PRIORITY_CHAT for p, _ in burst):
+            burst.append(rng.choice([item for item in burst if item[0] == PRIORITY_CHAT]))
+        else:
+            burst.append((PRIORITY_CHAT, f"chat-{i}"))
+    return burst
+
+
+def run_burst(burst, call, deadline: float, spread: float) -> list:
+    """Fire the burst over ``spread`` seconds; returns (priority, outcome, ttft) per request."""
+    results = [None] * len(burst)
+
+    def client(index, priority, query):
+        start = time.perf_counter()
+        stream = call(priority, query)
+        try:
+            first = next(stream, None)
+            ttft = time.perf_counter() - start
+            if first is None or ttft > deadline:
+                results[index] = (priority, "timed out", ttft)
+            else:
+                for _ in stream:
+                    pass
+                results[index] = (priority, "answered", ttft)
+        except SchedulerBusy:
+            results[index] = (priority, "turned away", time.perf_counter() - start)
+        except RequestExpired:
+            results[index] = (priority, "timed out", time.perf_counter() - start)
+        finally:
+            stream.close()
+
+    threads = []
+    for index, (priority, query) in enumerate(burst):
+        thread = threading.Thread(target=client, args=(index, priority, query))
+        thread.start()
+        threads.append(thread)
+        time.sleep(spread / len(burst))
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(label: str, results: list, server: SimulatedServer, elapsed: float) -> None:
+    outcomes = {}
+    for _, outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    answered = [ttft for _, outcome, ttft in results if outcome == "answered"]
+    trades = [ttft for priority, outcome, ttft in results if priority == PRIORITY_TRADE and outcome == "answered"]
+    print(f"\n{label}  ({elapsed:.1f}s, {server.generations} generations)")
+    print("  " + ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())))
+    print(f"  TTFT p50 {percentile(answered, 0.5):.2f}s  p95 {percentile(answered, 0.95):.2f}s"
+          f"  mean {statistics.mean(answered) if answered else float('nan'):.2f}s")
+    print(f"  trade TTFT p95 {percentile(trades, 0.95):.2f}s over {len(trades)} answered trades")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--slots", type=int, default=2)
+    parser.add_argument("--deadline", type=float, default=2.0, help="seconds allowed until the first token")
+    parser.add_argument("--spread", type=float, default=0.5, help="seconds over which the burst arrives")
+    parser.add_argument("--prefill", type=float, default=0.1)
+    parser.add_argument("--token-time", type=float, default=0.005)
+    parser.add_argument("--tokens", type=int, default=40)
+    parser.add_argument("--duplicates", type=float, default=0.3, help="share of chat questions that repeat")
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    burst = make_burst(args.requests, args.duplicates, args.seed)
+
+    def server():
+        return SimulatedServer(args.slots, args.prefill, args.token_time, args.tokens)
+
+    direct_server = server()
+    start = time.perf_counter()
+    results = run_burst(burst, lambda priority, query: direct_server.stream({"query": query}),
+                        args.deadline, args.spread)
+    report("direct to server", results, direct_server, time.perf_counter() - start)
+
+    scheduled_server = server()
+    scheduler = LLMScheduler(scheduled_server.stream, parallelism=args.slots, max_queue=args.max_queue,
+                             default_timeout=args.deadline)
+    start = time.perf_counter()
+    results = run_burst(
+        burst,
+        lambda priority, query: scheduler.stream({"query": query}, priority, key=query),
+        args.deadline, args.spread
+    )
+    report("through LLMScheduler", results, scheduled_server, time.perf_counter() - start)
+    stats = scheduler.get_stats()
+    print(f"  queue depth max {stats['max_queue_depth']}, wait p50 {stats['wait_p50_ms']:.0f}ms "
+          f"p95 {stats['wait_p95_ms']:.0f}ms, {stats['coalesced']} coalesced, "
+          f"{stats['shed']} shed, {stats['rejected']} rejected, {stats['expired']} expired")
+    scheduler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measure cold and warm time-to-first-token of the agent's LLM chain.
+
+Cold: the model is unloaded first (keep_alive=0), so the request pays the
+model load plus a full prefill. Warm: the model is resident and the static
+instruction prefix is already in Ollama's KV cache, so only the
+per-request context is prefilled. Each run uses a different query and
+context so the numbers reflect prefix reuse rather than a repeated prompt.
+Needs a running Ollama with the OLLAMA_MODEL pulled. Run from the
+financial_assistant directory:
+
+    python -m benchmarks.bench_llm_ttft --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import urllib.request
+from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from src.agent.finance_agent import PROMPT_TEMPLATE, create_llm
+
+QUERIES = [
+    "Explain the P/E ratio in two sentences.",
+    "What is a stop loss order?",
+    "How do dividends affect a stock's price?",
+    "What does market capitalization mean?",
+    "Why do bond prices fall when rates rise?",
+]
+
+
+def unload_model() -> None:
+    """Ask Ollama to drop the model from memory right away."""
+    request = urllib.request.Request(
+        os.getenv("OLLAMA_BASE_URL", "http://localhost:11434") + "/api/generate",
+        data=json.dumps({
+            "model": os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct-q4_0"),
+            "keep_alive": 0
+        }).encode(),
+        headers={"Content-Type": "application/json"}
+    )
+    urllib.request.urlopen(request).read()
+
+
+def time_to_first_token(chain, run: int) -> float:
+    """Seconds until the chain yields its first chunk; the rest of the stream is drained."""
+    inputs = {
+        "query": QUERIES[run % len(QUERIES)],
+        "current_time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "user_data": f"Account B{run:04d} | Balance ${10000 + run * 250:,.2f}",
+        "market_data": f"Market OPEN\nQuotes: symbol | price | change%\nS&P 500 (^GSPC) | {4900 + run:.2f} | +0.75",
+        "chat_history": "None",
+    }
+    start = time.perf_counter()
+    first = None
+    for _ in chain.stream(inputs):
+        if first is None:
+            first = time.perf_counter() - start
+    return first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Short answers keep the benchmark about prefill, not generation
+    llm = create_llm()
+    llm.num_predict = 32
+    chain = PromptTemplate.from_template(PROMPT_TEMPLATE) | llm | StrOutputParser()
+
+    cold = []
+    for run in range(args.runs):
+        unload_model()
+        cold.append(time_to_first_token(chain, run))
+
+    warm = [time_to_first_token(chain, run) for run in range(args.runs)]
+
+    for label, samples in (("cold (model unloaded)", cold), ("warm (prefix cached)", warm)):
+        print(f"{label:<24} median {statistics.median(samples) * 1000:8.0f} ms   "
+              f"min {min(samples) * 1000:8.0f} ms   max {max(samples) * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
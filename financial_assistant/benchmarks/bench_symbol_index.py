@@ -0,0 +1,95 @@
+"""Time SymbolIndex lookups over a universe the size of a full NSE/BSE/US listing.
+
+Writes a synthetic universe of ``--size`` listings (the bundled
+data/symbols.csv plus generated tickers, half of them dual-listed with .NS
+and .BO suffixes) to a temporary CSV, loads it, then times exact lookup,
+prefix search, fuzzy company-name search and ticker/name extraction from
+free text. Needs no database or network. Run from the financial_assistant
+directory:
+
+    python -m benchmarks.bench_symbol_index --size 40000
+"""
+import argparse
+import csv
+import os
+import random
+import string
+import tempfile
+import time
+from src.market.symbol_index import DEFAULT_PATH, SymbolIndex
+
+NAME_WORDS = [
+    "global", "united", "national", "first", "pacific", "atlantic", "northern", "southern", "prime",
+    "capital", "energy", "power", "steel", "cement", "pharma", "motors", "textiles", "chemicals",
+    "foods", "realty", "finance", "logistics", "infra", "systems", "software", "networks", "metals",
+    "agro", "paper", "sugar", "retail", "media", "health", "labs", "solar", "green", "ocean", "star",
+]
+SECTORS = ["Technology", "Financial", "Consumer", "Healthcare", "Industrial", "Energy", "Materials"]
+TEXTS = [
+    "Should I buy more RELIANCE or switch to TCS.NS before results?",
+    "How did Apple and Microsoft do against the Nasdaq this week?",
+    "compare tata consultancy services with infosys on margins",
+    "I think it is a good time to sell some F and buy GM",
+    "what's the outlook for state bank of india and HDFCBANK.BO",
+]
+
+
+def write_universe(path: str, size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(DEFAULT_PATH, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    seen = {row["symbol"] for row in rows}
+    while len(rows) < size:
+        base = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 9)))
+        name = " ".join(word.capitalize() for word in rng.sample(NAME_WORDS, rng.randint(2, 3))) + " Limited"
+        sector = rng.choice(SECTORS)
+        listings = [(base + ".NS", "NSE"), (base + ".BO", "BSE")] if rng.random() < 0.5 else [(base, "US")]
+        for symbol, exchange in listings:
+            if symbol not in seen:
+                seen.add(symbol)
+                rows.append({"symbol": symbol, "name": name, "exchange": exchange, "sector": sector})
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["symbol", "name", "exchange", "sector"])
+        writer.writeheader()
+        writer.writerows(rows[:size])
+
+
+def per_call_us(call, args: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for arg in args:
+            call(arg)
+    return (time.perf_counter() - start) / (rounds * len(args)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=40000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_universe(path, args.size, args.seed)
+        start = time.perf_counter()
+        index = SymbolIndex.from_csv(path)
+        print(f"loaded {len(index):,} listings in {(time.perf_counter() - start) * 1000:.0f} ms")
+    finally:
+        os.remove(path)
+
+    symbols = [info.symbol for info in index][:: max(1, len(index) // 200)]
+    print(f"exact lookup      {per_call_us(index.get, symbols, args.rounds):8.2f} us")
+    print(f"resolve bare/name {per_call_us(index.resolve, ['reliance', 'infy', 'apple', 'tcs', 'GE'], args.rounds):8.2f} us")
+    prefixes = ["TA", "REL", "hdfc", "global cap", "star"]
+    print(f"prefix search     {per_call_us(index.search_prefix, prefixes, args.rounds // 10 or 1):8.2f} us")
+    misspelt = ["microsfot", "relianse industries", "tata consultansy", "infosis", "pacifc steel"]
+    print(f"fuzzy name search {per_call_us(index.search_name, misspelt, args.rounds // 10 or 1):8.2f} us")
+    print(f"extract from text {per_call_us(index.extract, TEXTS, args.rounds):8.2f} us")
+    for text in TEXTS:
+        print(f"  {text!r} -> {index.extract(text)}")
+
+
+if __name__ == "__main__":
+    main()
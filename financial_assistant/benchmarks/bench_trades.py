@@ -0,0 +1,65 @@
+"""Compare trade throughput of the multi-statement and single-round-trip paths.
+
+The account cache is turned off so every read goes to the database. Needs
+a reachable Postgres configured through the usual DB_* variables with
+migrations/001_execute_trade_function.sql applied. Run from the
+financial_assistant directory:
+
+    python -m benchmarks.bench_trades --trades 500
+"""
+import argparse
+import os
+import time
+import uuid
+from src.database.database_manager import DatabaseManager
+from src.market.providers import FixtureProvider
+
+
+def run_trades(db: DatabaseManager, account_number: str, trades: int, use_function: bool) -> float:
+    """Alternate BUY/SELL orders and return trades per second."""
+    db.use_trade_function = use_function
+    execute = db._execute_trade_function if use_function else db._execute_trade_statements
+
+    start = time.perf_counter()
+    for i in range(trades):
+        trade_type = 'BUY' if i % 2 == 0 else 'SELL'
+        result = execute(account_number, trade_type, 'BENCH', 10, 100.0)
+        if result["status"] != "success":
+            raise RuntimeError(f"Trade {i} failed: {result['message']}")
+    return trades / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trades", type=int, default=500)
+    args = parser.parse_args()
+
+    # Cached reads would time cache hits rather than database round trips
+    os.environ["ACCOUNT_CACHE_TTL"] = "0"
+    db = DatabaseManager(provider=FixtureProvider({"BENCH": {"price": 100.0}}))
+    account_number = f"B{uuid.uuid4().hex[:12]}"
+    db.execute_query(
+        "INSERT INTO users (account_number, email, password, balance) VALUES (%s, %s, %s, %s)",
+        (account_number, f"{account_number}@bench.local", "x", 10_000_000),
+        fetch=False
+    )
+
+    try:
+        # Warm up the pool and the server's plan cache before timing
+        run_trades(db, account_number, 20, use_function=False)
+        run_trades(db, account_number, 20, use_function=True)
+
+        statements_tps = run_trades(db, account_number, args.trades, use_function=False)
+        function_tps = run_trades(db, account_number, args.trades, use_function=True)
+
+        print(f"Multi-statement path:      {statements_tps:8.1f} trades/s")
+        print(f"Single-round-trip function: {function_tps:8.1f} trades/s")
+        print(f"Speed-up:                   {function_tps / statements_tps:8.2f}x")
+    finally:
+        for table in ("last_trade", "transactions", "portfolio", "users"):
+            db.execute_query(f"DELETE FROM {table} WHERE account_number = %s", (account_number,), fetch=False)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
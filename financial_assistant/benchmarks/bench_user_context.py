@@ -0,0 +1,91 @@
+"""Compare latency of the agent's old and new per-request user context loads.
+
+The old path is get_user + get_portfolio + get_watchlist (three round trips
+on separate connections); the new one is load_user_context. Quotes come
+from a fixture provider and the account cache is turned off, so only
+database time is measured. Needs a reachable Postgres configured through
+the usual DB_* variables with the migrations applied. Run from the
+financial_assistant directory:
+
+    python -m benchmarks.bench_user_context --requests 500 --positions 20
+"""
+import argparse
+import os
+import statistics
+import time
+import uuid
+from src.database.database_manager import DatabaseManager
+from src.market.providers import FixtureProvider
+
+
+def old_context(db: DatabaseManager, account_number: str) -> None:
+    db.get_portfolio(account_number)
+    db.get_watchlist(account_number)
+    db.get_user(account_number)
+
+
+def new_context(db: DatabaseManager, account_number: str) -> None:
+    db.load_user_context(account_number)
+
+
+def measure(load, db: DatabaseManager, account_number: str, requests: int) -> list:
+    """Return per-request latencies in milliseconds."""
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        load(db, account_number)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<30} p50 {statistics.median(ordered):7.2f} ms   p95 {p95:7.2f} ms   "
+          f"mean {statistics.fmean(ordered):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--watchlist", type=int, default=10)
+    args = parser.parse_args()
+
+    symbols = [f"B{i:03d}" for i in range(max(args.positions, args.watchlist))]
+    # Cached reads would time cache hits rather than database round trips
+    os.environ["ACCOUNT_CACHE_TTL"] = "0"
+    db = DatabaseManager(provider=FixtureProvider({symbol: {"price": 100.0} for symbol in symbols}))
+    account_number = f"B{uuid.uuid4().hex[:12]}"
+    db.execute_query(
+        "INSERT INTO users (account_number, email, password, balance) VALUES (%s, %s, %s, %s)",
+        (account_number, f"{account_number}@bench.local", "x", 10_000_000),
+        fetch=False
+    )
+
+    try:
+        orders = [
+            {"trade_type": "BUY", "symbol": symbol, "shares": 10, "price": 100.0}
+            for symbol in symbols[:args.positions]
+        ]
+        if orders:
+            result = db.execute_trades(account_number, orders)
+            if result["status"] != "success":
+                raise RuntimeError(result["message"])
+        for symbol in symbols[:args.watchlist]:
+            db.add_to_watchlist(account_number, symbol)
+
+        # Warm up the pool, quote cache and the server's plan cache before timing
+        measure(old_context, db, account_number, 20)
+        measure(new_context, db, account_number, 20)
+
+        report("get_user+portfolio+watchlist", measure(old_context, db, account_number, args.requests))
+        report("load_user_context", measure(new_context, db, account_number, args.requests))
+    finally:
+        for table in ("watchlist", "last_trade", "transactions", "portfolio", "users"):
+            db.execute_query(f"DELETE FROM {table} WHERE account_number = %s", (account_number,), fetch=False)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Check that AsyncDatabaseManager returns what DatabaseManager returns.
+
+Runs the same scripted session (signup, login, deposit, trades, a basket,
+watchlist and chat history, plus the error paths) through both managers
+on two throwaway accounts, then compares every result after masking the
+values that legitimately differ (ids, account numbers, timestamps, session
+tokens). Quotes come from a fixture provider. This is the opt-in live
+counterpart of tests/test_manager_parity.py and tests/test_basket.py,
+which need no database. Needs a reachable Postgres configured through
+the usual DB_* variables with the migrations applied. Run from the
+financial_assistant directory:
+
+    python -m benchmarks.check_async_parity
+"""
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+from src.database.database_manager import DatabaseManager
+from src.database.async_database_manager import AsyncDatabaseManager
+from src.market.providers import FixtureProvider
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL"]
+VOLATILE_KEYS = {
+    "id", "transaction_id", "transaction_ids", "session_token", "created_at", "last_login",
+    "last_updated", "last_transaction_date", "added_date", "timestamp",
+}
+
+
+def mask(value, account_number: str, email: str):
+    """Replace values that differ between two otherwise identical accounts."""
+    if isinstance(value, dict):
+        return {
+            key: "<masked>" if key in VOLATILE_KEYS else mask(item, account_number, email)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [mask(item, account_number, email) for item in value]
+    if isinstance(value, str):
+        return value.replace(account_number, "<account>").replace(email, "<email>")
+    if isinstance(value, datetime):
+        return "<masked>"
+    return value
+
+
+def scenario(account_number: str, email: str):
+    """The calls to compare, as (label, method name, positional arguments)."""
+    return [
+        ("create_user", "create_user", ({"account_number": account_number, "email": email,
+                                         "password": "parity-pass", "balance": 1000},)),
+        ("duplicate signup", "create_user", ({"account_number": account_number + "X", "email": email,
+                                              "password": "parity-pass"},)),
+        ("bad login", "validate_login", (email, "wrong")),
+        ("login", "validate_login", (email, "parity-pass")),
+        ("deposit", "deposit", (account_number, 5000.25)),
+        ("negative deposit", "deposit", (account_number, -1)),
+        ("buy", "execute_trade", (account_number, "BUY", "AAPL", 10, 150.0)),
+        ("buy more", "execute_trade", (account_number, "BUY", "AAPL", 5, 160.5)),
+        ("oversell", "execute_trade", (account_number, "SELL", "AAPL", 100, 150.0)),
+        ("overspend", "execute_trade", (account_number, "BUY", "MSFT", 1000, 400.0)),
+        ("sell", "execute_trade", (account_number, "SELL", "AAPL", 3, 155.0)),
+        ("basket", "execute_trades", (account_number, [
+            {"trade_type": "SELL", "symbol": "AAPL", "shares": 12, "price": 151.0},
+            {"trade_type": "BUY", "symbol": "MSFT", "shares": 4, "price": 410.0},
+            {"trade_type": "BUY", "symbol": "GOOGL", "shares": 7, "price": 140.25},
+        ])),
+        ("short basket", "execute_trades", (account_number, [
+            {"trade_type": "SELL", "symbol": "MSFT", "shares": 5, "price": 410.0},
+        ])),
+        ("empty basket", "execute_trades", (account_number, [])),
+        ("watch", "add_to_watchlist", (account_number, "MSFT")),
+        ("watch twice", "add_to_watchlist", (account_number, "MSFT")),
+        ("watch another", "add_to_watchlist", (account_number, "GOOGL")),
+        ("unwatch", "remove_from_watchlist", (account_number, "GOOGL")),
+        ("unwatch missing", "remove_from_watchlist", (account_number, "GOOGL")),
+        ("chat user", "save_chat_message", (account_number, "user", "show my portfolio")),
+        ("chat assistant", "save_chat_message", (account_number, "assistant", "Here it is.")),
+        ("user", "get_user", (account_number,)),
+        ("portfolio", "get_portfolio", (account_number,)),
+        ("watchlist", "get_watchlist", (account_number,)),
+        ("context", "load_user_context", (account_number,)),
+        ("chat history", "get_chat_history", (account_number,)),
+        ("quote", "get_real_time_quote", ("MSFT",)),
+    ]
+
+
+def run_sync(db: DatabaseManager, account_number: str, email: str) -> list:
+    results = []
+    for label, method, args in scenario(account_number, email):
+        try:
+            results.append((label, getattr(db, method)(*args)))
+        except Exception as e:
+            results.append((label, f"raised: {e}"))
+    return results
+
+
+async def run_async(db: AsyncDatabaseManager, account_number: str, email: str) -> list:
+    results = []
+    for label, method, args in scenario(account_number, email):
+        try:
+            results.append((label, await getattr(db, method)(*args)))
+        except Exception as e:
+            results.append((label, f"raised: {e}"))
+    return results
+
+
+def cleanup(db: DatabaseManager, account_number: str) -> None:
+    for table in ("chat_history", "watchlist", "last_trade", "transactions", "portfolio", "users"):
+        db.execute_query(f"DELETE FROM {table} WHERE account_number = %s", (account_number,), fetch=False)
+
+
+async def main() -> int:
+    provider = FixtureProvider({symbol: {"price": 150.0 + i * 100} for i, symbol in enumerate(SYMBOLS)})
+    sync_db = DatabaseManager(provider=provider)
+    async_db = AsyncDatabaseManager(provider=provider)
+
+    tag = uuid.uuid4().hex[:10]
+    sync_account, async_account = f"PS{tag}", f"PA{tag}"
+    sync_email, async_email = f"{sync_account}@parity.local", f"{async_account}@parity.local"
+
+    mismatches = 0
+    try:
+        expected = run_sync(sync_db, sync_account, sync_email)
+        actual = await run_async(async_db, async_account, async_email)
+        for (label, want), (_, got) in zip(expected, actual):
+            want = mask(want, sync_account, sync_email)
+            got = mask(got, async_account, async_email)
+            if want == got:
+                print(f"ok        {label}")
+            else:
+                mismatches += 1
+                print(f"MISMATCH  {label}\n  sync:  {want!r}\n  async: {got!r}")
+    finally:
+        await async_db.close()
+        for account_number in (sync_account, async_account):
+            cleanup(sync_db, account_number)
+        sync_db.close()
+
+    print(f"\n{len(expected) - mismatches}/{len(expected)} calls match")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -20,7 +20,7 @@ CREATE TABLE transactions (
     transaction_id SERIAL PRIMARY KEY,
     account_number VARCHAR(20) REFERENCES users(account_number),
     transaction_type VARCHAR(20) NOT NULL,  -- 'BUY', 'SELL', 'DEPOSIT', 'WITHDRAW'
-    stock_symbol VARCHAR(10),
+    stock_symbol VARCHAR(20),
     shares INTEGER,
     price_per_share DECIMAL(10, 2),
     total_amount DECIMAL(15, 2) NOT NULL,
@@ -32,7 +32,7 @@ CREATE TABLE transactions (
 CREATE TABLE portfolio (
     id SERIAL PRIMARY KEY,
     account_number VARCHAR(20) REFERENCES users(account_number),
-    stock_symbol VARCHAR(10) NOT NULL,
+    stock_symbol VARCHAR(20) NOT NULL,
     shares INTEGER NOT NULL,
     average_price DECIMAL(10, 2) NOT NULL,
     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -43,7 +43,7 @@ CREATE TABLE portfolio (
 CREATE TABLE watchlist (
     id SERIAL PRIMARY KEY,
     account_number VARCHAR(20) REFERENCES users(account_number),
-    stock_symbol VARCHAR(10) NOT NULL,
+    stock_symbol VARCHAR(20) NOT NULL,
     added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(account_number, stock_symbol)
 );
@@ -55,4 +55,10 @@ CREATE TABLE chat_history (
     message_type VARCHAR(10) NOT NULL,  -- 'USER' or 'ASSISTANT'
     message TEXT NOT NULL,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+);
+
+-- Apply migrations (paths are relative to this file)
+\ir migrations/001_execute_trade_function.sql
+\ir migrations/002_portfolio_indexes_last_trade.sql
+\ir migrations/003_chat_history_partitioning.sql
+\ir migrations/004_account_change_notify.sql
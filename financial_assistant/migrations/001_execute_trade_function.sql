@@ -0,0 +1,80 @@
+-- Single-round-trip trade execution.
+-- Validates the order and applies the balance, portfolio and transaction
+-- writes in one call, returning the new transaction id and balance.
+
+CREATE OR REPLACE FUNCTION execute_trade(
+    p_account_number VARCHAR(20),
+    p_trade_type VARCHAR(20),
+    p_symbol VARCHAR(20),
+    p_shares INTEGER,
+    p_price DECIMAL(10, 2)
+)
+RETURNS TABLE (transaction_id INTEGER, new_balance DECIMAL(15, 2))
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_total DECIMAL(15, 2) := p_shares * p_price;
+    v_balance DECIMAL(15, 2);
+    v_current_shares INTEGER;
+BEGIN
+    IF p_trade_type NOT IN ('BUY', 'SELL') THEN
+        RAISE EXCEPTION 'Unsupported trade type: %', p_trade_type;
+    END IF;
+
+    -- Lock the account first so concurrent trades on it serialize
+    SELECT u.balance INTO v_balance
+    FROM users u
+    WHERE u.account_number = p_account_number
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Account not found';
+    END IF;
+
+    SELECT COALESCE(SUM(p.shares), 0) INTO v_current_shares
+    FROM portfolio p
+    WHERE p.account_number = p_account_number AND p.stock_symbol = p_symbol;
+
+    IF p_trade_type = 'SELL' AND v_current_shares < p_shares THEN
+        RAISE EXCEPTION E'Insufficient shares for this trade.\nRequired: % shares\nAvailable: % shares',
+            p_shares, v_current_shares;
+    END IF;
+
+    IF p_trade_type = 'BUY' THEN
+        IF v_balance < v_total THEN
+            RAISE EXCEPTION E'Insufficient funds for this trade.\nRequired: $%\nAvailable: $%',
+                to_char(v_total, 'FM999999999990.00'), to_char(v_balance, 'FM999999999990.00');
+        END IF;
+
+        UPDATE users u SET balance = u.balance - v_total
+        WHERE u.account_number = p_account_number
+        RETURNING u.balance INTO v_balance;
+
+        INSERT INTO portfolio AS p (account_number, stock_symbol, shares, average_price)
+        VALUES (p_account_number, p_symbol, p_shares, p_price)
+        ON CONFLICT (account_number, stock_symbol) DO UPDATE
+        SET shares = p.shares + EXCLUDED.shares,
+            average_price = (p.average_price * p.shares + v_total) / (p.shares + EXCLUDED.shares),
+            last_updated = CURRENT_TIMESTAMP;
+    ELSE
+        UPDATE users u SET balance = u.balance + v_total
+        WHERE u.account_number = p_account_number
+        RETURNING u.balance INTO v_balance;
+
+        UPDATE portfolio p
+        SET shares = p.shares - p_shares,
+            last_updated = CURRENT_TIMESTAMP
+        WHERE p.account_number = p_account_number AND p.stock_symbol = p_symbol;
+
+        -- Clean up zero positions
+        DELETE FROM portfolio p
+        WHERE p.account_number = p_account_number AND p.stock_symbol = p_symbol AND p.shares <= 0;
+    END IF;
+
+    RETURN QUERY
+    INSERT INTO transactions AS t
+        (account_number, transaction_type, stock_symbol, shares, price_per_share, total_amount)
+    VALUES (p_account_number, p_trade_type, p_symbol, p_shares, p_price, v_total)
+    RETURNING t.transaction_id, v_balance;
+END;
+$$;
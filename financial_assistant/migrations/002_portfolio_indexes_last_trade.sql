@@ -0,0 +1,116 @@
+-- Keep portfolio reads proportional to the account's own positions.
+-- Adds composite indexes for per-account transaction lookups and a
+-- last_trade table holding the most recent trade per account and symbol,
+-- maintained by execute_trade() instead of scanning transactions.
+
+CREATE INDEX IF NOT EXISTS idx_transactions_account_symbol_date
+    ON transactions (account_number, stock_symbol, transaction_date DESC);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_account_date
+    ON transactions (account_number, transaction_date DESC);
+
+CREATE TABLE IF NOT EXISTS last_trade (
+    account_number VARCHAR(20) REFERENCES users(account_number),
+    stock_symbol VARCHAR(20) NOT NULL,
+    transaction_id INTEGER NOT NULL REFERENCES transactions(transaction_id),
+    price_per_share DECIMAL(10, 2) NOT NULL,
+    transaction_date TIMESTAMP NOT NULL,
+    PRIMARY KEY (account_number, stock_symbol)
+);
+
+-- Backfill from existing history (one pass, using the index above)
+INSERT INTO last_trade (account_number, stock_symbol, transaction_id, price_per_share, transaction_date)
+SELECT DISTINCT ON (account_number, stock_symbol)
+    account_number, stock_symbol, transaction_id, price_per_share, transaction_date
+FROM transactions
+WHERE transaction_type IN ('BUY', 'SELL') AND stock_symbol IS NOT NULL
+ORDER BY account_number, stock_symbol, transaction_date DESC, transaction_id DESC
+ON CONFLICT (account_number, stock_symbol) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION execute_trade(
+    p_account_number VARCHAR(20),
+    p_trade_type VARCHAR(20),
+    p_symbol VARCHAR(20),
+    p_shares INTEGER,
+    p_price DECIMAL(10, 2)
+)
+RETURNS TABLE (transaction_id INTEGER, new_balance DECIMAL(15, 2))
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_total DECIMAL(15, 2) := p_shares * p_price;
+    v_balance DECIMAL(15, 2);
+    v_current_shares INTEGER;
+    v_transaction_id INTEGER;
+    v_transaction_date TIMESTAMP;
+BEGIN
+    IF p_trade_type NOT IN ('BUY', 'SELL') THEN
+        RAISE EXCEPTION 'Unsupported trade type: %', p_trade_type;
+    END IF;
+
+    -- Lock the account first so concurrent trades on it serialize
+    SELECT u.balance INTO v_balance
+    FROM users u
+    WHERE u.account_number = p_account_number
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Account not found';
+    END IF;
+
+    SELECT COALESCE(SUM(p.shares), 0) INTO v_current_shares
+    FROM portfolio p
+    WHERE p.account_number = p_account_number AND p.stock_symbol = p_symbol;
+
+    IF p_trade_type = 'SELL' AND v_current_shares < p_shares THEN
+        RAISE EXCEPTION E'Insufficient shares for this trade.\nRequired: % shares\nAvailable: % shares',
+            p_shares, v_current_shares;
+    END IF;
+
+    IF p_trade_type = 'BUY' THEN
+        IF v_balance < v_total THEN
+            RAISE EXCEPTION E'Insufficient funds for this trade.\nRequired: $%\nAvailable: $%',
+                to_char(v_total, 'FM999999999990.00'), to_char(v_balance, 'FM999999999990.00');
+        END IF;
+
+        UPDATE users u SET balance = u.balance - v_total
+        WHERE u.account_number = p_account_number
+        RETURNING u.balance INTO v_balance;
+
+        INSERT INTO portfolio AS p (account_number, stock_symbol, shares, average_price)
+        VALUES (p_account_number, p_symbol, p_shares, p_price)
+        ON CONFLICT (account_number, stock_symbol) DO UPDATE
+        SET shares = p.shares + EXCLUDED.shares,
+            average_price = (p.average_price * p.shares + v_total) / (p.shares + EXCLUDED.shares),
+            last_updated = CURRENT_TIMESTAMP;
+    ELSE
+        UPDATE users u SET balance = u.balance + v_total
+        WHERE u.account_number = p_account_number
+        RETURNING u.balance INTO v_balance;
+
+        UPDATE portfolio p
+        SET shares = p.shares - p_shares,
+            last_updated = CURRENT_TIMESTAMP
+        WHERE p.account_number = p_account_number AND p.stock_symbol = p_symbol;
+
+        -- Clean up zero positions
+        DELETE FROM portfolio p
+        WHERE p.account_number = p_account_number AND p.stock_symbol = p_symbol AND p.shares <= 0;
+    END IF;
+
+    INSERT INTO transactions AS t
+        (account_number, transaction_type, stock_symbol, shares, price_per_share, total_amount)
+    VALUES (p_account_number, p_trade_type, p_symbol, p_shares, p_price, v_total)
+    RETURNING t.transaction_id, t.transaction_date INTO v_transaction_id, v_transaction_date;
+
+    INSERT INTO last_trade AS l
+        (account_number, stock_symbol, transaction_id, price_per_share, transaction_date)
+    VALUES (p_account_number, p_symbol, v_transaction_id, p_price, v_transaction_date)
+    ON CONFLICT (account_number, stock_symbol) DO UPDATE
+    SET transaction_id = EXCLUDED.transaction_id,
+        price_per_share = EXCLUDED.price_per_share,
+        transaction_date = EXCLUDED.transaction_date;
+
+    RETURN QUERY SELECT v_transaction_id, v_balance;
+END;
+$$;
@@ -0,0 +1,79 @@
+-- Partition chat_history by month and index it for keyset pagination.
+-- Hot reads walk (account_number, timestamp DESC, id DESC) on the newest
+-- partitions only; old partitions are detached and exported to compressed
+-- files by src/database/chat_archive.py.
+
+-- Create monthly partitions from p_from through p_months_ahead months past now
+CREATE OR REPLACE FUNCTION ensure_chat_history_partitions(
+    p_from DATE DEFAULT CURRENT_DATE,
+    p_months_ahead INTEGER DEFAULT 3
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_month DATE := date_trunc('month', p_from)::DATE;
+    v_last DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead))::DATE;
+    v_name TEXT;
+    v_created INTEGER := 0;
+BEGIN
+    WHILE v_month <= v_last LOOP
+        v_name := 'chat_history_' || to_char(v_month, '"y"YYYY"m"MM');
+        IF to_regclass(v_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF chat_history FOR VALUES FROM (%L) TO (%L)',
+                v_name, v_month, (v_month + INTERVAL '1 month')::DATE
+            );
+            v_created := v_created + 1;
+        END IF;
+        v_month := (v_month + INTERVAL '1 month')::DATE;
+    END LOOP;
+    RETURN v_created;
+END;
+$$;
+
+DO $$
+DECLARE
+    v_oldest DATE;
+BEGIN
+    -- Already partitioned: nothing to convert
+    IF EXISTS (
+        SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'chat_history'::regclass
+    ) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE chat_history RENAME TO chat_history_unpartitioned;
+    ALTER SEQUENCE chat_history_id_seq OWNED BY NONE;
+
+    CREATE TABLE chat_history (
+        id INTEGER NOT NULL DEFAULT nextval('chat_history_id_seq'),
+        account_number VARCHAR(20) REFERENCES users(account_number),
+        message_type VARCHAR(10) NOT NULL,  -- 'USER' or 'ASSISTANT'
+        message TEXT NOT NULL,
+        timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id, timestamp)
+    ) PARTITION BY RANGE (timestamp);
+
+    ALTER SEQUENCE chat_history_id_seq OWNED BY chat_history.id;
+
+    -- Catches rows outside every monthly partition (e.g. clock skew)
+    CREATE TABLE chat_history_default PARTITION OF chat_history DEFAULT;
+
+    SELECT date_trunc('month', COALESCE(MIN(timestamp), CURRENT_TIMESTAMP))::DATE
+    INTO v_oldest
+    FROM chat_history_unpartitioned;
+
+    PERFORM ensure_chat_history_partitions(v_oldest, 3);
+
+    INSERT INTO chat_history (id, account_number, message_type, message, timestamp)
+    SELECT id, account_number, message_type, message, COALESCE(timestamp, CURRENT_TIMESTAMP)
+    FROM chat_history_unpartitioned;
+
+    DROP TABLE chat_history_unpartitioned;
+END;
+$$;
+
+-- Keyset pagination index; created on the parent so every partition gets it
+CREATE INDEX IF NOT EXISTS idx_chat_history_account_timestamp_id
+    ON chat_history (account_number, timestamp DESC, id DESC);
@@ -0,0 +1,41 @@
+-- Publish account changes on the account_changes channel so every worker
+-- can drop its cached balance, portfolio and watchlist for that account.
+-- Triggers cover execute_trade(), the statement and basket trade paths,
+-- deposits and watchlist edits alike. Notifications are delivered on
+-- commit, and identical payloads within one transaction are sent once.
+
+CREATE OR REPLACE FUNCTION notify_account_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_account_number VARCHAR(20);
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        v_account_number := OLD.account_number;
+    ELSE
+        v_account_number := NEW.account_number;
+    END IF;
+
+    PERFORM pg_notify(
+        'account_changes',
+        json_build_object('account_number', v_account_number, 'table', TG_TABLE_NAME)::text
+    );
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS users_notify_account_change ON users;
+CREATE TRIGGER users_notify_account_change
+    AFTER UPDATE OF balance, email ON users
+    FOR EACH ROW EXECUTE FUNCTION notify_account_change();
+
+DROP TRIGGER IF EXISTS portfolio_notify_account_change ON portfolio;
+CREATE TRIGGER portfolio_notify_account_change
+    AFTER INSERT OR UPDATE OR DELETE ON portfolio
+    FOR EACH ROW EXECUTE FUNCTION notify_account_change();
+
+DROP TRIGGER IF EXISTS watchlist_notify_account_change ON watchlist;
+CREATE TRIGGER watchlist_notify_account_change
+    AFTER INSERT OR UPDATE OR DELETE ON watchlist
+    FOR EACH ROW EXECUTE FUNCTION notify_account_change();
@@ -0,0 +1,12 @@
+-- Widen stock_symbol so exchange-suffixed listings fit: NSE and BSE
+-- tickers carry a .NS or .BO suffix and run past ten characters
+-- (RELIANCE.NS is 11, TATAMOTORS.NS and BAJFINANCE.NS are 13). Raising a
+-- varchar limit only changes the catalog, so no table is rewritten and
+-- the indexes on these columns stay valid. execute_trade() takes
+-- p_symbol as an unbounded varchar already; its declarations in 001 and
+-- 002 are updated to match.
+
+ALTER TABLE transactions ALTER COLUMN stock_symbol TYPE VARCHAR(20);
+ALTER TABLE portfolio ALTER COLUMN stock_symbol TYPE VARCHAR(20);
+ALTER TABLE watchlist ALTER COLUMN stock_symbol TYPE VARCHAR(20);
+ALTER TABLE last_trade ALTER COLUMN stock_symbol TYPE VARCHAR(20);
@@ -1,8 +1,15 @@
 import sys
+import os
+import logging
 from pathlib import Path
 from src.ui.test_interface import FinanceAgentTester
 
 def main():
+    # LOG_LEVEL=DEBUG turns on per-query logging; slow queries log at WARNING
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
     tester = FinanceAgentTester()
     tester.run()
 
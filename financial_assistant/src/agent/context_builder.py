@@ -0,0 +1,180 @@
+from typing import Dict, Any, Callable, Iterable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Section each prompt variable is rendered into, in prompt order
+SECTIONS = ("user_data", "market_data", "chat_history")
+
+# Lower numbers are kept first when the budget runs out
+PRIORITY_ESSENTIAL = 0
+PRIORITY_MENTIONED = 1
+PRIORITY_INDEX = 2
+PRIORITY_HELD = 3
+PRIORITY_HISTORY = 4
+PRIORITY_WATCHLIST = 5
+
+
+def get_token_counter() -> Callable[[str], int]:
+    """Return a token counter for the prompt text.
+
+    Uses tiktoken's cl100k_base encoding, whose vocabulary Llama 3's
+    tokenizer extends, so counts track what Ollama prefills closely. Falls
+    back to a four-characters-per-token estimate when tiktoken is missing
+    or its encoding cannot be loaded (it is downloaded on first use).
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+    except ImportError:
+        logger.warning("tiktoken is not installed; estimating prompt tokens from character counts")
+        return lambda text: (len(text) + 3) // 4
+    except Exception as e:
+        logger.warning("Could not load the tiktoken encoding (%s); estimating prompt tokens from character counts", e)
+        return lambda text: (len(text) + 3) // 4
+    return lambda text: len(encoding.encode(text))
+
+
+class ContextBuilder:
+    def __init__(self, budget: int = 768, count_tokens: Optional[Callable[[str], int]] = None,
+                 max_message_chars: int = 300, history_turns: int = 5):
+        """Initialize a prompt context builder with a token ``budget``.
+
+        User, market and conversation context are rendered as compact
+        pipe-separated tables instead of JSON. Lines are admitted by
+        priority until the budget is spent: the balance, market status and
+        anything about symbols named in the query first, then index
+        levels, held positions by market value, the most recent
+        conversation and finally the watchlist. Quotes for symbols that are
+        neither held nor mentioned are never included.
+        """
+        self.budget = budget
+        self.count_tokens = count_tokens or get_token_counter()
+        self.max_message_chars = max_message_chars
+        self.history_turns = history_turns
+
+    def _user_lines(self, user_data: Dict, mentioned: Set[str]) -> List[Tuple[int, str, str]]:
+        if not user_data:
+            return [(PRIORITY_ESSENTIAL, "header", "Not logged in")]
+        if "error" in user_data:
+            return [(PRIORITY_ESSENTIAL, "header", f"Unavailable: {user_data['error']}")]
+
+        lines = [(PRIORITY_ESSENTIAL, "header",
+                  f"Account {user_data['account_number']} | Balance ${float(user_data['balance']):,.2f}")]
+        positions = sorted(
+            user_data.get("portfolio", []),
+            key=lambda p: p["shares"] * float(p["current_price"]),
+            reverse=True
+        )
+        if positions:
+            lines.append((PRIORITY_ESSENTIAL, "header", "Positions: symbol | shares | avg price | price | P/L%"))
+        for p in positions:
+            avg_price = float(p["avg_price"])
+            price = float(p["current_price"])
+            pl_percent = (price / avg_price - 1) * 100 if avg_price > 0 else 0.0
+            priority = PRIORITY_MENTIONED if p["symbol"] in mentioned else PRIORITY_HELD
+            lines.append((priority, "positions", f"{p['symbol']} | {p['shares']} | {avg_price:.2f} | {price:.2f} | {pl_percent:+.1f}"))
+
+        watchlist = user_data.get("watchlist", [])
+        if watchlist:
+            lines.append((
+                PRIORITY_MENTIONED if mentioned.intersection(watchlist) else PRIORITY_WATCHLIST,
+                "watchlist",
+                "Watchlist: " + ", ".join(watchlist)
+            ))
+        return lines
+
+    @staticmethod
+    def _quote_line(symbol: str, quote: Dict) -> str:
+        if "price" not in quote:
+            return f"{symbol} | n/a"
+        return f"{symbol} | {float(quote['price']):.2f} | {float(quote.get('change', 0)):+.2f}"
+
+    def _market_lines(self, market_data: Dict, mentioned: Set[str]) -> List[Tuple[int, str, str]]:
+        lines = [(PRIORITY_ESSENTIAL, "header", f"Market {market_data.get('market_status', 'UNKNOWN')}")]
+        indices = market_data.get("indices", {})
+        quotes = {symbol: quote for symbol, quote in market_data.get("quotes", {}).items() if symbol in mentioned}
+        if indices or quotes:
+            lines.append((PRIORITY_ESSENTIAL, "header", "Quotes: symbol | price | change%"))
+        for symbol, quote in quotes.items():
+            lines.append((PRIORITY_MENTIONED, "quotes", self._quote_line(symbol, quote)))
+        for symbol, data in indices.items():
+            label = f"{data['name']} ({symbol})" if data.get("name") else symbol
+            lines.append((PRIORITY_INDEX, "indices", self._quote_line(label, data)))
+        return lines
+
+    def _history_lines(self, chat_history: List[str]) -> List[Tuple[int, str, str]]:
+        lines = []
+        for message in chat_history[-self.history_turns:]:
+            message = " ".join(message.split())
+            if len(message) > self.max_message_chars:
+                message = message[:self.max_message_chars - 3] + "..."
+            lines.append((PRIORITY_HISTORY, "messages", message))
+        return lines
+
+    def build(self, mentioned: Iterable[str], user_data: Dict, market_data: Dict,
+              chat_history: List[str]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Render the prompt's context variables within the budget.
+
+        ``mentioned`` are the symbols the query names, as resolved by the
+        symbol index. Returns the ``user_data``, ``market_data`` and
+        ``chat_history`` strings and a report of tokens used and what was
+        left out.
+        """
+        mentioned = set(mentioned)
+
+        candidates = []
+        for section, lines in (
+            ("user_data", self._user_lines(user_data, mentioned)),
+            ("market_data", self._market_lines(market_data, mentioned)),
+            ("chat_history", self._history_lines(chat_history)),
+        ):
+            for position, (priority, kind, text) in enumerate(lines):
+                candidates.append((priority, section, position, kind, text))
+
+        # Newer conversation beats older within the same priority
+        ranked = sorted(
+            candidates,
+            key=lambda c: (c[0], -c[2] if c[1] == "chat_history" else c[2])
+        )
+        kept = set()
+        used = 0
+        dropped: Dict[str, int] = {}
+        closed = set()
+        for priority, section, position, kind, text in ranked:
+            cost = self.count_tokens(text) + 1  # plus the newline joining it
+            # Once a line misses the budget, the rest of its group (e.g. smaller
+            # positions, older messages) is dropped too, so what is kept is a prefix
+            if priority == PRIORITY_ESSENTIAL or (
+                (priority, kind) not in closed and used + cost <= self.budget
+            ):
+                kept.add((section, position))
+                used += cost
+            else:
+                closed.add((priority, kind))
+                dropped[kind] = dropped.get(kind, 0) + 1
+
+        rendered = {}
+        for section in SECTIONS:
+            lines = [text for _, s, position, _, text in candidates if s == section and (s, position) in kept]
+            omitted = {
+                kind: dropped[kind] for kind in dict.fromkeys(k for _, s, _, k, _ in candidates if s == section)
+                if dropped.get(kind)
+            }
+            if omitted:
+                lines.append("(omitted: " + ", ".join(f"{count} {kind}" for kind, count in omitted.items()) + ")")
+            rendered[section] = "\n".join(lines) if lines else "None"
+
+        tokens = {section: self.count_tokens(text) for section, text in rendered.items()}
+        report = {
+            "budget": self.budget,
+            "tokens": sum(tokens.values()),
+            "section_tokens": tokens,
+            "dropped": dropped,
+            "truncated": bool(dropped),
+            "mentioned_symbols": sorted(mentioned),
+        }
+        if dropped:
+            logger.info("Prompt context truncated to %d tokens (budget %d), dropped %s",
+                        report["tokens"], self.budget, dropped)
+        return rendered, report
@@ -1,45 +1,48 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator
 from datetime import datetime, UTC
-import json
+import threading
+import logging
+import time
 import re
+import os
 from langchain_community.llms import Ollama
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from src.database.database_manager import DatabaseManager
-import yfinance as yf
-import pandas as pd
-
-class FinanceAgent:
-    def __init__(self):
-        self.db = DatabaseManager()
-        self.setup_llm()
-        self.setup_prompts()
-        self._pending_operation = None
-        self._chat_history = []
-        self._current_user = None
-
-    def setup_llm(self):
-        """Setup the LLM with appropriate parameters."""
-        self.llm = Ollama(
-            model="llama3.1:8b-instruct-q4_0",
-            temperature=0.7,
-            base_url="http://localhost:11434"
-        )
-
-    def setup_prompts(self):
-        """Setup conversation prompts with enhanced context."""
-        self.prompt = PromptTemplate(
-            input_variables=["query", "current_time", "user_data", "market_data", "chat_history"],
-            template="""You are an advanced AI financial assistant named FinanceGPT. You help users manage their investments, 
+from src.agent.response_cache import get_shared_response_cache, make_key
+from src.agent.context_builder import ContextBuilder
+from src.agent.intent_router import IntentRouter
+from src.market.symbol_index import get_shared_symbol_index
+from src.agent.session import Session, get_shared_session_manager
+from src.agent.llm_scheduler import (
+    LLMScheduler, SchedulerBusy, RequestExpired, PRIORITY_TRADE, PRIORITY_ACCOUNT, PRIORITY_CHAT
+)
+
+logger = logging.getLogger(__name__)
+
+# Canned replies for the router's small-talk intents
+CASUAL_RESPONSES = {
+    "greeting": "Hello! How can I help you with your investments today?",
+    "how_are_you": "I'm doing well, thank you! Ready to help you with your financial needs.",
+    "thanks": "You're welcome! Let me know if you need anything else.",
+    "goodbye": "Goodbye! Have a great day!",
+}
+
+# Which context an LLM answer depends on, judged from the query, for response caching
+TRADE_INTENT_PATTERN = re.compile(r"\b(buy|sell|purchase|trade|order|short|invest|acquire|dump)\b")
+PERSONAL_PATTERN = re.compile(
+    r"\b(my|me|mine|i|i'm|i've|portfolio|balance|holdings?|positions?|watchlist|account)\b"
+)
+MARKET_PATTERN = re.compile(
+    r"\b(price|prices|market|markets|today|now|current|currently|quote|index|indices|trending|up|down)\b"
+)
+FOLLOW_UP_PATTERN = re.compile(r"\b(it|that|this|those|these|them|more|else|again|above)\b")
+
+# Static instructions come first and never change, so Ollama reuses their
+# KV cache across requests; everything per-request follows, steadiest first
+PROMPT_INSTRUCTIONS = """You are an advanced AI financial assistant named FinanceGPT. You help users manage their investments, 
             execute trades, and provide financial advice. You have access to real-time market data and user portfolios.
 
-            Current Time: {current_time}
-            User Information: {user_data}
-            Market Data: {market_data}
-            Recent Conversation: {chat_history}
-
-            User Query: {query}
-
             Your capabilities include:
             1. Natural Conversation:
                - Discuss market trends, investment strategies
@@ -71,22 +74,99 @@ class FinanceAgent:
             - Show relevant market data before trades
 
             When responding, format trades and operations as JSON with this structure:
-            {{
+            {
                 "type": "conversation|account|trade|analysis",
                 "operation": "CREATE|READ|UPDATE|DELETE|BUY|SELL|ANALYZE",
-                "data": {{
+                "data": {
                     "symbol": "STOCK_SYMBOL",
                     "shares": NUMBER_OF_SHARES,
                     "price": CURRENT_PRICE
-                }},
+                },
                 "natural_response": "Your friendly response",
                 "requires_confirmation": true,
                 "show_data": true
-            }}
+            }
 
             For casual conversation, respond naturally without JSON.
             Always maintain a professional yet friendly tone.
+"""
+
+PROMPT_TEMPLATE = PROMPT_INSTRUCTIONS.replace("{", "{{").replace("}", "}}") + """
+            User Information: {user_data}
+            Market Data: {market_data}
+            Recent Conversation: {chat_history}
+            Current Time: {current_time}
+
+            User Query: {query}
             """
+
+
+def _keep_alive(value: str):
+    """Ollama takes durations like '30m' as strings but bare seconds (e.g. -1 for forever) as numbers."""
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def create_llm() -> Ollama:
+    """Create the Ollama client from OLLAMA_* settings."""
+    return Ollama(
+        model=os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct-q4_0"),
+        temperature=0.7,
+        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+        keep_alive=_keep_alive(os.getenv("OLLAMA_KEEP_ALIVE", "30m")),
+        num_ctx=int(os.getenv("OLLAMA_NUM_CTX", "4096"))
+    )
+
+
+class FinanceAgent:
+    def __init__(self):
+        """Initialize the agent core shared by every conversation.
+
+        Per-user state (account, pending trade, chat history) lives in
+        Session objects passed to each call, so one agent, with its
+        connection pool, caches and LLM client, serves any number of
+        users from any number of threads. Callers that pass no session
+        use the agent's own default session, as a single-user client.
+        """
+        self.db = DatabaseManager()
+        self.symbols = get_shared_symbol_index()
+        self.router = IntentRouter(self.symbols)
+        self.response_cache = get_shared_response_cache()
+        self.context_builder = ContextBuilder(budget=int(os.getenv("LLM_CONTEXT_BUDGET", "768")))
+        self.sessions = get_shared_session_manager()
+        self.default_session = Session("default", self.sessions.history_limit)
+        self.setup_llm()
+        self.setup_prompts()
+        self.setup_scheduler()
+
+    def setup_llm(self):
+        """Setup the LLM with appropriate parameters.
+
+        OLLAMA_KEEP_ALIVE keeps the model loaded between sparse requests
+        (Ollama's own default unloads it after five minutes) and
+        OLLAMA_NUM_CTX sizes the context window, which must cover the
+        instructions plus the context budget. With OLLAMA_WARMUP the model
+        is loaded and the instruction prefix prefilled in the background.
+        """
+        self.llm = create_llm()
+        self.warmup_stats = None
+        if os.getenv("OLLAMA_WARMUP", "true").lower() == "true":
+            threading.Thread(target=self._warm_up, name="llm-warmup", daemon=True).start()
+
+    def _warm_up(self):
+        """Load the model and cache the static prompt prefix before the first user request."""
+        start = time.perf_counter()
+        try:
+            self.llm.invoke(PROMPT_INSTRUCTIONS, num_predict=1)
+            self.warmup_stats = {"status": "ready", "seconds": time.perf_counter() - start}
+        except Exception as e:
+            self.warmup_stats = {"status": "failed", "seconds": time.perf_counter() - start, "error": str(e)}
+            logger.warning("LLM warm-up failed: %s", e)
+
+    def setup_prompts(self):
+        """Setup conversation prompts with enhanced context."""
+        self.prompt = PromptTemplate(
+            input_variables=["query", "current_time", "user_data", "market_data", "chat_history"],
+            template=PROMPT_TEMPLATE
         )
 
         self.chain = (
@@ -95,6 +175,22 @@ class FinanceAgent:
             | StrOutputParser()
         )
 
+    def setup_scheduler(self):
+        """Queue LLM requests so concurrent sessions share the model's parallel slots.
+
+        LLM_MAX_PARALLEL should match the server's OLLAMA_NUM_PARALLEL;
+        LLM_MAX_QUEUE bounds the backlog, LLM_BATCH_WINDOW_MS is how long a
+        burst is gathered before dispatch and LLM_REQUEST_TIMEOUT how long
+        a request may wait for its first token.
+        """
+        self.llm_scheduler = LLMScheduler(
+            self.chain.stream,
+            parallelism=int(os.getenv("LLM_MAX_PARALLEL", "1")),
+            max_queue=int(os.getenv("LLM_MAX_QUEUE", "64")),
+            batch_window=float(os.getenv("LLM_BATCH_WINDOW_MS", "20")) / 1000,
+            default_timeout=float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+        )
+
     def get_market_data(self, symbols: List[str] = None) -> Dict:
         """Fetch current market data for relevant symbols."""
         try:
@@ -108,80 +204,28 @@ class FinanceAgent:
                 }
             }
             
-            # Add market indices with cached data
+            # Fetch indices and only the required symbols in one batch
+            quotes = self.db.get_real_time_quotes(list(market_data["indices"].keys()) + list(symbols or []))
+
             for symbol in market_data["indices"].keys():
-                try:
-                    quote = self._get_cached_quote(symbol)
-                    market_data["indices"][symbol].update(quote)
-                except Exception as e:
-                    print(f"Error fetching index {symbol}: {e}")
-            
-            # Only fetch required symbols
-            if symbols:
-                for symbol in symbols:
-                    try:
-                        quote = self._get_cached_quote(symbol)
-                        market_data["quotes"][symbol] = quote
-                    except Exception as e:
-                        print(f"Error fetching {symbol}: {e}")
+                market_data["indices"][symbol].update(quotes[symbol.upper()])
+
+            for symbol in symbols or []:
+                market_data["quotes"][symbol] = quotes[symbol.upper()]
             
             return market_data
         except Exception as e:
-            print(f"Error getting market data: {e}")
+            logger.error("Error getting market data: %s", e)
             return {"market_status": "ERROR", "quotes": {}, "indices": {}}
         
     def _get_cached_quote(self, symbol: str) -> Dict:
-        """Get quote from cache or fetch new data."""
-        current_time = time.time()
-        
-        # Check cache first
-        if symbol in self._quote_cache:
-            quote, cache_time = self._quote_cache[symbol]
-            if current_time - cache_time < self._cache_timeout:
-                return quote
-
-        # Add delay between requests
-        time.sleep(0.5)
-        
-        # Fetch new quote
-        quote = self.db.get_real_time_quote(symbol)
-        self._quote_cache[symbol] = (quote, current_time)
-        return quote
+        """Get quote from the shared quote cache, fetching new data on a miss."""
+        return self.db.get_real_time_quote(symbol)
 
 
     def analyze_sentiment(self, text: str) -> Dict:
         """Analyze if text indicates buying, selling, or general inquiry."""
-        text = text.lower()
-        
-        # Common patterns for trading intentions
-        buy_patterns = ['buy', 'purchase', 'invest in', 'get some', 'acquire']
-        sell_patterns = ['sell', 'dump', 'get rid of', 'dispose', 'exit']
-        
-        # Common patterns for casual conversation
-        greeting_patterns = ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening']
-        question_patterns = ['how', 'what', 'why', 'when', 'where', 'can you', 'could you']
-        
-        # Check for casual conversation first
-        if any(pattern in text for pattern in greeting_patterns):
-            return {"action": "CHAT", "type": "greeting"}
-        
-        if any(pattern in text for pattern in question_patterns):
-            return {"action": "CHAT", "type": "question"}
-        
-        # Check for trading patterns
-        for pattern in buy_patterns:
-            if pattern in text:
-                symbols = re.findall(r'[A-Z]{1,5}', text.upper())
-                if symbols:
-                    return {"action": "BUY", "symbol": symbols[0]}
-        
-        for pattern in sell_patterns:
-            if pattern in text:
-                symbols = re.findall(r'[A-Z]{1,5}', text.upper())
-                if symbols:
-                    return {"action": "SELL", "symbol": symbols[0]}
-        
-        return {"action": "ANALYZE"}
+        return self.router.sentiment(text)
 
     def _format_portfolio_summary(self, portfolio: List[Dict]) -> str:
         """Format portfolio data for display."""
@@ -227,327 +271,262 @@ class FinanceAgent:
             
             return "\n".join(summary)
         except Exception as e:
-            print(f"Error formatting portfolio: {e}")
+            logger.error("Error formatting portfolio: %s", e)
             return "Error displaying portfolio."
 
-    def set_current_user(self, account_number: str):
-        """Set the current user context."""
-        self._current_user = account_number
-
-    def process_request(self, query: str) -> str:
+    def start_session(self, account_number: Optional[str] = None,
+                      session_token: Optional[str] = None) -> Session:
+        """Start a conversation, optionally for an already logged-in user."""
+        return self.sessions.create(account_number, session_token)
+
+    def get_session(self, session_id: str) -> Optional[Session]:
+        """Look up a live conversation by id, extending its lifetime."""
+        return self.sessions.get(session_id)
+
+    def end_session(self, session_id: str) -> bool:
+        """End a conversation."""
+        return self.sessions.end(session_id)
+
+    @property
+    def last_context_report(self) -> Optional[Dict[str, Any]]:
+        """The prompt context report of the default session's last LLM request."""
+        return self.default_session.last_context_report
+
+    def set_current_user(self, account_number: str, session_token: Optional[str] = None,
+                         session: Optional[Session] = None):
+        """Set the current user context, optionally bound to a login session."""
+        (session or self.default_session).login(account_number, session_token)
+
+    def _check_session(self, session: Session) -> bool:
+        """Drop the user context if its login session has expired."""
+        if not session.session_token:
+            return True
+        if self.db.validate_session(session.session_token)["status"] == "success":
+            return True
+        session.logout()
+        return False
+
+    def process_request(self, query: str, session: Optional[Session] = None) -> str:
         """Process user requests with enhanced context and security."""
+        return "".join(self.process_request_stream(query, session))
+
+    def process_request_stream(self, query: str, session: Optional[Session] = None) -> Iterator[str]:
+        """Process a request, yielding the response as it is generated.
+
+        Commands answer with one chunk; anything sent to the LLM is yielded
+        token by token as Ollama produces it. The exchange is saved to chat
+        history once the stream completes, so a stream abandoned or broken
+        part way is not recorded.
+        """
+        session = session or self.default_session
         try:
-            # Handle casual conversation first
-            query_lower = query.lower().strip()
-            words = query.lower().split()
-            if 'buy' in words or 'sell' in words:
-                return self._handle_trade_command(query)
-            
-            # Casual conversation patterns
-            casual_patterns = {
-                r'\b(hi|hello|hey)\b': "Hello! How can I help you with your investments today?",
-                r'\b(how are you|how\'s it going)\b': "I'm doing well, thank you! Ready to help you with your financial needs.",
-                r'\b(thank you|thanks)\b': "You're welcome! Let me know if you need anything else.",
-                r'\b(bye|goodbye)\b': "Goodbye! Have a great day!",
-            }
-            
-            # Check for casual patterns
-            for pattern, response in casual_patterns.items():
-                if re.search(pattern, query_lower):
-                    return response
-            
-            # Handle market-related queries
-            market_patterns = {
-                r'\b(how.*market|what.*market|market.*today)\b': self._get_market_summary,
-                r'\b(market.*analysis|market.*overview)\b': self._get_market_summary,
-            }
-            
-            for pattern, handler in market_patterns.items():
-                if re.search(pattern, query_lower):
-                    return handler()
-            
-            # Simple command mapping
-            simple_commands = {
+            if not self._check_session(session):
+                yield "❌ Your session has expired. Please log in again."
+                return
+
+            response = self._handle_command(session, query)
+            if response is not None:
+                yield response
+                return
+
+            # Repeated questions are answered from the response cache, loading
+            # only the context the answer depends on to check it
+            user_data = market_data = None
+            history = list(session.history)
+            symbols = self._query_symbols(query)
+            cache_key = None
+            scope = self._cache_scope(query, symbols)
+            if scope is None:
+                self.response_cache.count_bypass()
+            else:
+                if scope["user"]:
+                    user_data = self._load_user_data(session)
+                if scope["market"]:
+                    market_data = self.get_market_data(symbols)
+                cache_key = make_key(query, {
+                    "account": session.account_number if scope["user"] else None,
+                    "user": user_data,
+                    "market": self._market_fingerprint(market_data) if market_data else None,
+                    "history": history if scope["history"] else None,
+                })
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    yield cached
+                    self._save_exchange(session, query, cached)
+                    return
+
+            # A cached or shared answer is served to other users, so its prompt
+            # may only hold the context its key covers
+            if scope is not None and not scope["user"]:
+                user_data = {}
+            elif user_data is None:
+                user_data = self._load_user_data(session)
+            if scope is not None and not scope["history"]:
+                history = []
+            if market_data is None:
+                market_data = self.get_market_data(symbols)
+            inputs = self._build_llm_inputs(session, query, symbols, user_data, market_data, history)
+        except Exception as e:
+            yield f"❌ Error: {str(e)}"
+            return
+
+        # Process through LLM for other queries; identical cacheable
+        # questions asked at the same time share one generation
+        if scope is None:
+            priority = PRIORITY_TRADE
+        elif scope["user"]:
+            priority = PRIORITY_ACCOUNT
+        else:
+            priority = PRIORITY_CHAT
+        chunks = []
+        try:
+            for chunk in self.llm_scheduler.stream(inputs, priority, key=cache_key):
+                chunks.append(chunk)
+                yield chunk
+        except SchedulerBusy:
+            yield "⏳ I'm handling a lot of requests right now. Please try again in a moment."
+            return
+        except RequestExpired:
+            yield "⏳ That request timed out while waiting for the assistant. Please try again."
+            return
+        except Exception as e:
+            logger.error("LLM error: %s", e)
+            if chunks:
+                yield "\n\n⚠️ The response was interrupted. Please try again."
+            else:
+                yield "I'm having trouble processing that request. Please try again or use a specific command."
+            return
+
+        response = "".join(chunks)
+        if cache_key is not None:
+            # Answers that depend on prices go stale with the quotes they were based on
+            market_dependent = scope["user"] or scope["market"]
+            self.response_cache.set(cache_key, response, self.db.quote_cache.ttl if market_dependent else None)
+        self._save_exchange(session, query, response)
+
+    def _handle_command(self, session: Session, query: str) -> Optional[str]:
+        """Answer commands and canned replies directly; None means the query needs the LLM."""
+        intent = self.router.route(query)
+        if intent.name == "trade":
+            return self._handle_trade_command(session, intent.slots)
+        if intent.name in CASUAL_RESPONSES:
+            return CASUAL_RESPONSES[intent.name]
+        if intent.name == "market_summary":
+            return self._get_market_summary(session)
+        if intent.name == "command":
+            if intent.slots["command"] == "help":
+                return self._get_help()
+            if intent.slots["command"] == "symbols":
+                return self._get_symbols_command()
+            return {
                 'balance': self._get_balance,
                 'portfolio': self.get_portfolio_summary,
-                'my balance': self._get_balance,
-                'show balance': self._get_balance,
-                'check balance': self._get_balance,
-                'show portfolio': self.get_portfolio_summary,
-                'my portfolio': self.get_portfolio_summary,
                 'watchlist': self._get_watchlist,
-                'my watchlist': self._get_watchlist,
-                'help': self._get_help,
-            }
-            
-            # Check for simple commands
-            if query_lower in simple_commands:
-                return simple_commands[query_lower]()
-            
-            # Handle watchlist commands
-            watchlist_patterns = [
-                (r'add\s+(\w+)\s+to\s+watchlist', 'add'),
-                (r'watch\s+(\w+)', 'add'),
-                (r'remove\s+(\w+)\s+from\s+watchlist', 'remove'),
-                (r'unwatch\s+(\w+)', 'remove')
-            ]
+            }[intent.slots["command"]](session)
+        if intent.name == "watch_add":
+            return self._add_to_watchlist(session, intent.slots["symbol"])
+        if intent.name == "watch_remove":
+            return self._remove_from_watchlist(session, intent.slots["symbol"])
+        if intent.name == "quote":
+            return self._get_stock_quote(intent.slots["symbol"])
+        if intent.name == "symbol_search":
+            return self._search_symbols(intent.slots["text"])
+        return None
+
+    def _cache_scope(self, query: str, symbols: List[str]) -> Optional[Dict[str, bool]]:
+        """Decide which context an answer to ``query``, naming ``symbols``, depends on; None means never cache it."""
+        text = query.lower()
+        if TRADE_INTENT_PATTERN.search(text):
+            return None
+        return {
+            "user": bool(PERSONAL_PATTERN.search(text)),
+            "market": bool(MARKET_PATTERN.search(text)) or bool(symbols),
+            "history": bool(FOLLOW_UP_PATTERN.search(text)),
+        }
 
-            for pattern, action in watchlist_patterns:
-                match = re.search(pattern, query_lower)
-                if match:
-                    symbol = match.group(1).upper()
-                    if action == 'add':
-                        return self._add_to_watchlist(symbol)
-                    else:
-                        return self._remove_from_watchlist(symbol)
-
-            # Get current context
-            current_time = datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Get user data if available
-            user_data = {}
-            if self._current_user:
-                try:
-                    portfolio = self.db.get_portfolio(self._current_user)
-                    watchlist = self.db.get_watchlist(self._current_user)
-                    user = self.db.get_user(self._current_user)
-                    user_data = {
-                        "account_number": self._current_user,
-                        "balance": float(user['balance']),
-                        "portfolio": [
-                            {
-                                "symbol": p['stock_symbol'],
-                                "shares": int(p['shares']),
-                                "avg_price": float(p['average_price']),
-                                "current_price": float(p.get('current_price', 0))
-                            } for p in portfolio
-                        ],
-                        "watchlist": [w['stock_symbol'] for w in watchlist]
-                    }
-                except Exception as e:
-                    print(f"Error getting user data: {e}")
-                    user_data = {"error": "Failed to get user data"}
-            
-            # Handle trade commands
-            words = query_lower.split()
-            if 'buy' in words or 'sell' in words:
-                return self._handle_trade_command(query_lower)
-            
-            # Handle quote requests
-            if query_lower.startswith('quote '):
-                symbol = query_lower.split()[1].upper()
-                return self._get_stock_quote(symbol)
-            
-            # Handle watch commands
-            if query_lower.startswith('watch '):
-                symbol = query_lower.split()[1].upper()
-                return self._add_to_watchlist(symbol)
-            
-            # Process through LLM for other queries
-            try:
-                market_data = self.get_market_data()
-                response = self.chain.invoke({
-                    "query": query,
-                    "current_time": current_time,
-                    "user_data": json.dumps(user_data, default=str),
-                    "market_data": json.dumps(market_data, default=str),
-                    "chat_history": "\n".join(self._chat_history[-5:])
-                })
-                
-                # Save chat history
-                if self._current_user:
-                    try:
-                        self.db.save_chat_message(self._current_user, "USER", query)
-                        self.db.save_chat_message(self._current_user, "ASSISTANT", response)
-                        
-                        self._chat_history.append(f"User: {query}")
-                        self._chat_history.append(f"Assistant: {response}")
-                    except Exception as e:
-                        print(f"Error saving chat history: {e}")
-                
-                return response
-                
-            except Exception as e:
-                print(f"LLM error: {e}")
-                return "I'm having trouble processing that request. Please try again or use a specific command."
-                
-        except Exception as e:
-            return f"❌ Error: {str(e)}"
-        
-    def _add_to_watchlist(self, symbol: str) -> str:
-        """Add a stock to user's watchlist."""
-        if not self._current_user:
-            return "Please log in to modify your watchlist."
-        try:
-            # Validate symbol first
-            try:
-                quote = self._get_cached_quote(symbol)
-                if not quote or quote.get('error'):
-                    return f"❌ Invalid symbol: {symbol}"
-            except Exception as e:
-                return f"❌ Error validating symbol {symbol}: {str(e)}"
+    def _query_symbols(self, query: str) -> List[str]:
+        """Supported symbols named in the query, by ticker or company name."""
+        return sorted(self.symbols.extract(query))
 
-            # Add to watchlist
-            result = self.db.add_to_watchlist(self._current_user, symbol)
-            
-            if result.get('status') == 'success':
-                # Get current quote for feedback
-                quote = self._get_cached_quote(symbol)
-                return (
-                    f"✅ Added {symbol} to your watchlist\n"
-                    f"Current Price: ${float(quote['price']):.2f}\n"
-                    f"Change: {float(quote['change']):.2f}%"
-                )
-            else:
-                return f"❌ {result.get('message', 'Error adding to watchlist')}"
-        except Exception as e:
-            return f"Error adding to watchlist: {str(e)}"
+    @staticmethod
+    def _market_fingerprint(market_data: Dict) -> Dict:
+        """Reduce market data to the values an answer could depend on."""
+        return {
+            "status": market_data.get("market_status"),
+            "prices": {
+                symbol: data.get("price")
+                for symbol, data in {**market_data.get("indices", {}), **market_data.get("quotes", {})}.items()
+            },
+        }
 
-    def _remove_from_watchlist(self, symbol: str) -> str:
-        """Remove a stock from user's watchlist."""
-        if not self._current_user:
-            return "Please log in to modify your watchlist."
+    def _load_user_data(self, session: Session) -> Dict:
+        """Summarize the current user's balance, positions and watchlist for the prompt."""
+        if not session.account_number:
+            return {}
         try:
-            result = self.db.remove_from_watchlist(self._current_user, symbol)
-            return f"{'✅' if result['status'] == 'success' else '❌'} {result['message']}"
+            context = self.db.load_user_context(session.account_number)
+            return {
+                "account_number": session.account_number,
+                "balance": context['balance'],
+                "portfolio": [
+                    {
+                        "symbol": p['stock_symbol'],
+                        "shares": int(p['shares']),
+                        "avg_price": p['average_price'],
+                        "current_price": p['current_price']
+                    } for p in context['positions']
+                ],
+                "watchlist": context['watchlist']
+            }
         except Exception as e:
-            return f"Error removing from watchlist: {str(e)}"
+            logger.error("Error getting user data: %s", e)
+            return {"error": "Failed to get user data"}
+
+    def _build_llm_inputs(self, session: Session, query: str, symbols: List[str], user_data: Dict,
+                          market_data: Dict, history: List[str]) -> Dict[str, str]:
+        """Assemble the LLM prompt variables, fitting the context into the token budget."""
+        current_time = datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S')
+        context, session.last_context_report = self.context_builder.build(
+            symbols, user_data, market_data, history
+        )
+        return {"query": query, "current_time": current_time, **context}
 
-    def _get_watchlist(self) -> str:
-        """Get user's watchlist with current prices."""
-        if not self._current_user:
-            return "Please log in to view your watchlist."
+    def _save_exchange(self, session: Session, query: str, response: str) -> None:
+        """Persist a completed LLM exchange and keep it for the next prompt."""
+        if not session.account_number:
+            return
         try:
-            watchlist = self.db.get_watchlist(self._current_user)
-            if not watchlist:
-                return (
-                    "📋 Your Watchlist is empty\n"
-                    "Add stocks using 'add <SYMBOL> to watchlist' or 'watch <SYMBOL>'"
-                )
-            
-            lines = ["📋 Your Watchlist:"]
-            total_change = 0
+            self.db.save_chat_message(session.account_number, "USER", query)
+            self.db.save_chat_message(session.account_number, "ASSISTANT", response)
             
-            for item in watchlist:
-                try:
-                    quote = self._get_cached_quote(item['stock_symbol'])
-                    change = float(quote.get('change', 0))
-                    price = float(quote.get('price', 0))
-                    emoji = "📈" if change > 0 else "📉" if change < 0 else "➖"
-                    
-                    lines.append(
-                        f"{emoji} {item['stock_symbol']}: ${price:.2f} "
-                        f"({change:+.2f}%)"
-                    )
-                    total_change += change
-                except Exception as e:
-                    lines.append(f"❌ {item['stock_symbol']}: Error getting quote")
-            
-            # Add summary if there are items
-            if len(watchlist) > 0:
-                avg_change = total_change / len(watchlist)
-                lines.append(f"\nAverage Change: {avg_change:+.2f}%")
-            
-            return "\n".join(lines)
+            session.history.append(f"User: {query}")
+            session.history.append(f"Assistant: {response}")
         except Exception as e:
-            return f"Error getting watchlist: {str(e)}"
-
-    def _get_market_summary(self) -> str:
-        """Get a summary of current market conditions."""
+            logger.error("Error saving chat history: %s", e)
+        
+    def _remove_from_watchlist(self, session: Session, symbol: str) -> str:
+        """Remove a stock from user's watchlist."""
+        if not session.account_number:
+            return "Please log in to modify your watchlist."
         try:
-            # Get test data for major indices
-            indices_data = {
-                "^GSPC": {"name": "S&P 500", "price": 4900.50, "change": 0.75},
-                "^DJI": {"name": "Dow Jones", "price": 38750.25, "change": 0.50},
-                "^IXIC": {"name": "NASDAQ", "price": 15800.75, "change": 1.25}
-            }
-            
-            summary = ["📊 Market Summary:"]
-            
-            # Add market status
-            market_time = datetime.now(UTC)
-            is_market_open = (
-                market_time.weekday() < 5 and  # Monday = 0, Friday = 4
-                13 <= market_time.hour <= 20   # 9:30 AM - 4:00 PM EST in UTC
-            )
-            
-            summary.append(f"Market Status: {'🟢 OPEN' if is_market_open else '🔴 CLOSED'}")
-            summary.append(f"Last Updated: {market_time.strftime('%Y-%m-%d %H:%M:%S')} UTC\n")
-            
-            # Add indices
-            for symbol, data in indices_data.items():
-                change_emoji = "📈" if data["change"] > 0 else "📉"
-                summary.append(
-                    f"{change_emoji} {data['name']}: ${data['price']:,.2f} "
-                    f"({data['change']:+.2f}%)"
-                )
-            
-            # Add market sentiment
-            avg_change = sum(data["change"] for data in indices_data.values()) / len(indices_data)
-            sentiment = (
-                "🟢 Bullish" if avg_change > 0.5 else
-                "🟡 Neutral" if -0.5 <= avg_change <= 0.5 else
-                "🔴 Bearish"
-            )
-            summary.append(f"\nMarket Sentiment: {sentiment}")
-            
-            # Add any available user portfolio performance
-            if self._current_user:
-                try:
-                    portfolio = self.db.get_portfolio(self._current_user)
-                    if portfolio:
-                        total_value = sum(float(pos['shares']) * float(pos['current_price']) for pos in portfolio)
-                        total_cost = sum(float(pos['shares']) * float(pos['average_price']) for pos in portfolio)
-                        total_pl = total_value - total_cost
-                        pl_percent = (total_pl / total_cost * 100) if total_cost > 0 else 0
-                        
-                        summary.append(f"\nYour Portfolio Performance:")
-                        summary.append(
-                            f"Total Value: ${total_value:,.2f} "
-                            f"({pl_percent:+.2f}% overall)"
-                        )
-                except Exception as e:
-                    print(f"Error getting portfolio performance: {e}")
-            
-            return "\n".join(summary)
-            
+            result = self.db.remove_from_watchlist(session.account_number, symbol)
+            return f"{'✅' if result['status'] == 'success' else '❌'} {result['message']}"
         except Exception as e:
-            return f"Error getting market summary: {str(e)}"
+            return f"Error removing from watchlist: {str(e)}"
 
-    def _handle_trade_command(self, query: str) -> str:
-        """Handle buy/sell trade commands."""
+    def _handle_trade_command(self, session: Session, slots: Dict) -> str:
+        """Handle buy/sell trade commands from the router's trade slots."""
         try:
-            if not self._current_user:
+            if not session.account_number:
                 return "❌ Please log in to execute trades."
 
-            words = query.lower().split()
-            action = 'BUY' if 'buy' in words else 'SELL'
-            symbol_idx = words.index('buy' if 'buy' in words else 'sell') + 1
-            
-            # Extract symbol and shares
-            shares = None
-            symbol = None
-            
-            # Define supported symbols
-            SUPPORTED_SYMBOLS = {
-                # Technology
-                'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA', 'AMD', 'INTC', 'CSCO',
-                # Financial
-                'JPM', 'BAC', 'GS', 'V', 'MA',
-                # Consumer
-                'WMT', 'COST', 'PG', 'KO', 'PEP', 'MCD',
-                # Entertainment
-                'DIS', 'NFLX',
-                # Other sectors
-                'TSLA', 'F', 'GM', 'GE', 'XOM', 'CVX', 'T', 'VZ'
-            }
-            
-            # Parse query for shares and symbol
-            for word in words[symbol_idx:]:
-                if word.isdigit():
-                    shares = int(word)
-                elif word.upper() in SUPPORTED_SYMBOLS:
-                    symbol = word.upper()
+            # Orders naming several symbols go through the basket path
+            if len(slots["legs"]) > 1:
+                return self._handle_basket_command(session, slots["legs"])
+
+            action = slots["action"]
+            symbol = slots["symbol"]
+            shares = slots["shares"]
             
             if not symbol:
                 return (
@@ -555,7 +534,7 @@ class FinanceAgent:
                     "Use 'symbols' command to see supported stocks."
                 )
                 
-            if not shares:
+            if shares is None:
                 return (
                     "❌ Please specify the number of shares.\n"
                     f"Example: {action.lower()} {symbol} 10"
@@ -564,32 +543,21 @@ class FinanceAgent:
             if shares <= 0:
                 return "❌ Number of shares must be positive."
             
-            # Get current price with retry logic
-            max_retries = 3
-            retry_delay = 1  # seconds
-            quote = None
-            last_error = None
-            
-            for attempt in range(max_retries):
-                try:
-                    quote = self.db.get_real_time_quote(symbol)
-                    if quote and 'price' in quote:
-                        break
-                except Exception as e:
-                    last_error = str(e)
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
-            
+            # Get current price; retries and rate limiting happen in the quote engine
+            try:
+                quote = self.db.get_real_time_quote(symbol)
+            except Exception as e:
+                return f"❌ Error: Unable to get quote for {symbol}: {str(e)}"
+
             if not quote or 'price' not in quote:
-                return f"❌ Error: Unable to get quote for {symbol}: {last_error or 'Unknown error'}"
+                return f"❌ Error: Unable to get quote for {symbol}: Unknown error"
             
             total_cost = float(quote['price']) * shares
             
             # Verify sufficient balance for buy orders
             if action == 'BUY':
                 try:
-                    user = self.db.get_user(self._current_user)
+                    user = self.db.get_user(session.account_number)
                     if float(user['balance']) < total_cost:
                         return (
                             f"❌ Insufficient funds for this trade.\n"
@@ -602,7 +570,7 @@ class FinanceAgent:
             # Verify sufficient shares for sell orders
             if action == 'SELL':
                 try:
-                    portfolio = self.db.get_portfolio(self._current_user)
+                    portfolio = self.db.get_portfolio(session.account_number)
                     position = next((pos for pos in portfolio if pos['stock_symbol'] == symbol), None)
                     if not position or int(position['shares']) < shares:
                         available = position['shares'] if position else 0
@@ -631,7 +599,7 @@ class FinanceAgent:
                 "show_data": True
             }
             
-            self._pending_operation = trade_data
+            session.pending_operation = trade_data
             
             # Build detailed response
             response = [
@@ -651,11 +619,60 @@ class FinanceAgent:
         except ValueError as ve:
             return f"❌ Invalid trade command: {str(ve)}\nExample: buy AAPL 10"
         except Exception as e:
-            print(f"Trade error: {str(e)}")  # Log error for debugging
+            logger.exception("Trade error: %s", e)
             return "❌ Error processing trade. Please try again with format: buy/sell SYMBOL SHARES"
 
+    def _handle_basket_command(self, session: Session, legs: List[Dict]) -> str:
+        """Price a multi-symbol order and stage it for confirmation."""
+        if any(leg['shares'] <= 0 for leg in legs):
+            return "❌ Number of shares must be positive."
+
+        symbols = list(dict.fromkeys(leg['symbol'] for leg in legs))
+        quotes = self.db.get_real_time_quotes(symbols)
+
+        unpriced = [symbol for symbol in symbols if quotes[symbol].get('error')]
+        if unpriced:
+            return f"❌ Error: Unable to get quotes for {', '.join(unpriced)}"
+
+        orders = []
+        lines = ["🧺 Basket Order Confirmation"]
+        total_cost = 0.0
+        total_proceeds = 0.0
+        for leg in legs:
+            price = float(quotes[leg['symbol']]['price'])
+            amount = price * leg['shares']
+            if leg['trade_type'] == 'BUY':
+                total_cost += amount
+            else:
+                total_proceeds += amount
+            orders.append({**leg, "price": price})
+            lines.append(
+                f"{leg['trade_type']} {leg['shares']:,} {leg['symbol']} @ ${price:.2f} = ${amount:,.2f}"
+            )
+
+        lines += [
+            "",
+            f"Total cost: ${total_cost:,.2f}",
+            f"Total proceeds: ${total_proceeds:,.2f}",
+            f"Net cash: ${total_proceeds - total_cost:+,.2f}",
+            "",
+            "Please confirm by saying 'yes' or 'confirm'"
+        ]
+
+        session.pending_operation = {
+            "type": "basket",
+            "operation": "BASKET",
+            "data": {"orders": orders},
+            "natural_response": f"Would you like to execute these {len(orders)} orders?",
+            "requires_confirmation": True,
+            "show_data": True
+        }
+        return "\n".join(lines)
+
     def _get_stock_quote(self, symbol: str) -> str:
         """Get and format stock quote."""
+        if symbol not in self.symbols:
+            return f"❌ Unknown symbol: {symbol}\nUse 'search <company name>' to find it."
         try:
             quote = self.db.get_real_time_quote(symbol)
             return (
@@ -667,41 +684,47 @@ class FinanceAgent:
         except Exception as e:
             return f"❌ Error getting quote for {symbol}: {str(e)}"
 
-    def _get_balance(self) -> str:
+    def _get_balance(self, session: Session) -> str:
         """Get user's current balance."""
-        if not self._current_user:
+        if not session.account_number:
             return "Please log in to check your balance."
         try:
-            user = self.db.get_user(self._current_user)
+            user = self.db.get_user(session.account_number)
             return f"💰 Current Balance: ${float(user['balance']):,.2f}"
         except Exception as e:
             return f"Error getting balance: {str(e)}"
 
-    def _get_watchlist(self) -> str:
+    def _get_watchlist(self, session: Session) -> str:
         """Get user's watchlist with current prices."""
-        if not self._current_user:
+        if not session.account_number:
             return "Please log in to view your watchlist."
         try:
-            watchlist = self.db.get_watchlist(self._current_user)
+            watchlist = self.db.get_watchlist(session.account_number)
             if not watchlist:
                 return "Your watchlist is empty."
             
+            # get_watchlist has already quoted every item in one batch
             lines = ["📋 Your Watchlist:"]
             for item in watchlist:
+                if "price" not in item:
+                    lines.append(f"- {item['stock_symbol']}: quote unavailable")
+                    continue
                 lines.append(
                     f"- {item['stock_symbol']}: ${float(item['price']):.2f} "
-                    f"({float(item['change']):.2f}%)"
+                    f"({float(item.get('change', 0)):.2f}%)"
                 )
             return "\n".join(lines)
         except Exception as e:
             return f"Error getting watchlist: {str(e)}"
 
-    def _add_to_watchlist(self, symbol: str) -> str:
+    def _add_to_watchlist(self, session: Session, symbol: str) -> str:
         """Add a stock to user's watchlist."""
-        if not self._current_user:
+        if not session.account_number:
             return "Please log in to modify your watchlist."
+        if symbol not in self.symbols:
+            return f"❌ Unknown symbol: {symbol}\nUse 'search <company name>' to find it."
         try:
-            result = self.db.add_to_watchlist(self._current_user, symbol)
+            result = self.db.add_to_watchlist(session.account_number, symbol)
             return f"{'✅' if result['status'] == 'success' else '❌'} {result['message']}"
         except Exception as e:
             return f"Error adding to watchlist: {str(e)}"
@@ -723,19 +746,22 @@ class FinanceAgent:
 11. chat <message> - Chat with agent
 12. clear - Clear screen
 13. exit - Exit application
+14. stats - Show database latency and pool stats
+15. symbols - List supported symbols by sector
+16. search <name> - Find a symbol by ticker or company name
 
 You can also ask questions naturally!
 """
 
-    def _execute_operation(self, operation: Dict) -> str:
+    def _execute_operation(self, session: Session, operation: Dict) -> str:
         """Execute parsed operations with proper error handling."""
         try:
-            if not self._current_user:
+            if not session.account_number:
                 return "❌ Please log in to perform this operation."
 
             if operation["type"] == "trade":
                 result = self.db.execute_trade(
-                    self._current_user,
+                    session.account_number,
                     operation["operation"],
                     operation["data"]["symbol"],
                     operation["data"]["shares"],
@@ -744,17 +770,24 @@ You can also ask questions naturally!
                 
                 if result["status"] == "success":
                     # Update portfolio summary after trade
-                    portfolio = self.db.get_portfolio(self._current_user)
+                    portfolio = self.db.get_portfolio(session.account_number)
+                    return f"✅ {result['message']}\n\n{self._format_portfolio_summary(portfolio)}"
+                return f"❌ {result['message']}"
+
+            elif operation["type"] == "basket":
+                result = self.db.execute_trades(session.account_number, operation["data"]["orders"])
+                if result["status"] == "success":
+                    portfolio = self.db.get_portfolio(session.account_number)
                     return f"✅ {result['message']}\n\n{self._format_portfolio_summary(portfolio)}"
                 return f"❌ {result['message']}"
             
             elif operation["type"] == "account":
                 if operation["operation"] == "READ":
                     if "portfolio" in operation["data"]:
-                        portfolio = self.db.get_portfolio(self._current_user)
+                        portfolio = self.db.get_portfolio(session.account_number)
                         return self._format_portfolio_summary(portfolio)
                     elif "watchlist" in operation["data"]:
-                        watchlist = self.db.get_watchlist(self._current_user)
+                        watchlist = self.db.get_watchlist(session.account_number)
                         return "Watchlist:\n" + "\n".join(
                             f"- {item['stock_symbol']}: ${item['price']:.2f}" 
                             for item in watchlist
@@ -765,21 +798,24 @@ You can also ask questions naturally!
         except Exception as e:
             return f"❌ Error executing operation: {str(e)}"
 
-    def confirm_operation(self) -> str:
+    def confirm_operation(self, session: Optional[Session] = None) -> str:
         """Execute a pending operation after user confirmation."""
-        if self._pending_operation:
-            operation = self._pending_operation
-            self._pending_operation = None
-            return self._execute_operation(operation)
+        session = session or self.default_session
+        operation = session.take_pending_operation()
+        if operation:
+            if not self._check_session(session):
+                return "❌ Your session has expired. Please log in again."
+            return self._execute_operation(session, operation)
         return "No pending operation to confirm."
 
-    def get_portfolio_summary(self) -> str:
+    def get_portfolio_summary(self, session: Optional[Session] = None) -> str:
         """Get formatted portfolio summary for current user."""
-        if not self._current_user:
+        session = session or self.default_session
+        if not session.account_number:
             return "Please log in to view portfolio."
         
         try:
-            portfolio = self.db.get_portfolio(self._current_user)
+            portfolio = self.db.get_portfolio(session.account_number)
             if not portfolio:
                 return "Your portfolio is empty."
             
@@ -807,11 +843,11 @@ You can also ask questions naturally!
             
             return "\n".join(summary)
         except Exception as e:
-            print(f"Error formatting portfolio: {str(e)}")
+            logger.error("Error formatting portfolio: %s", e)
             return "Error displaying portfolio."
         
 
-    def _get_market_summary(self) -> str:
+    def _get_market_summary(self, session: Session) -> str:
         """Get a summary of current market conditions."""
         try:
             market_data = self.get_market_data()
@@ -851,102 +887,36 @@ You can also ask questions naturally!
         except Exception as e:
             return f"Error analyzing {symbol}: {str(e)}"
         
-    def get_supported_symbols(self) -> List[str]:
-        """Get list of supported stock symbols."""
-        return {
-            # Technology
-            'AAPL': 'Apple Inc.',
-            'MSFT': 'Microsoft Corporation',
-            'GOOGL': 'Alphabet Inc. (Google)',
-            'AMZN': 'Amazon.com Inc.',
-            'META': 'Meta Platforms Inc. (Facebook)',
-            'NVDA': 'NVIDIA Corporation',
-            'AMD': 'Advanced Micro Devices Inc.',
-            'INTC': 'Intel Corporation',
-            'CSCO': 'Cisco Systems Inc.',
-            'ORCL': 'Oracle Corporation',
-            'CRM': 'Salesforce Inc.',
-            'ADBE': 'Adobe Inc.',
-            
-            # Financial
-            'JPM': 'JPMorgan Chase & Co.',
-            'BAC': 'Bank of America Corp.',
-            'GS': 'Goldman Sachs Group Inc.',
-            'V': 'Visa Inc.',
-            'MA': 'Mastercard Inc.',
-            
-            # Consumer
-            'WMT': 'Walmart Inc.',
-            'COST': 'Costco Wholesale Corporation',
-            'PG': 'Procter & Gamble Co.',
-            'KO': 'The Coca-Cola Company',
-            'PEP': 'PepsiCo Inc.',
-            'MCD': 'McDonald\'s Corporation',
-            
-            # Entertainment/Media
-            'DIS': 'The Walt Disney Company',
-            'NFLX': 'Netflix Inc.',
-            'CMCSA': 'Comcast Corporation',
-            
-            # Healthcare
-            'JNJ': 'Johnson & Johnson',
-            'PFE': 'Pfizer Inc.',
-            'UNH': 'UnitedHealth Group Inc.',
-            'ABBV': 'AbbVie Inc.',
-            
-            # Industrial/Manufacturing
-            'CAT': 'Caterpillar Inc.',
-            'BA': 'Boeing Company',
-            'GE': 'General Electric Company',
-            
-            # Energy
-            'XOM': 'Exxon Mobil Corporation',
-            'CVX': 'Chevron Corporation',
-            
-            # Telecommunications
-            'T': 'AT&T Inc.',
-            'VZ': 'Verizon Communications Inc.',
-            
-            # Automotive
-            'TSLA': 'Tesla Inc.',
-            'F': 'Ford Motor Company',
-            'GM': 'General Motors Company',
-            
-            # Retail
-            'TGT': 'Target Corporation',
-            'HD': 'The Home Depot Inc.',
-            'NKE': 'Nike Inc.',
-        }
+    def get_supported_symbols(self) -> Dict[str, str]:
+        """Get supported stock symbols and their company names."""
+        return {info.symbol: info.name for info in self.symbols}
 
-    def _get_symbols_command(self) -> str:
-        """Format and return list of supported symbols."""
-        symbols = self.get_supported_symbols()
-        
-        # Group symbols by sector
-        sectors = {
-            'Technology': ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA', 'AMD', 'INTC', 'CSCO', 'ORCL', 'CRM', 'ADBE'],
-            'Financial': ['JPM', 'BAC', 'GS', 'V', 'MA'],
-            'Consumer': ['WMT', 'COST', 'PG', 'KO', 'PEP', 'MCD'],
-            'Entertainment': ['DIS', 'NFLX', 'CMCSA'],
-            'Healthcare': ['JNJ', 'PFE', 'UNH', 'ABBV'],
-            'Industrial': ['CAT', 'BA', 'GE'],
-            'Energy': ['XOM', 'CVX'],
-            'Telecom': ['T', 'VZ'],
-            'Automotive': ['TSLA', 'F', 'GM'],
-            'Retail': ['TGT', 'HD', 'NKE']
-        }
-        
-        lines = ["📈 Supported Stock Symbols:"]
-        
-        for sector, sector_symbols in sectors.items():
+    def _get_symbols_command(self, per_sector: int = 10) -> str:
+        """Format supported symbols by sector, listing the first few of each."""
+        lines = [f"📈 Supported Stock Symbols ({len(self.symbols):,}):"]
+
+        for sector, listings in sorted(self.symbols.sectors().items()):
             lines.append(f"\n{sector}:")
-            for symbol in sector_symbols:
-                lines.append(f"  • {symbol}: {symbols[symbol]}")
-        
+            for info in listings[:per_sector]:
+                lines.append(f"  • {info.symbol}: {info.name}")
+            if len(listings) > per_sector:
+                lines.append(f"  … and {len(listings) - per_sector:,} more")
+
         lines.append("\nUsage:")
-        lines.append("- quote <SYMBOL>     (e.g., quote AAPL)")
+        lines.append("- quote <SYMBOL>     (e.g., quote AAPL, quote RELIANCE.NS)")
         lines.append("- buy <SYMBOL> <QTY> (e.g., buy AAPL 10)")
         lines.append("- sell <SYMBOL> <QTY> (e.g., sell MSFT 5)")
         lines.append("- watch <SYMBOL>     (e.g., watch GOOGL)")
-        
-        return "\n".join(lines)
\ No newline at end of file
+        lines.append("- search <NAME>      (e.g., search tata)")
+
+        return "\n".join(lines)
+
+    def _search_symbols(self, text: str) -> str:
+        """Find listings by ticker, company-name prefix or a misspelt company name."""
+        matches = self.symbols.search(text)
+        if not matches:
+            return f"No symbols found for '{text}'."
+        lines = [f"🔎 Symbols matching '{text}':"]
+        for info in matches:
+            lines.append(f"  • {info.symbol}: {info.name} ({info.exchange}, {info.sector})")
+        return "\n".join(lines)
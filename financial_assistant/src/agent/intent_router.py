@@ -0,0 +1,226 @@
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Tuple
+import re
+from src.market.symbol_index import SymbolIndex, TOKEN_PATTERN
+
+# (intent, trigger words, pattern) in priority order. A pattern is only run
+# when one of its trigger words occurs in the query, which it must contain
+# to match; patterns see the lower-cased, whitespace-collapsed query and
+# their first group, if any, is the symbol (or the search text)
+COMMAND_ROUTES = [
+    # Whole order words only, as TOKEN_PATTERN splits them: not the sell in sell-off
+    ("trade", {"buy", "sell"}, r"(?<![a-z0-9])(?<![a-z0-9][.&'-])(?:buy|sell)(?![a-z0-9]|[.&'-][a-z0-9])"),
+    ("greeting", {"hi", "hello", "hey"}, r"\b(?:hi|hello|hey)\b"),
+    ("how_are_you", {"how"}, r"\b(?:how are you|how's it going)\b"),
+    ("thanks", {"thank", "thanks"}, r"\b(?:thank you|thanks)\b"),
+    ("goodbye", {"bye", "goodbye"}, r"\b(?:bye|goodbye)\b"),
+    ("market_summary", {"market"},
+     r"\b(?:how.*market|what.*market|market.*today|market.*analysis|market.*overview)\b"),
+    ("watch_add", {"add"}, r"\badd\s+([\w.&-]+)\s+to\s+watchlist"),
+    ("watch_remove", {"remove"}, r"\bremove\s+([\w.&-]+)\s+from\s+watchlist"),
+    ("watch_remove", {"unwatch"}, r"\bunwatch\s+([\w.&-]+)"),
+    ("watch_add", {"watch"}, r"\bwatch\s+([\w.&-]+)"),
+    ("quote", {"quote"}, r"^quote\s+([\w.&-]+)"),
+    ("symbol_search", {"search"}, r"^search\s+(.+)"),
+]
+
+# Whole-query commands, checked after market questions and before watchlist edits
+EXACT_COMMANDS = {
+    "balance": "balance",
+    "my balance": "balance",
+    "show balance": "balance",
+    "check balance": "balance",
+    "portfolio": "portfolio",
+    "show portfolio": "portfolio",
+    "my portfolio": "portfolio",
+    "watchlist": "watchlist",
+    "my watchlist": "watchlist",
+    "help": "help",
+    "symbols": "symbols",
+}
+
+SENTIMENT_ROUTES = [
+    ("greeting", {"hi", "hello", "hey", "good"},
+     r"\b(?:hi|hello|hey|good morning|good afternoon|good evening)\b"),
+    ("question", {"how", "what", "why", "when", "where", "can", "could"},
+     r"\b(?:how|what|why|when|where|can you|could you)\b"),
+    ("buy", {"buy", "purchase", "invest", "get", "acquire"}, r"\b(?:buy|purchase|invest in|get some|acquire)\b"),
+    ("sell", {"sell", "dump", "get", "dispose", "exit"}, r"\b(?:sell|dump|get rid of|dispose|exit)\b"),
+]
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Order tokens: symbol tokens, plus share counts with their sign so the
+# handler can reject "buy -5 AAPL" instead of buying 5
+TRADE_TOKEN_PATTERN = re.compile(r"(?<![A-Za-z0-9])-\d+(?![A-Za-z0-9]|[.&'-][A-Za-z0-9])|" + TOKEN_PATTERN.pattern)
+
+
+class Intent(NamedTuple):
+    name: str
+    slots: Dict[str, Any]
+
+
+class _RouteTable:
+    def __init__(self, routes: List[Tuple[str, Set[str], str]]):
+        """Compile prioritized routes once, indexed by their trigger words."""
+        self.names = [name for name, _, _ in routes]
+        self.triggers = [frozenset(triggers) for _, triggers, _ in routes]
+        self.patterns = [re.compile(pattern) for _, _, pattern in routes]
+
+    def match(self, text: str, words: Set[str]) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """Return the name and groups of the highest-priority route matching ``text``.
+
+        ``words`` are the query's tokens; routes none of whose trigger words
+        appear are skipped without running their pattern, so a typical
+        query runs one or two regexes instead of all of them.
+        """
+        for name, triggers, pattern in zip(self.names, self.triggers, self.patterns):
+            if triggers.isdisjoint(words):
+                continue
+            found = pattern.search(text)
+            if found:
+                return name, found.groups()
+        return None
+
+
+class IntentRouter:
+    def __init__(self, symbols: SymbolIndex):
+        """Initialize a router for agent commands over the tradable ``symbols``.
+
+        ``route`` returns the same intent the agent's old sequence of regex
+        checks picked, tokenizing the query once and running only the
+        patterns its words can trigger, with the slots each handler needs
+        already extracted and symbols resolved to their listing.
+        """
+        self.symbols = symbols
+        self._commands = _RouteTable(COMMAND_ROUTES)
+        self._sentiment = _RouteTable(SENTIMENT_ROUTES)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def route(self, query: str) -> Intent:
+        """Classify a query; ``llm`` means no command matched."""
+        text = self.normalize(query)
+        # None of these contain a word that triggers a higher-ranked route
+        if text in EXACT_COMMANDS:
+            return Intent("command", {"command": EXACT_COMMANDS[text]})
+
+        found = self._commands.match(text, set(WORD_PATTERN.findall(text)))
+        if found is None:
+            return Intent("llm", {})
+
+        name, groups = found
+        if name == "trade":
+            slots = self.trade_slots(TRADE_TOKEN_PATTERN.findall(query))
+            # "should I sell now?" is a question for the LLM, not an order
+            if slots is None or (slots["symbol"] is None and slots["shares"] is None):
+                return Intent("llm", {})
+            return Intent(name, slots)
+        if name == "symbol_search":
+            return Intent(name, {"text": groups[0]})
+        if groups:
+            # Unknown symbols are passed on as typed for the handler to reject
+            return Intent(name, {"symbol": self.symbols.resolve(groups[0]) or groups[0].upper()})
+        return Intent(name, {})
+
+    def _trade_terms(self, tokens: List[str]) -> List[Tuple[str, Any]]:
+        """Reduce an order to its actions, share counts and resolved symbols, in order."""
+        terms = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            lowered = token.lower()
+            if lowered in ("buy", "sell"):
+                terms.append(("action", lowered.upper()))
+                i += 1
+            elif token.lstrip("-").isdigit():
+                terms.append(("shares", int(token)))
+                i += 1
+            else:
+                # Company names may span words ("bank of america"), longest
+                # first, but never an action or a share count
+                end = i + 1
+                while end < len(tokens) and not self._is_order_word(tokens[end]):
+                    end += 1
+                symbol, used = self.symbols.match_name(tokens[i:end])
+                if symbol is None:
+                    symbol, used = self.symbols.resolve(token), 1
+                if symbol is not None:
+                    terms.append(("symbol", symbol))
+                i += used
+        return terms
+
+    @staticmethod
+    def _is_order_word(token: str) -> bool:
+        return token.lower() in ("buy", "sell") or token.lstrip("-").isdigit()
+
+    def trade_slots(self, tokens: List[str]) -> Optional[Dict[str, Any]]:
+        """Extract the action, the first leg's symbol and shares, and every leg of a basket.
+
+        Without a complete leg, the action is the first one named and the
+        symbol and shares are the first to follow it, for the handler to
+        ask about whatever is missing. Returns None when no token is a buy
+        or sell action.
+        """
+        terms = self._trade_terms(tokens)
+        legs = self._legs(terms)
+        if legs:
+            first = legs[0]
+            return {
+                "action": first["trade_type"],
+                "symbol": first["symbol"],
+                "shares": first["shares"],
+                "legs": legs,
+            }
+
+        start = next((i for i, (kind, _) in enumerate(terms) if kind == "action"), None)
+        if start is None:
+            return None
+        slots = {"action": terms[start][1], "symbol": None, "shares": None, "legs": legs}
+        for kind, value in terms[start + 1:]:
+            if kind != "action" and slots[kind] is None:
+                slots[kind] = value
+        return slots
+
+    def parse_trade_legs(self, tokens: List[str]) -> List[Dict]:
+        """Split an order such as 'buy AAPL 10 MSFT 5 and sell 3 TSLA' into legs."""
+        return self._legs(self._trade_terms(tokens))
+
+    @staticmethod
+    def _legs(terms: List[Tuple[str, Any]]) -> List[Dict]:
+        legs = []
+        action = None
+        shares = None
+        symbol = None
+
+        for kind, value in terms:
+            if kind == "action":
+                action = value
+                shares = symbol = None
+            elif kind == "shares":
+                shares = value
+            else:
+                symbol = value
+
+            # A symbol pairs with the share count on either side of it
+            if action and shares is not None and symbol:
+                legs.append({"trade_type": action, "symbol": symbol, "shares": shares})
+                shares = symbol = None
+
+        return legs
+
+    def sentiment(self, text: str) -> Dict:
+        """Classify text as chat, a buy or sell intention on a symbol, or something to analyze."""
+        lowered = self.normalize(text)
+        found = self._sentiment.match(lowered, set(WORD_PATTERN.findall(lowered)))
+        if found is None:
+            return {"action": "ANALYZE"}
+
+        name = found[0]
+        if name in ("greeting", "question"):
+            return {"action": "CHAT", "type": name}
+
+        symbols = self.symbols.extract(text)
+        if symbols:
+            return {"action": name.upper(), "symbol": symbols[0]}
+        return {"action": "ANALYZE"}
@@ -0,0 +1,299 @@
+from typing import Dict, Any, Callable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import threading
+import logging
+import heapq
+import queue
+import time
+
+logger = logging.getLogger(__name__)
+
+# Lower numbers are dispatched first
+PRIORITY_TRADE = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_CHAT = 2
+
+_DONE = object()
+
+
+class SchedulerBusy(Exception):
+    """Raised when the LLM queue is full and the request was not admitted or was shed."""
+
+
+class RequestExpired(Exception):
+    """Raised when an LLM request could not start streaming before its deadline."""
+
+
+class _Job:
+    __slots__ = ("key", "inputs", "priority", "seq", "enqueued_at", "deadline",
+                 "state", "subscribers", "chunks")
+
+    def __init__(self, key: Optional[str], inputs: Dict[str, Any], priority: int, seq: int,
+                 deadline: float):
+        self.key = key
+        self.inputs = inputs
+        self.priority = priority
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        self.state = "queued"
+        self.subscribers: List[queue.SimpleQueue] = []
+        self.chunks: List[str] = []
+
+
+class LLMScheduler:
+    def __init__(self, stream_fn: Callable[[Dict[str, Any]], Iterator[str]], parallelism: int = 1,
+                 max_queue: int = 64, batch_window: float = 0.02, default_timeout: float = 60.0,
+                 wait_samples: int = 1000):
+        """Initialize a priority scheduler in front of a streaming LLM call.
+
+        At most ``parallelism`` calls to ``stream_fn`` run at once, which
+        should match the server's parallel slots (OLLAMA_NUM_PARALLEL);
+        the rest wait in a queue of up to ``max_queue`` requests ordered by
+        priority, then arrival. When a burst opens an idle queue, dispatch
+        waits ``batch_window`` seconds so the requests arriving together
+        are started together and fill the server's slots in one go.
+        Requests submitted with the same ``key`` while one is queued or
+        running share that single call, replaying what it has streamed so
+        far. A request that cannot start streaming within its timeout is
+        dropped rather than sent late, and a full queue sheds its
+        lowest-priority request in favour of a more urgent one.
+        """
+        if parallelism < 1 or max_queue < 1:
+            raise ValueError("LLM scheduler needs at least one slot and one queue entry")
+
+        self.stream_fn = stream_fn
+        self.parallelism = parallelism
+        self.max_queue = max_queue
+        self.batch_window = batch_window
+        self.default_timeout = default_timeout
+
+        self._cond = threading.Condition(threading.Lock())
+        self._heap: List[tuple] = []
+        self._by_key: Dict[str, _Job] = {}
+        self._queued = 0
+        self._running = 0
+        self._seq = 0
+        self._batch_opened = 0.0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._waits = deque(maxlen=wait_samples)
+        self._stats = {
+            "submitted": 0,
+            "dispatched": 0,
+            "coalesced": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "shed": 0,
+            "expired": 0,
+            "cancelled": 0,
+            "max_queue_depth": 0,
+        }
+
+    def start(self) -> None:
+        """Start the dispatcher thread and the worker pool."""
+        with self._cond:
+            if self._thread is not None or self._closed:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="llm-worker")
+            self._thread = threading.Thread(target=self._run, name="llm-scheduler", daemon=True)
+            self._thread.start()
+
+    def stream(self, inputs: Dict[str, Any], priority: int = PRIORITY_CHAT, timeout: Optional[float] = None,
+               key: Optional[str] = None) -> Iterator[str]:
+        """Queue a request and yield its chunks once it runs.
+
+        Raises SchedulerBusy if the queue is full, RequestExpired if no
+        chunk arrived within ``timeout`` seconds, or whatever ``stream_fn``
+        raised. Closing the iterator early withdraws the request.
+        """
+        self.start()
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        inbox = queue.SimpleQueue()
+        job = self._submit(inputs, priority, deadline, key, inbox)
+        expired = False
+        try:
+            started = False
+            while True:
+                try:
+                    item = inbox.get(timeout=None if started else max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    expired = True
+                    raise RequestExpired(f"No response within {timeout:.0f}s")
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    expired = isinstance(item, RequestExpired)
+                    raise item
+                started = True
+                yield item
+        finally:
+            self._unsubscribe(job, inbox, expired)
+
+    def _submit(self, inputs: Dict[str, Any], priority: int, deadline: float, key: Optional[str],
+                inbox: queue.SimpleQueue) -> _Job:
+        with self._cond:
+            if self._closed:
+                raise SchedulerBusy("LLM scheduler is closed")
+            self._stats["submitted"] += 1
+
+            job = self._by_key.get(key) if key is not None else None
+            if job is not None:
+                for chunk in job.chunks:
+                    inbox.put(chunk)
+                job.subscribers.append(inbox)
+                job.deadline = max(job.deadline, deadline)
+                if job.state == "queued" and priority < job.priority:
+                    job.priority = priority
+                    heapq.heappush(self._heap, (priority, job.seq, job))
+                self._stats["coalesced"] += 1
+                return job
+
+            if self._queued >= self.max_queue:
+                self._shed_for(priority)
+
+            self._seq += 1
+            job = _Job(key, inputs, priority, self._seq, deadline)
+            job.subscribers.append(inbox)
+            if key is not None:
+                self._by_key[key] = job
+            if self._queued == 0:
+                self._batch_opened = job.enqueued_at
+            heapq.heappush(self._heap, (priority, job.seq, job))
+            self._queued += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queued)
+            self._cond.notify_all()
+            return job
+
+    def _shed_for(self, priority: int) -> None:
+        """Make room for a request of ``priority`` by dropping the least urgent queued one; caller holds the lock."""
+        queued = [job for _, _, job in self._heap if job.state == "queued"]
+        worst = max(queued, key=lambda job: (job.priority, job.seq))
+        if worst.priority <= priority:
+            self._stats["rejected"] += 1
+            raise SchedulerBusy("The assistant is busy; please try again shortly")
+        self._stats["shed"] += 1
+        self._finish_queued(worst, SchedulerBusy("Dropped for a more urgent request; please try again"))
+
+    def _finish_queued(self, job: _Job, error: Optional[Exception]) -> None:
+        """Take a job out of the queue without running it; caller holds the lock."""
+        job.state = "dropped"
+        self._queued -= 1
+        if job.key is not None and self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+        if error is not None:
+            for inbox in job.subscribers:
+                inbox.put(error)
+
+    def _unsubscribe(self, job: _Job, inbox: queue.SimpleQueue, expired: bool) -> None:
+        with self._cond:
+            if expired:
+                self._stats["expired"] += 1
+            if inbox in job.subscribers:
+                job.subscribers.remove(inbox)
+            # Nobody is waiting any more: never start it, or stop it at the next chunk
+            if not job.subscribers and job.state == "queued":
+                if not expired:
+                    self._stats["cancelled"] += 1
+                self._finish_queued(job, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and (self._queued == 0 or self._running >= self.parallelism):
+                    self._cond.wait()
+                if self._closed:
+                    return
+
+                # Let the rest of a burst arrive so it is dispatched together
+                remaining = self._batch_opened + self.batch_window - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+                now = time.monotonic()
+                launch = []
+                while self._heap and self._running < self.parallelism:
+                    priority, _, job = heapq.heappop(self._heap)
+                    if job.state != "queued" or priority != job.priority:
+                        continue
+                    if job.deadline <= now:
+                        # Its callers have given up on it already
+                        self._finish_queued(job, RequestExpired("Request expired in the queue"))
+                        continue
+                    job.state = "running"
+                    self._queued -= 1
+                    self._running += 1
+                    self._stats["dispatched"] += 1
+                    self._waits.append(now - job.enqueued_at)
+                    launch.append(job)
+
+            for job in launch:
+                self._executor.submit(self._execute, job)
+
+    def _execute(self, job: _Job) -> None:
+        end = _DONE
+        stream = None
+        try:
+            stream = self.stream_fn(job.inputs)
+            for chunk in stream:
+                with self._cond:
+                    if not job.subscribers:
+                        self._stats["cancelled"] += 1
+                        end = None
+                        break
+                    job.chunks.append(chunk)
+                    subscribers = list(job.subscribers)
+                for inbox in subscribers:
+                    inbox.put(chunk)
+        except Exception as e:
+            logger.warning("LLM request failed: %s", e)
+            end = e
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            with self._cond:
+                job.state = "done"
+                self._running -= 1
+                if end is not None:
+                    self._stats["completed" if end is _DONE else "failed"] += 1
+                if job.key is not None and self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+                subscribers = list(job.subscribers)
+                self._cond.notify_all()
+            if end is not None:
+                for inbox in subscribers:
+                    inbox.put(end)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait-time percentiles and request outcome counters."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_depth"] = self._queued
+            stats["in_flight"] = self._running
+            stats["parallelism"] = self.parallelism
+            waits = sorted(self._waits)
+        stats["wait_avg_ms"] = sum(waits) / len(waits) * 1000 if waits else 0.0
+        stats["wait_p50_ms"] = waits[len(waits) // 2] * 1000 if waits else 0.0
+        stats["wait_p95_ms"] = waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000 if waits else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Stop dispatching; queued requests fail with SchedulerBusy, running ones finish."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            for _, _, job in self._heap:
+                if job.state == "queued":
+                    self._stats["shed"] += 1
+                    self._finish_queued(job, SchedulerBusy("LLM scheduler is closed"))
+            self._heap.clear()
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
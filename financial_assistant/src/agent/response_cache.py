@@ -0,0 +1,149 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import threading
+import hashlib
+import logging
+import sqlite3
+import json
+import time
+import re
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, whitespace and trailing punctuation so trivially different phrasings share a key."""
+    query = re.sub(r"\s+", " ", query.lower()).strip()
+    return query.rstrip("?!. ")
+
+
+def make_key(query: str, context: Dict[str, Any]) -> str:
+    """Build a cache key from the normalized query and the context fields that affect the answer."""
+    fingerprint = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha256(f"{normalize_query(query)}\0{fingerprint}".encode()).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, capacity: int = 512, ttl: float = 3600.0, path: Optional[str] = None):
+        """Initialize a bounded LRU cache of LLM responses.
+
+        Entries live for ``ttl`` seconds unless ``set`` gives their own
+        time-to-live. With ``path`` entries are also written to a SQLite
+        file, so answers survive restarts and are shared by every process
+        using the same file; the in-memory LRU stays in front of it.
+        Expiry uses wall-clock time so persisted entries age correctly.
+        """
+        if capacity < 1:
+            raise ValueError("Response cache capacity must be at least 1")
+
+        self.capacity = capacity
+        self.ttl = ttl
+        self.path = path
+
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "bypassed": 0}
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+
+    def _store(self, key: str, response: str, expires_at: float) -> None:
+        """Insert an entry and evict least recently used ones; caller holds the lock."""
+        self._entries[key] = (response, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    self._store(key, row[0], row[1])
+                    self._stats["disk_hits"] += 1
+                    return row[0]
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, response: str, ttl: Optional[float] = None) -> None:
+        """Cache a response, optionally with its own time-to-live."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store(key, response, expires_at)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                        (key, response, expires_at)
+                    )
+                except sqlite3.Error as e:
+                    logger.warning("Could not persist cached response: %s", e)
+
+    def count_bypass(self) -> None:
+        """Count a request that was deliberately not cached."""
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry, including persisted ones."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit, miss and bypass counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["capacity"] = self.capacity
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close the SQLite file, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, configured from the environment."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache(
+                capacity=int(os.getenv("LLM_CACHE_CAPACITY", "512")),
+                ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+                path=os.getenv("LLM_CACHE_PATH") or None
+            )
+        return _shared_cache
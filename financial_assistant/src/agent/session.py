@@ -0,0 +1,144 @@
+from typing import Dict, Any, Optional
+from collections import OrderedDict, deque
+import threading
+import secrets
+import time
+import os
+
+
+class Session:
+    __slots__ = ("session_id", "account_number", "session_token", "pending_operation",
+                 "history", "last_context_report", "expires_at", "lock")
+
+    def __init__(self, session_id: str, history_limit: int = 20):
+        """Initialize the per-user conversation state served by a shared FinanceAgent.
+
+        Holds the logged-in account, its login session token, the trade
+        awaiting confirmation and the last ``history_limit`` chat messages;
+        everything else (database pool, caches, LLM client) lives on the
+        agent and is shared by every session.
+        """
+        self.session_id = session_id
+        self.account_number: Optional[str] = None
+        self.session_token: Optional[str] = None
+        self.pending_operation: Optional[Dict] = None
+        self.history: deque = deque(maxlen=history_limit)
+        self.last_context_report: Optional[Dict[str, Any]] = None
+        self.expires_at = 0.0
+        self.lock = threading.Lock()
+
+    def login(self, account_number: str, session_token: Optional[str] = None) -> None:
+        """Bind the session to an account, dropping anything left from a previous user."""
+        with self.lock:
+            if account_number != self.account_number:
+                self.pending_operation = None
+                self.history.clear()
+            self.account_number = account_number
+            self.session_token = session_token
+
+    def logout(self) -> None:
+        """Forget the account and its pending operation."""
+        with self.lock:
+            self.account_number = None
+            self.session_token = None
+            self.pending_operation = None
+
+    def take_pending_operation(self) -> Optional[Dict]:
+        """Return and clear the operation awaiting confirmation."""
+        with self.lock:
+            operation, self.pending_operation = self.pending_operation, None
+            return operation
+
+
+class SessionManager:
+    def __init__(self, ttl: float = 1800.0, max_sessions: int = 10000, history_limit: int = 20):
+        """Initialize an in-memory registry of agent sessions.
+
+        Sessions expire ``ttl`` seconds after their last use. They are kept
+        in order of last use, so expired ones are always at the front and
+        purging costs only the sessions it removes; when ``max_sessions``
+        is reached the least recently used session is evicted.
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.history_limit = history_limit
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "expired": 0, "evicted": 0, "ended": 0}
+
+    def _purge_expired(self, now: float) -> None:
+        """Drop expired sessions from the front; caller holds the lock."""
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.expires_at > now:
+                break
+            self._sessions.popitem(last=False)
+            self._stats["expired"] += 1
+
+    def create(self, account_number: Optional[str] = None, session_token: Optional[str] = None) -> Session:
+        """Start a session, optionally already logged in."""
+        session = Session(secrets.token_urlsafe(16), self.history_limit)
+        if account_number:
+            session.login(account_number, session_token)
+
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._stats["evicted"] += 1
+            session.expires_at = now + self.ttl
+            self._sessions[session.session_id] = session
+            self._stats["created"] += 1
+        return session
+
+    def get(self, session_id: Optional[str]) -> Optional[Session]:
+        """Return a live session and extend it, or None if unknown or expired."""
+        if not session_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            session.expires_at = now + self.ttl
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def end(self, session_id: str) -> bool:
+        """End one session."""
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                return False
+            self._stats["ended"] += 1
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return session counts."""
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            stats = dict(self._stats)
+            stats["active"] = len(self._sessions)
+        return stats
+
+
+_shared_manager = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_session_manager() -> SessionManager:
+    """Return the process-wide agent session manager, configured from the environment."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = SessionManager(
+                ttl=float(os.getenv("AGENT_SESSION_TTL", "1800")),
+                max_sessions=int(os.getenv("AGENT_SESSION_MAX", "10000")),
+                history_limit=int(os.getenv("AGENT_SESSION_HISTORY", "20"))
+            )
+        return _shared_manager
@@ -0,0 +1,97 @@
+from typing import Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+import time
+import os
+import bcrypt
+
+
+def _hash_password(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _check_password(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int = 12, max_workers: Optional[int] = None, timeout: float = 30.0):
+        """Initialize a bcrypt hasher backed by a process pool.
+
+        bcrypt is deliberately CPU-expensive, so hashing happens in at most
+        ``max_workers`` worker processes: a burst of logins queues there and
+        can take only those cores, not every core the application serves
+        requests on. ``rounds`` is the bcrypt cost factor.
+        """
+        if not 4 <= rounds <= 31:
+            raise ValueError(f"bcrypt cost factor must be between 4 and 31, got {rounds}")
+
+        self.rounds = rounds
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {"hashes": 0, "checks": 0, "total_time": 0.0}
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers: forking a process that runs quote and writer threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _run(self, kind: str, fn, *args) -> Any:
+        start = time.monotonic()
+        try:
+            return self._pool().submit(fn, *args).result(self.timeout)
+        finally:
+            with self._lock:
+                self._stats[kind] += 1
+                self._stats["total_time"] += time.monotonic() - start
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor."""
+        return self._run("hashes", _hash_password, password.encode('utf-8'), self.rounds).decode('utf-8')
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a stored bcrypt hash."""
+        return self._run("checks", _check_password, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hash and check counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        calls = stats["hashes"] + stats["checks"]
+        stats["avg_time"] = stats["total_time"] / calls if calls else 0.0
+        stats["rounds"] = self.rounds
+        stats["max_workers"] = self.max_workers
+        return stats
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_shared_hasher = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_password_hasher() -> PasswordHasher:
+    """Return the process-wide password hasher, configured from the environment."""
+    global _shared_hasher
+    with _shared_lock:
+        if _shared_hasher is None:
+            workers = os.getenv("BCRYPT_WORKERS")
+            _shared_hasher = PasswordHasher(
+                rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+                max_workers=int(workers) if workers else None
+            )
+        return _shared_hasher
@@ -0,0 +1,104 @@
+from typing import Dict, Any, Optional
+import threading
+import secrets
+import time
+import os
+
+
+class SessionStore:
+    def __init__(self, ttl: float = 3600.0, max_sessions: int = 100000):
+        """Initialize an in-memory session token store.
+
+        Tokens are random, expire ``ttl`` seconds after their last use and
+        map to the user data returned at login, so checking an
+        authenticated request is a dictionary lookup instead of a bcrypt
+        verification and a database round trip.
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "validated": 0, "rejected": 0, "expired": 0, "revoked": 0}
+
+    def _purge_expired(self, now: float) -> None:
+        """Drop expired sessions; caller holds the lock."""
+        expired = [token for token, session in self._sessions.items() if session["expires_at"] <= now]
+        for token in expired:
+            del self._sessions[token]
+        self._stats["expired"] += len(expired)
+
+    def create(self, user: Dict[str, Any]) -> str:
+        """Start a session for an authenticated user and return its token."""
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                self._purge_expired(now)
+                if len(self._sessions) >= self.max_sessions:
+                    # Still full: evict the session closest to expiry
+                    oldest = min(self._sessions, key=lambda t: self._sessions[t]["expires_at"])
+                    del self._sessions[oldest]
+                    self._stats["expired"] += 1
+            self._sessions[token] = {"user": dict(user), "expires_at": now + self.ttl}
+            self._stats["created"] += 1
+        return token
+
+    def validate(self, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the session's user data and extend it, or None if unknown or expired."""
+        if not token:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None or session["expires_at"] <= now:
+                if session is not None:
+                    del self._sessions[token]
+                    self._stats["expired"] += 1
+                self._stats["rejected"] += 1
+                return None
+            session["expires_at"] = now + self.ttl
+            self._stats["validated"] += 1
+            return session["user"]
+
+    def revoke(self, token: str) -> bool:
+        """End one session."""
+        with self._lock:
+            if self._sessions.pop(token, None) is None:
+                return False
+            self._stats["revoked"] += 1
+            return True
+
+    def revoke_account(self, account_number: str) -> int:
+        """End every session belonging to an account."""
+        with self._lock:
+            tokens = [
+                token for token, session in self._sessions.items()
+                if session["user"].get("account_number") == account_number
+            ]
+            for token in tokens:
+                del self._sessions[token]
+            self._stats["revoked"] += len(tokens)
+        return len(tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return session counts."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active"] = len(self._sessions)
+        return stats
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_session_store() -> SessionStore:
+    """Return the process-wide session store, configured from the environment."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = SessionStore(
+                ttl=float(os.getenv("SESSION_TTL", "3600")),
+                max_sessions=int(os.getenv("SESSION_MAX", "100000"))
+            )
+        return _shared_store
@@ -0,0 +1,116 @@
+from typing import Dict, Any, Optional, Set, Tuple
+from collections import OrderedDict
+import threading
+import copy
+import time
+
+
+class AccountCache:
+    def __init__(self, capacity: int = 10000, ttl: float = 300.0):
+        """Initialize a bounded LRU cache of per-account database reads.
+
+        Entries are keyed by account and kind (the DatabaseManager read
+        method that produced them) and live for ``ttl`` seconds unless an
+        account change invalidates them first. Values are deep-copied in
+        and out so callers can enrich what they get back. Pass the
+        ``version`` taken for the same account and kind before a database
+        read to ``set`` so a result that raced with an invalidation is not
+        cached.
+        """
+        if capacity < 1:
+            raise ValueError("Account cache capacity must be at least 1")
+
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self._kinds: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+        self._kind_generations: Dict[Tuple[str, str], int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "resets": 0, "evictions": 0}
+
+    def get(self, account_number: str, kind: str) -> Optional[Any]:
+        """Return a copy of a cached value, or None if missing or expired."""
+        key = (account_number, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            value = entry[0]
+        return copy.deepcopy(value)
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        """Delete one entry and its account index slot; caller holds the lock."""
+        del self._entries[key]
+        kinds = self._kinds.get(key[0])
+        if kinds is not None:
+            kinds.discard(key[1])
+            if not kinds:
+                del self._kinds[key[0]]
+
+    def _version(self, account_number: str, kind: str) -> Tuple[int, int, int]:
+        """Current version of one entry; caller holds the lock."""
+        return (
+            self._epoch,
+            self._generations.get(account_number, 0),
+            self._kind_generations.get((account_number, kind), 0),
+        )
+
+    def version(self, account_number: str, kind: str) -> Tuple[int, int, int]:
+        """Return a token that changes whenever the account, or its ``kind`` entry, is invalidated."""
+        with self._lock:
+            return self._version(account_number, kind)
+
+    def set(self, account_number: str, kind: str, value: Any,
+            version: Optional[Tuple[int, int, int]] = None) -> None:
+        """Cache a copy of a value unless the account was invalidated since ``version``."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            if version is not None and version != self._version(account_number, kind):
+                return
+            self._entries[(account_number, kind)] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end((account_number, kind))
+            self._kinds.setdefault(account_number, set()).add(kind)
+            while len(self._entries) > self.capacity:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, account_number: str, kind: Optional[str] = None) -> None:
+        """Drop everything cached for one account, or only its ``kind`` entry."""
+        with self._lock:
+            if kind is not None:
+                key = (account_number, kind)
+                if key in self._entries:
+                    self._remove(key)
+                self._kind_generations[key] = self._kind_generations.get(key, 0) + 1
+                self._stats["invalidations"] += 1
+                return
+            for kind in self._kinds.pop(account_number, ()):
+                del self._entries[(account_number, kind)]
+            self._generations[account_number] = self._generations.get(account_number, 0) + 1
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after missing change notifications."""
+        with self._lock:
+            self._entries.clear()
+            self._kinds.clear()
+            self._generations.clear()
+            self._kind_generations.clear()
+            self._epoch += 1
+            self._stats["resets"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit, miss and invalidation counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
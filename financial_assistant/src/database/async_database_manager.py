@@ -0,0 +1,682 @@
+import asyncpg
+from typing import Dict, List, Any, Optional, Sequence
+from decimal import Decimal
+import asyncio
+import logging
+import json
+import os
+import time
+from dotenv import load_dotenv
+from src.market.quote_cache import QuoteCache
+from src.market.quote_engine import QuoteEngine
+from src.market.providers import MarketDataProvider
+from src.database.market_quotes import MarketQuotes
+from src.database.basket import parse_orders, apply_basket
+from src.database.query_stats import QueryStats, normalize_statement
+from src.database.chat_history_writer import ChatHistoryWriter, ChatRow
+from src.auth.password_hasher import PasswordHasher, get_shared_password_hasher
+from src.auth.session_store import SessionStore, get_shared_session_store
+
+logger = logging.getLogger(__name__)
+
+
+def _numeric(value: float) -> Decimal:
+    """Send a float as the same numeric literal psycopg2 would."""
+    return Decimal(repr(float(value)))
+
+
+class AsyncDatabaseManager:
+    def __init__(self, quote_cache: Optional[QuoteCache] = None,
+                 quote_engine: Optional[QuoteEngine] = None,
+                 provider: Optional[MarketDataProvider] = None,
+                 password_hasher: Optional[PasswordHasher] = None,
+                 session_store: Optional[SessionStore] = None):
+        """Initialize an asyncio counterpart of DatabaseManager on an asyncpg pool.
+
+        Methods mirror DatabaseManager's and return the same shapes, but are
+        coroutines and take ``$n`` placeholders in ``execute_query``. A
+        waiting query holds a pool connection, not a thread, so one event
+        loop can serve many concurrent sessions. Quotes, password hashing
+        and the chat history writer are shared with the sync manager and run
+        their blocking parts in worker threads. Read replicas and the
+        account cache are not used here; every read goes to the primary.
+
+        The pool is created on first use or by ``start``; use the manager as
+        ``async with AsyncDatabaseManager() as db:`` or call ``close``.
+        """
+        load_dotenv()
+        self.db_config = {
+            "database": os.getenv("DB_NAME", "finance_db"),
+            "user": os.getenv("DB_USER", "abhinavuser"),
+            "password": os.getenv("DB_PASSWORD", "your_password"),
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", "5432"))
+        }
+        self.pool_min_size = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+        self.pool_max_size = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+        self.pool_max_idle = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+        self.acquire_timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.pool: Optional[asyncpg.Pool] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.quotes = MarketQuotes(quote_cache, quote_engine, provider)
+        self.password_hasher = password_hasher or get_shared_password_hasher()
+        self.sessions = session_store or get_shared_session_store()
+
+        self.query_stats = QueryStats()
+        self.slow_query_ms = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+        # A full queue drops immediately rather than blocking the event loop
+        self.chat_writer = ChatHistoryWriter(
+            self._write_chat_batch,
+            batch_size=int(os.getenv("CHAT_HISTORY_BATCH_SIZE", "100")),
+            flush_interval=float(os.getenv("CHAT_HISTORY_FLUSH_INTERVAL", "1.0")),
+            max_queue=int(os.getenv("CHAT_HISTORY_MAX_QUEUE", "10000")),
+            enqueue_timeout=0
+        )
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        """Decode json columns (e.g. json_agg results) like psycopg2 does."""
+        await conn.set_type_codec("json", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+    async def start(self) -> asyncpg.Pool:
+        """Create the connection pool if it does not exist yet."""
+        if self.pool is not None:
+            return self.pool
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        async with self._pool_lock:
+            if self.pool is None:
+                self._loop = asyncio.get_running_loop()
+                self.pool = await asyncpg.create_pool(
+                    **self.db_config,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    max_inactive_connection_lifetime=self.pool_max_idle,
+                    init=self._init_connection
+                )
+        return self.pool
+
+    def get_connection(self):
+        """Check out a pooled connection.
+
+        Use as ``async with db.get_connection() as conn:`` after ``start``;
+        wrap statements in ``conn.transaction()`` to make them atomic.
+        """
+        return self.pool.acquire(timeout=self.acquire_timeout)
+
+    def get_quote_cache_stats(self) -> Dict:
+        """Get quote cache hit, miss and coalesce counters."""
+        return self.quotes.quote_cache.get_stats()
+
+    def get_quote_engine_stats(self) -> Dict:
+        """Get market-data throttling, retry and cancellation counters."""
+        return self.quotes.quote_engine.get_stats()
+
+    def get_pool_stats(self) -> Dict:
+        """Get connection pool size and utilization counters."""
+        if self.pool is None:
+            return {"size": 0, "idle": 0, "in_use": 0, "max_size": self.pool_max_size}
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {"size": size, "idle": idle, "in_use": size - idle, "max_size": self.pool.get_max_size()}
+
+    def get_query_stats(self) -> Dict:
+        """Get per-statement latency counters and histograms."""
+        return self.query_stats.snapshot()
+
+    def dump_query_stats(self, limit: int = 20) -> str:
+        """Log and return a table of the most expensive statements."""
+        report = self.query_stats.format_report(limit)
+        logger.info("Query latency report:\n%s", report)
+        return report
+
+    def get_chat_writer_stats(self) -> Dict:
+        """Get chat history write-behind queue and batch counters."""
+        return self.chat_writer.get_stats()
+
+    async def close(self) -> None:
+        """Flush pending chat history and close the connection pool."""
+        # The writer thread needs this loop running to finish its last batch
+        await asyncio.to_thread(self.chat_writer.close)
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def _run(self, conn: asyncpg.Connection, call: str, query: str, *args) -> Any:
+        """Run ``conn.<call>(query, *args)``, recording its wall time and logging slow ones."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            return await getattr(conn, call)(query, *args)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.query_stats.record(query, elapsed_ms, failed)
+            if elapsed_ms >= self.slow_query_ms:
+                logger.warning(
+                    "Slow query (%.1f ms): %s",
+                    elapsed_ms, normalize_statement(query),
+                    extra={"duration_ms": elapsed_ms, "statement": normalize_statement(query)}
+                )
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Query took %.1f ms: %s params=%r",
+                    elapsed_ms, normalize_statement(query), args,
+                    extra={"duration_ms": elapsed_ms, "statement": normalize_statement(query)}
+                )
+
+    async def execute_query(self, query: str, parameters: Sequence = (), fetch: bool = True) -> Any:
+        """Execute a database query with ``$n`` placeholders in its own transaction."""
+        try:
+            await self.start()
+            async with self.get_connection() as conn:
+                if not fetch:
+                    status = await self._run(conn, "execute", query, *parameters)
+                    # Status is e.g. "UPDATE 3"; statements without a count report 0
+                    affected = status.rsplit(" ", 1)[-1]
+                    return {"affected_rows": int(affected) if affected.isdigit() else 0}
+                rows = await self._run(conn, "fetch", query, *parameters)
+                logger.debug("Fetched %d rows", len(rows))
+                return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error("Query execution error: %s", e, extra={"statement": normalize_statement(query)})
+            raise Exception(f"Query execution error: {str(e)}")
+
+    async def create_user(self, data: Dict) -> Dict:
+        """Create a new user account with validation."""
+        try:
+            required_fields = ['email', 'password', 'account_number']
+            missing_fields = [field for field in required_fields if field not in data]
+            if missing_fields:
+                raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+
+            if await self.execute_query("SELECT email FROM users WHERE email = $1", (data['email'],)):
+                raise ValueError("User with this email already exists")
+
+            hashed_password = await asyncio.to_thread(self.password_hasher.hash, data['password'])
+
+            async with self.get_connection() as conn:
+                row = await self._run(conn, "fetchrow", """
+                    INSERT INTO users (account_number, email, password, balance)
+                    VALUES ($1, $2, $3, $4)
+                    RETURNING id, account_number, email, balance, created_at
+                """, data['account_number'], data['email'], hashed_password,
+                    _numeric(data.get('balance', 0.00)))
+            result = dict(row)
+            logger.info("Created account %s", result['account_number'])
+
+            return {
+                "status": "success",
+                "message": f"Account created successfully with number {result['account_number']}",
+                "data": result
+            }
+        except Exception as e:
+            logger.warning("Error creating user: %s", e)
+            return {"status": "error", "message": str(e)}
+
+    async def validate_login(self, email: str, password: str) -> Dict:
+        """Validate user login credentials and start a session."""
+        try:
+            rows = await self.execute_query("""
+                SELECT id, account_number, email, password, balance
+                FROM users
+                WHERE email = $1
+            """, (email,))
+
+            if not rows:
+                logger.info("Login failed: unknown email")
+                return {"status": "error", "message": "Invalid email or password"}
+
+            user = rows[0]
+
+            if not await asyncio.to_thread(self.password_hasher.verify, password, user['password']):
+                logger.info("Login failed: bad password for account %s", user['account_number'])
+                return {"status": "error", "message": "Invalid email or password"}
+
+            await self.execute_query(
+                "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = $1",
+                (user['id'],),
+                fetch=False
+            )
+
+            session_token = self.sessions.create({
+                "account_number": user['account_number'],
+                "email": user['email']
+            })
+
+            return {"status": "success", "data": {
+                "account_number": user['account_number'],
+                "email": user['email'],
+                "balance": user['balance'],
+                "session_token": session_token
+            }}
+
+        except Exception as e:
+            logger.error("Login error: %s", e)
+            return {"status": "error", "message": str(e)}
+
+    async def validate_session(self, session_token: str) -> Dict:
+        """Validate a session token from validate_login without touching the database."""
+        user = self.sessions.validate(session_token)
+        if user is None:
+            return {"status": "error", "message": "Session expired or invalid. Please log in again."}
+        return {"status": "success", "data": dict(user)}
+
+    async def logout(self, session_token: str) -> Dict:
+        """End a login session."""
+        if self.sessions.revoke(session_token):
+            return {"status": "success", "message": "Logged out"}
+        return {"status": "error", "message": "Session not found"}
+
+    async def get_real_time_quote(self, symbol: str) -> Dict:
+        """Get a real-time stock quote through the shared quote cache."""
+        return await asyncio.to_thread(self.quotes.get_real_time_quote, symbol)
+
+    async def get_real_time_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get quotes for several symbols, fetching all cache misses in one request."""
+        return await asyncio.to_thread(self.quotes.get_real_time_quotes, symbols)
+
+    async def execute_trade(self, account_number: str, trade_type: str,
+                            symbol: str, shares: int, price: float) -> Dict:
+        """Execute a stock trade in one round trip through the ``execute_trade`` SQL function.
+
+        Unlike DatabaseManager there is no statement-by-statement fallback;
+        the function from migrations/002_portfolio_indexes_last_trade.sql
+        must be installed.
+        """
+        try:
+            await self.start()
+            async with self.get_connection() as conn:
+                row = await self._run(conn, "fetchrow",
+                    "SELECT transaction_id, new_balance FROM execute_trade($1, $2, $3, $4, $5)",
+                    account_number, trade_type, symbol, shares, _numeric(price)
+                )
+
+            return {
+                "status": "success",
+                "message": (
+                    f"Successfully {trade_type.lower()}ed {shares} shares of {symbol} "
+                    f"at ${price:.2f} per share"
+                ),
+                "transaction_id": row['transaction_id'],
+                "new_balance": float(row['new_balance'])
+            }
+
+        except asyncpg.UndefinedFunctionError as e:
+            logger.error("execute_trade() SQL function not installed: %s", e)
+            return {"status": "error", "message": str(e)}
+        except asyncpg.PostgresError as e:
+            # Validation failures are raised by the function; surface just their message
+            return {"status": "error", "message": e.message or str(e)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def _record_last_trades(self, conn: asyncpg.Connection, account_number: str,
+                                  transaction_ids: List[int]) -> None:
+        """Point last_trade at the newest of the given transactions for each symbol."""
+        await self._run(conn, "execute", """
+            INSERT INTO last_trade
+            (account_number, stock_symbol, transaction_id, price_per_share, transaction_date)
+            SELECT DISTINCT ON (stock_symbol)
+                account_number, stock_symbol, transaction_id, price_per_share, transaction_date
+            FROM transactions
+            WHERE account_number = $1 AND transaction_id = ANY($2::integer[])
+            ORDER BY stock_symbol, transaction_id DESC
+            ON CONFLICT (account_number, stock_symbol) DO UPDATE
+            SET transaction_id = EXCLUDED.transaction_id,
+                price_per_share = EXCLUDED.price_per_share,
+                transaction_date = EXCLUDED.transaction_date
+        """, account_number, transaction_ids)
+
+    async def execute_trades(self, account_number: str, orders: List[Dict]) -> Dict:
+        """Execute a basket of orders atomically; see DatabaseManager.execute_trades."""
+        try:
+            legs = parse_orders(orders)
+            symbols = sorted({symbol for _, symbol, _, _ in legs})
+
+            await self.start()
+            async with self.get_connection() as conn:
+                async with conn.transaction():
+                    # Snapshot: lock the account and every position the basket touches
+                    user = await self._run(conn, "fetchrow",
+                        "SELECT balance FROM users WHERE account_number = $1 FOR UPDATE",
+                        account_number
+                    )
+                    if not user:
+                        raise ValueError("Account not found")
+                    balance = float(user['balance'])
+
+                    rows = await self._run(conn, "fetch", """
+                        SELECT stock_symbol, shares, average_price
+                        FROM portfolio
+                        WHERE account_number = $1 AND stock_symbol = ANY($2::varchar[])
+                        FOR UPDATE
+                    """, account_number, symbols)
+                    positions = {
+                        row['stock_symbol']: [int(row['shares']), float(row['average_price'])]
+                        for row in rows
+                    }
+
+                    cash_delta = apply_basket(legs, balance, positions)
+
+                    new_balance = float(await self._run(conn, "fetchval",
+                        "UPDATE users SET balance = balance + $1 WHERE account_number = $2 RETURNING balance",
+                        _numeric(cash_delta), account_number
+                    ))
+
+                    held_positions = [(s, p) for s, p in positions.items() if s in symbols and p[0] > 0]
+                    if held_positions:
+                        await self._run(conn, "execute", """
+                            INSERT INTO portfolio (account_number, stock_symbol, shares, average_price)
+                            SELECT $1, p.symbol, p.shares, p.average_price
+                            FROM unnest($2::varchar[], $3::integer[], $4::numeric[])
+                                AS p(symbol, shares, average_price)
+                            ON CONFLICT (account_number, stock_symbol) DO UPDATE
+                            SET shares = EXCLUDED.shares,
+                                average_price = EXCLUDED.average_price,
+                                last_updated = CURRENT_TIMESTAMP
+                        """,
+                            account_number,
+                            [symbol for symbol, _ in held_positions],
+                            [held for _, (held, _) in held_positions],
+                            [_numeric(average_price) for _, (_, average_price) in held_positions]
+                        )
+
+                    closed = [symbol for symbol in symbols if positions[symbol][0] == 0]
+                    if closed:
+                        await self._run(conn, "execute",
+                            "DELETE FROM portfolio WHERE account_number = $1 AND stock_symbol = ANY($2::varchar[])",
+                            account_number, closed
+                        )
+
+                    rows = await self._run(conn, "fetch", """
+                        INSERT INTO transactions
+                        (account_number, transaction_type, stock_symbol, shares,
+                         price_per_share, total_amount)
+                        SELECT $1, t.trade_type, t.symbol, t.shares, t.price, t.shares * t.price
+                        FROM unnest($2::varchar[], $3::varchar[], $4::integer[], $5::numeric[])
+                            AS t(trade_type, symbol, shares, price)
+                        RETURNING transaction_id
+                    """,
+                        account_number,
+                        [leg[0] for leg in legs],
+                        [leg[1] for leg in legs],
+                        [leg[2] for leg in legs],
+                        [_numeric(leg[3]) for leg in legs]
+                    )
+                    transaction_ids = [row['transaction_id'] for row in rows]
+                    await self._record_last_trades(conn, account_number, transaction_ids)
+
+            return {
+                "status": "success",
+                "message": f"Successfully executed {len(legs)} orders across {len(symbols)} symbols",
+                "transaction_ids": transaction_ids,
+                "new_balance": new_balance
+            }
+
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def deposit(self, account_number: str, amount: float) -> Dict:
+        """Add funds to an account and record the deposit transaction."""
+        try:
+            if amount <= 0:
+                raise ValueError("Deposit amount must be positive.")
+
+            await self.start()
+            async with self.get_connection() as conn:
+                async with conn.transaction():
+                    balance = await self._run(conn, "fetchval",
+                        "UPDATE users SET balance = balance + $1 WHERE account_number = $2 RETURNING balance",
+                        _numeric(amount), account_number
+                    )
+                    if balance is None:
+                        raise ValueError("Account not found")
+
+                    transaction_id = await self._run(conn, "fetchval", """
+                        INSERT INTO transactions (account_number, transaction_type, total_amount)
+                        VALUES ($1, 'DEPOSIT', $2)
+                        RETURNING transaction_id
+                    """, account_number, _numeric(amount))
+
+            return {
+                "status": "success",
+                "message": f"Deposited ${amount:.2f} successfully",
+                "transaction_id": transaction_id,
+                "new_balance": float(balance)
+            }
+
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def get_portfolio(self, account_number: str) -> List[Dict]:
+        """Get user's consolidated portfolio with current market values."""
+        try:
+            rows = await self.execute_query("""
+                SELECT
+                    p.stock_symbol,
+                    p.shares,
+                    p.average_price,
+                    p.last_updated,
+                    lt.price_per_share as last_transaction_price,
+                    lt.transaction_date as last_transaction_date
+                FROM portfolio p
+                LEFT JOIN last_trade lt
+                    ON lt.account_number = p.account_number
+                    AND lt.stock_symbol = p.stock_symbol
+                WHERE p.account_number = $1 AND p.shares > 0
+                ORDER BY p.stock_symbol
+            """, (account_number,))
+
+            portfolio = [
+                {
+                    'stock_symbol': pos['stock_symbol'],
+                    'shares': float(pos['shares']),
+                    'average_price': float(pos['average_price']),
+                    'last_updated': pos['last_updated'],
+                    'last_transaction_price': float(pos['last_transaction_price']) if pos['last_transaction_price'] else None,
+                    'last_transaction_date': pos['last_transaction_date']
+                }
+                for pos in rows
+            ]
+
+            await asyncio.to_thread(self.quotes._apply_market_values, portfolio)
+            return portfolio
+
+        except Exception as e:
+            logger.error("Error fetching portfolio: %s", e)
+            return []
+
+    async def load_user_context(self, account_number: str) -> Dict:
+        """Load balance, priced positions and watchlist symbols in one SQL round trip."""
+        try:
+            result = await self.execute_query("""
+                SELECT
+                    u.account_number,
+                    u.email,
+                    u.balance,
+                    u.last_login,
+                    COALESCE((
+                        SELECT json_agg(json_build_object(
+                            'stock_symbol', p.stock_symbol,
+                            'shares', p.shares,
+                            'average_price', p.average_price,
+                            'last_updated', p.last_updated,
+                            'last_transaction_price', lt.price_per_share,
+                            'last_transaction_date', lt.transaction_date
+                        ) ORDER BY p.stock_symbol)
+                        FROM portfolio p
+                        LEFT JOIN last_trade lt
+                            ON lt.account_number = p.account_number
+                            AND lt.stock_symbol = p.stock_symbol
+                        WHERE p.account_number = u.account_number AND p.shares > 0
+                    ), '[]'::json) AS positions,
+                    COALESCE((
+                        SELECT json_agg(w.stock_symbol ORDER BY w.added_date)
+                        FROM watchlist w
+                        WHERE w.account_number = u.account_number
+                    ), '[]'::json) AS watchlist
+                FROM users u
+                WHERE u.account_number = $1
+            """, (account_number,))
+            if not result:
+                raise Exception("User not found")
+            context = result[0]
+        except Exception as e:
+            raise Exception(f"Error loading user context: {str(e)}")
+
+        context['balance'] = float(context['balance'])
+        for position in context['positions']:
+            position['shares'] = float(position['shares'])
+            position['average_price'] = float(position['average_price'])
+            if position['last_transaction_price'] is not None:
+                position['last_transaction_price'] = float(position['last_transaction_price'])
+        await asyncio.to_thread(self.quotes._apply_market_values, context['positions'])
+        return context
+
+    async def save_chat_message(self, account_number: str, message_type: str, message: str) -> None:
+        """Queue chat message for the background history writer."""
+        try:
+            # Batches are written on this loop, so make sure it is known to the writer thread
+            await self.start()
+            self.chat_writer.submit(account_number, message_type, message)
+        except Exception as e:
+            logger.error("Error saving chat message: %s", e)
+
+    def _write_chat_batch(self, rows: List[ChatRow]) -> None:
+        """Write a batch from the writer thread on the manager's event loop."""
+        future = asyncio.run_coroutine_threadsafe(self._write_chat_messages(rows), self._loop)
+        future.result(timeout=self.acquire_timeout + 30)
+
+    async def _write_chat_messages(self, rows: List[ChatRow]) -> None:
+        """Insert a batch of chat messages with one statement."""
+        accounts, message_types, messages, timestamps = (list(column) for column in zip(*rows))
+        async with self.get_connection() as conn:
+            await self._run(conn, "execute", """
+                INSERT INTO chat_history (account_number, message_type, message, timestamp)
+                SELECT * FROM unnest($1::varchar[], $2::varchar[], $3::text[], $4::timestamp[])
+            """, accounts, message_types, messages, timestamps)
+
+    async def get_chat_history(self, account_number: str, limit: int = 50,
+                               before: Optional[Dict] = None) -> List[Dict]:
+        """Get a page of chat history, newest first; see DatabaseManager.get_chat_history."""
+        # Include messages still waiting in the write-behind queue
+        await asyncio.to_thread(self.chat_writer.flush, 5.0)
+        if before is None:
+            return await self.execute_query("""
+                SELECT id, message_type, message, timestamp
+                FROM chat_history
+                WHERE account_number = $1
+                ORDER BY timestamp DESC, id DESC
+                LIMIT $2
+            """, (account_number, limit))
+
+        return await self.execute_query("""
+            SELECT id, message_type, message, timestamp
+            FROM chat_history
+            WHERE account_number = $1 AND (timestamp, id) < ($2, $3)
+            ORDER BY timestamp DESC, id DESC
+            LIMIT $4
+        """, (account_number, before['timestamp'], before['id'], limit))
+
+    async def get_user(self, account_number: str) -> Dict:
+        """Get user information."""
+        try:
+            result = await self.execute_query("""
+                SELECT id, account_number, email, balance, last_login
+                FROM users
+                WHERE account_number = $1
+            """, (account_number,))
+            if not result:
+                raise Exception("User not found")
+            return result[0]
+        except Exception as e:
+            raise Exception(f"Error fetching user data: {str(e)}")
+
+    async def add_to_watchlist(self, account_number: str, symbol: str) -> Dict:
+        """Add a stock to user's watchlist."""
+        try:
+            await self.start()
+            async with self.get_connection() as conn:
+                async with conn.transaction():
+                    if await self._run(conn, "fetchrow",
+                        "SELECT * FROM watchlist WHERE account_number = $1 AND stock_symbol = $2",
+                        account_number, symbol
+                    ):
+                        return {
+                            "status": "error",
+                            "message": f"{symbol} is already in your watchlist"
+                        }
+
+                    await self._run(conn, "execute",
+                        "INSERT INTO watchlist (account_number, stock_symbol) VALUES ($1, $2)",
+                        account_number, symbol
+                    )
+
+            return {
+                "status": "success",
+                "message": f"{symbol} added to watchlist"
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Database error: {str(e)}"
+            }
+
+    async def remove_from_watchlist(self, account_number: str, symbol: str) -> Dict:
+        """Remove a stock from user's watchlist."""
+        try:
+            await self.start()
+            async with self.get_connection() as conn:
+                removed = await self._run(conn, "fetchval", """
+                    DELETE FROM watchlist
+                    WHERE account_number = $1 AND stock_symbol = $2
+                    RETURNING stock_symbol
+                """, account_number, symbol)
+
+            if removed:
+                return {
+                    "status": "success",
+                    "message": f"{symbol} removed from watchlist"
+                }
+            return {
+                "status": "error",
+                "message": f"{symbol} not found in watchlist"
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Database error: {str(e)}"
+            }
+
+    async def get_watchlist(self, account_number: str) -> List[Dict]:
+        """Get user's watchlist with current prices."""
+        try:
+            watchlist = await self.execute_query(
+                "SELECT * FROM watchlist WHERE account_number = $1",
+                (account_number,)
+            )
+
+            # Enrich with current market prices, fetched in one batch
+            if watchlist:
+                quotes = await self.get_real_time_quotes([item['stock_symbol'] for item in watchlist])
+                for item in watchlist:
+                    item.update(quotes[item['stock_symbol'].upper()])
+
+            return watchlist
+        except Exception as e:
+            logger.error("Error getting watchlist: %s", e)
+            return []
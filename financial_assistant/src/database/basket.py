@@ -0,0 +1,59 @@
+from typing import Dict, List, Tuple
+
+# (trade_type, symbol, shares, price)
+Leg = Tuple[str, str, int, float]
+
+
+def parse_orders(orders: List[Dict]) -> List[Leg]:
+    """Validate basket orders and normalize them to legs."""
+    if not orders:
+        raise ValueError("No orders to execute")
+
+    legs = []
+    for order in orders:
+        trade_type = str(order['trade_type']).upper()
+        shares = int(order['shares'])
+        price = float(order['price'])
+        if trade_type not in ('BUY', 'SELL'):
+            raise ValueError(f"Unsupported trade type: {trade_type}")
+        if shares <= 0:
+            raise ValueError("Number of shares must be positive.")
+        legs.append((trade_type, str(order['symbol']).upper(), shares, price))
+    return legs
+
+
+def apply_basket(legs: List[Leg], balance: float, positions: Dict[str, List]) -> float:
+    """Apply legs in order to a locked snapshot and return the cash change.
+
+    ``positions`` maps symbol to ``[shares, average_price]`` and is updated
+    in place, with an entry for every symbol the basket touches. Raises
+    ValueError if the basket would leave a short position or a negative
+    balance.
+    """
+    cash_delta = 0.0
+    for trade_type, symbol, shares, price in legs:
+        held, average_price = positions.get(symbol, [0, 0.0])
+        total_amount = shares * price
+        if trade_type == 'BUY':
+            average_price = (average_price * held + total_amount) / (held + shares)
+            held += shares
+            cash_delta -= total_amount
+        else:
+            held -= shares
+            cash_delta += total_amount
+        positions[symbol] = [held, average_price]
+
+    short = {symbol: held for symbol, (held, _) in positions.items() if held < 0}
+    if short:
+        raise ValueError(
+            "Insufficient shares for this basket.\n" + "\n".join(
+                f"{symbol}: short by {-held} shares" for symbol, held in sorted(short.items())
+            )
+        )
+    if balance + cash_delta < 0:
+        raise ValueError(
+            f"Insufficient funds for this basket.\n"
+            f"Required: ${-cash_delta:.2f}\n"
+            f"Available: ${balance:.2f}"
+        )
+    return cash_delta
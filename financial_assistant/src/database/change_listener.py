@@ -0,0 +1,111 @@
+from typing import Dict, Any, Callable, Optional
+import threading
+import logging
+import select
+import json
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeListener:
+    def __init__(self, db_config: Dict[str, Any], on_change: Callable[[str], None],
+                 on_reset: Callable[[], None], channel: str = "account_changes",
+                 poll_interval: float = 5.0, max_backoff: float = 30.0):
+        """Initialize a background LISTEN loop on its own connection.
+
+        ``on_change`` gets the account number from every notification on
+        ``channel``. Whenever the listener (re)connects, ``on_reset`` is
+        called first, because notifications sent while it was disconnected
+        are lost.
+        """
+        self.db_config = db_config
+        self.on_change = on_change
+        self.on_reset = on_reset
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._conn = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"notifications": 0, "connects": 0, "errors": 0, "bad_payloads": 0}
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def start(self) -> None:
+        """Start listening in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="change-listener", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.db_config)
+        conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        conn.cursor().execute(f"LISTEN {self.channel}")
+        return conn
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            account_number = json.loads(payload)["account_number"]
+        except (ValueError, KeyError, TypeError):
+            self._count("bad_payloads")
+            logger.warning("Ignoring malformed %s payload: %r", self.channel, payload)
+            return
+        self._count("notifications")
+        if account_number:
+            self.on_change(account_number)
+
+    def _run(self) -> None:
+        """Receive notifications until stopped, reconnecting with backoff."""
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                self._conn = self._connect()
+                self._count("connects")
+                self.on_reset()
+                backoff = 1.0
+
+                while not self._stop.is_set():
+                    if select.select([self._conn], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    self._conn.poll()
+                    while self._conn.notifies:
+                        self._dispatch(self._conn.notifies.pop(0).payload)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                self._count("errors")
+                logger.warning("Change listener lost its connection, retrying in %.0fs: %s", backoff, e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+            finally:
+                if self._conn is not None:
+                    try:
+                        self._conn.close()
+                    except Exception:
+                        pass
+                    self._conn = None
+
+    @property
+    def listening(self) -> bool:
+        """Whether notifications are currently being received."""
+        return self._conn is not None and not self._stop.is_set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return notification, reconnect and error counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["listening"] = self.listening
+        return stats
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop listening and close the connection."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,118 @@
+"""Archive old chat_history partitions to gzip-compressed CSV files.
+
+Monthly partitions older than the retention window are exported with
+COPY, then detached and dropped in one transaction once the row count
+matches the export. Upcoming partitions are created on every run, so
+schedule this daily (cron or similar). Run from the financial_assistant
+directory:
+
+    python -m src.database.chat_archive --retain-months 6 --archive-dir archive/chat_history
+"""
+from typing import Dict, List
+from datetime import date
+import argparse
+import logging
+import gzip
+import os
+import re
+from src.database.database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_NAME = re.compile(r"^chat_history_y(\d{4})m(\d{2})$")
+
+
+def _retention_cutoff(retain_months: int, today: date) -> date:
+    """First day of the oldest month that stays in the live table."""
+    months = today.year * 12 + today.month - 1 - retain_months
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def list_chat_partitions(db: DatabaseManager) -> Dict[str, date]:
+    """Return the monthly chat_history partitions and the month each one holds."""
+    with db.get_connection() as conn:
+        cur = conn.cursor()
+        db._execute(cur, """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'chat_history'::regclass
+        """)
+        partitions = {}
+        for row in cur.fetchall():
+            match = _PARTITION_NAME.match(row['relname'])
+            if match:
+                partitions[row['relname']] = date(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+
+def archive_partition(db: DatabaseManager, partition: str, archive_dir: str) -> Dict:
+    """Export one partition to ``<archive_dir>/<partition>.csv.gz`` and drop it."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{partition}.csv.gz")
+    partial_path = path + ".partial"
+
+    with db.get_connection() as conn:
+        cur = conn.cursor()
+        # Count and export from one snapshot. Partition names come from
+        # pg_class and match _PARTITION_NAME, so they are safe to inline
+        db._execute(cur, "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        db._execute(cur, f"SELECT COUNT(*) AS row_count FROM {partition}")
+        exported = cur.fetchone()['row_count']
+        with gzip.open(partial_path, "wt", encoding="utf-8") as archive:
+            cur.copy_expert(f"COPY {partition} TO STDOUT WITH (FORMAT csv, HEADER)", archive)
+
+    with db.get_connection() as conn:
+        cur = conn.cursor()
+        db._execute(cur, f"LOCK TABLE {partition} IN ACCESS EXCLUSIVE MODE")
+        db._execute(cur, f"SELECT COUNT(*) AS row_count FROM {partition}")
+        live = cur.fetchone()['row_count']
+        if live != exported:
+            raise RuntimeError(
+                f"{partition} changed during export ({exported} rows exported, {live} now); not dropping"
+            )
+        db._execute(cur, f"ALTER TABLE chat_history DETACH PARTITION {partition}")
+        db._execute(cur, f"DROP TABLE {partition}")
+        # Keep the archive only once the drop is about to commit
+        os.replace(partial_path, path)
+
+    logger.info("Archived %d chat messages from %s to %s", exported, partition, path)
+    return {"partition": partition, "rows": exported, "path": path}
+
+
+def archive_chat_history(db: DatabaseManager, retain_months: int = 6,
+                         archive_dir: str = "archive/chat_history", months_ahead: int = 3) -> List[Dict]:
+    """Create upcoming partitions and archive every partition older than the retention window."""
+    with db.get_connection() as conn:
+        cur = conn.cursor()
+        db._execute(cur, "SELECT ensure_chat_history_partitions(CURRENT_DATE, %s) AS created", (months_ahead,))
+        created = cur.fetchone()['created']
+    if created:
+        logger.info("Created %d upcoming chat_history partitions", created)
+
+    cutoff = _retention_cutoff(retain_months, date.today())
+    archived = []
+    for partition, month in sorted(list_chat_partitions(db).items(), key=lambda item: item[1]):
+        if month < cutoff:
+            archived.append(archive_partition(db, partition, archive_dir))
+    return archived
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--retain-months", type=int, default=6)
+    parser.add_argument("--archive-dir", default="archive/chat_history")
+    parser.add_argument("--months-ahead", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+    db = DatabaseManager()
+    try:
+        for result in archive_chat_history(db, args.retain_months, args.archive_dir, args.months_ahead):
+            print(f"{result['partition']}: {result['rows']} rows -> {result['path']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from datetime import datetime
+import threading
+import logging
+import atexit
+import queue
+import time
+
+logger = logging.getLogger(__name__)
+
+# (account_number, message_type, message, timestamp)
+ChatRow = Tuple[str, str, str, datetime]
+
+_STOP = object()
+
+
+class ChatHistoryWriter:
+    def __init__(self, write_batch: Callable[[List[ChatRow]], None], batch_size: int = 100,
+                 flush_interval: float = 1.0, max_queue: int = 10000, enqueue_timeout: float = 1.0,
+                 max_retries: int = 3, retry_delay: float = 0.5):
+        """Initialize a write-behind buffer for chat_history rows.
+
+        Rows are queued by ``submit`` and written by a background thread in
+        batches of up to ``batch_size``, or after ``flush_interval`` seconds,
+        whichever comes first. When ``max_queue`` rows are waiting, callers
+        block for up to ``enqueue_timeout`` seconds and the row is dropped
+        (and counted) if the writer still has not caught up. A batch whose
+        write fails is retried up to ``max_retries`` times, waiting
+        ``retry_delay`` seconds and doubling that each time, so a brief
+        database outage does not lose it; only then is it dropped.
+        """
+        if batch_size < 1 or max_queue < 1:
+            raise ValueError("Chat history writer needs a positive batch size and queue size")
+        if max_retries < 0:
+            raise ValueError("Chat history writer retries cannot be negative")
+
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "dropped": 0,
+            "retries": 0,
+            "failed": 0,
+            "blocked_time": 0.0,
+        }
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        with self._start_lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._run, name="chat-history-writer", daemon=True)
+            self._thread.start()
+            # Interpreter shutdown still drains whatever is queued
+            atexit.register(self.close)
+
+    def submit(self, account_number: str, message_type: str, message: str) -> bool:
+        """Queue one chat message; returns False if it had to be dropped."""
+        if self._closed:
+            raise RuntimeError("Chat history writer is closed")
+        self.start()
+
+        row = (account_number, message_type, message, datetime.now())
+        start = time.monotonic()
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            self._count("dropped")
+            logger.warning("Chat history queue full; dropped %s message for %s", message_type, account_number)
+            return False
+        finally:
+            self._count("blocked_time", time.monotonic() - start)
+
+        self._count("submitted")
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far; returns False if that did not finish in time."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        start = time.monotonic()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        if timeout is not None:
+            timeout = max(0.0, timeout - (time.monotonic() - start))
+        return done.wait(timeout)
+
+    def _write(self, batch: List[ChatRow]) -> None:
+        if not batch:
+            return
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self._count("failed", len(batch))
+                    logger.error("Dropped %d chat messages after %d attempts: %s", len(batch), attempt + 1, e)
+                    return
+                self._count("retries")
+                delay = self.retry_delay * 2 ** attempt
+                logger.warning("Error writing %d chat messages, retrying in %.1fs: %s", len(batch), delay, e)
+                time.sleep(delay)
+                continue
+            self._count("written", len(batch))
+            self._count("batches")
+            return
+
+    def _run(self) -> None:
+        """Collect rows into batches and write them until stopped."""
+        batch: List[ChatRow] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _STOP or isinstance(item, threading.Event):
+                self._write(batch)
+                batch, deadline = [], None
+                if isinstance(item, threading.Event):
+                    item.set()
+                if item is _STOP:
+                    return
+                continue
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch, deadline = [], None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth and write, drop and failure counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["batch_size"] = self.batch_size
+        stats["flush_interval"] = self.flush_interval
+        return stats
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush queued rows and stop the background thread."""
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        start = time.monotonic()
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Chat history writer is stuck with a full queue; %d messages not written",
+                           self._queue.qsize())
+            return
+        thread.join(max(0.0, timeout - (time.monotonic() - start)))
+        if thread.is_alive():
+            logger.warning("Chat history writer did not drain within %.1fs", timeout)
@@ -0,0 +1,249 @@
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor
+from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from collections import deque
+import threading
+import time
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    def __init__(self, db_config: Dict[str, Any], min_size: int = 1, max_size: int = 10,
+                 max_idle_time: float = 300.0, health_check_interval: float = 30.0,
+                 acquire_timeout: float = 30.0):
+        """Initialize a bounded, thread-safe pool of psycopg2 connections.
+
+        Connections idle for longer than ``health_check_interval`` seconds are
+        pinged with ``SELECT 1`` on checkout; connections idle for longer than
+        ``max_idle_time`` seconds are closed as long as the pool stays at or
+        above ``min_size``.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = deque()  # (connection, released_at), most recently used on the right
+        self._in_use = set()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        self._stats = {
+            "acquired": 0,
+            "released": 0,
+            "created": 0,
+            "discarded": 0,
+            "evicted_idle": 0,
+            "failed_health_checks": 0,
+            "timeouts": 0,
+            "waits": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+            "peak_in_use": 0,
+        }
+
+        for _ in range(min_size):
+            conn = self._connect()
+            with self._cond:
+                self._size += 1
+                self._stats["created"] += 1
+                self._idle.append((conn, time.monotonic()))
+
+    def _connect(self):
+        """Open a new physical connection with dict cursors."""
+        try:
+            conn = psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
+        except Exception as e:
+            raise Exception(f"Database connection error: {str(e)}")
+        return conn
+
+    def _close_quietly(self, conn) -> None:
+        """Close a physical connection, ignoring errors from dead sockets."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn, idle_for: float) -> bool:
+        """Check that a connection is usable before handing it out."""
+        if conn.closed:
+            return False
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle(self) -> list:
+        """Pop connections idle past ``max_idle_time``; caller holds the lock."""
+        evicted = []
+        now = time.monotonic()
+        # Oldest connections sit on the left of the deque
+        while self._idle and self._size > self.min_size:
+            conn, released_at = self._idle[0]
+            if now - released_at < self.max_idle_time:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._stats["evicted_idle"] += 1
+            evicted.append(conn)
+        return evicted
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check out a healthy connection, waiting up to ``timeout`` seconds."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        while True:
+            conn = None
+            released_at = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise Exception("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.1f}s waiting for a database connection "
+                            f"(pool size {self._size}/{self.max_size})"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                    if self._closed:
+                        raise Exception("Connection pool is closed")
+
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                else:
+                    # Reserve the slot before connecting outside the lock
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(conn, time.monotonic() - released_at):
+                self._close_quietly(conn)
+                with self._cond:
+                    self._size -= 1
+                    self._stats["failed_health_checks"] += 1
+                    self._stats["discarded"] += 1
+                    self._cond.notify()
+                continue
+
+            wait_time = time.monotonic() - start
+            with self._cond:
+                if create:
+                    self._stats["created"] += 1
+                self._in_use.add(id(conn))
+                self._stats["acquired"] += 1
+                self._stats["total_wait_time"] += wait_time
+                self._stats["max_wait_time"] = max(self._stats["max_wait_time"], wait_time)
+                if waited:
+                    self._stats["waits"] += 1
+                self._stats["peak_in_use"] = max(self._stats["peak_in_use"], len(self._in_use))
+            return conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        """Return a connection to the pool, or close it if it is broken."""
+        if not discard and not conn.closed:
+            try:
+                # Never hand out a connection with an open transaction
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+        discard = discard or conn.closed
+
+        with self._cond:
+            self._in_use.discard(id(conn))
+            self._stats["released"] += 1
+            if discard or self._closed:
+                self._size -= 1
+                self._stats["discarded"] += 1
+                evicted = [conn]
+            else:
+                self._idle.append((conn, time.monotonic()))
+                evicted = self._evict_idle()
+            self._cond.notify()
+
+        for stale in evicted:
+            self._close_quietly(stale)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager yielding a pooled connection.
+
+        Mirrors ``with psycopg2.connect(...) as conn``: the transaction is
+        committed on a clean exit and rolled back if the block raises.
+        """
+        conn = self.acquire(timeout)
+        discard = False
+        try:
+            yield conn
+            if not conn.closed and conn.status != extensions.STATUS_READY:
+                conn.commit()
+        except Exception:
+            try:
+                if not conn.closed:
+                    conn.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return wait-time and utilization counters for pool sizing."""
+        with self._cond:
+            stats = dict(self._stats)
+            in_use = len(self._in_use)
+            stats.update({
+                "size": self._size,
+                "in_use": in_use,
+                "idle": len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "utilization": in_use / self.max_size,
+                "peak_utilization": stats["peak_in_use"] / self.max_size,
+                "avg_wait_time": (
+                    stats["total_wait_time"] / stats["acquired"] if stats["acquired"] else 0.0
+                ),
+            })
+        return stats
+
+    def close(self) -> None:
+        """Close idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
@@ -2,17 +2,44 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
-import bcrypt
+import logging
 import os
 from dotenv import load_dotenv
-import yfinance as yf
 import pandas as pd
 import time  # Add this import
-import random 
+from src.database.connection_pool import ConnectionPool
+from src.market.quote_cache import QuoteCache
+from src.market.quote_engine import QuoteEngine
+from src.market.providers import MarketDataProvider
+from src.database.market_quotes import MarketQuotes
+from src.database.basket import parse_orders, apply_basket
+from src.database.query_stats import QueryStats, normalize_statement
+from src.database.chat_history_writer import ChatHistoryWriter, ChatRow
+from src.database.replica_router import ReplicaRouter
+from src.database.account_cache import AccountCache
+from src.database.change_listener import ChangeListener
+from src.auth.password_hasher import PasswordHasher, get_shared_password_hasher
+from src.auth.session_store import SessionStore, get_shared_session_store
 
-class DatabaseManager:
-    def __init__(self):
-        """Initialize database connection parameters."""
+logger = logging.getLogger(__name__)
+
+class DatabaseManager(MarketQuotes):
+    def __init__(self, quote_cache: Optional[QuoteCache] = None,
+                 quote_engine: Optional[QuoteEngine] = None,
+                 provider: Optional[MarketDataProvider] = None,
+                 password_hasher: Optional[PasswordHasher] = None,
+                 session_store: Optional[SessionStore] = None,
+                 replica_dsns: Optional[List[str]] = None):
+        """Initialize database connection parameters.
+
+        Quotes go through the process-wide QuoteCache and QuoteEngine unless
+        others are passed in, so every manager shares one provider quota.
+        The market-data provider defaults to MARKET_DATA_PROVIDER (yfinance).
+        Password hashing and login sessions likewise default to the shared
+        process pool and session store. With ``replica_dsns`` (or
+        DB_REPLICA_DSNS, comma-separated) the reads named in
+        DB_REPLICA_READS are served by read replicas; see ReplicaRouter.
+        """
         load_dotenv()
         self.db_config = {
             "dbname": os.getenv("DB_NAME", "finance_db"),
@@ -22,99 +49,272 @@ class DatabaseManager:
             "port": os.getenv("DB_PORT", "5432")
         }
 
-        self._quote_cache = {}
-        self._cache_timeout = 60 
+        # Shared connection pool; sized through the environment so it can be tuned under load
+        self.pool = ConnectionPool(
+            self.db_config,
+            min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            max_idle_time=float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            health_check_interval=float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30")),
+            acquire_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        )
+
+        super().__init__(quote_cache, quote_engine, provider)
+        self.password_hasher = password_hasher or get_shared_password_hasher()
+        self.sessions = session_store or get_shared_session_store()
+
+        # Per-statement latency histograms and slow-query threshold
+        self.query_stats = QueryStats()
+        self.slow_query_ms = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+        # Single-round-trip trades via the execute_trade() SQL function
+        self.use_trade_function = os.getenv("DB_USE_TRADE_FUNCTION", "true").lower() == "true"
+
+        # Optional read replicas for dashboard-style reads
+        if replica_dsns is None:
+            replica_dsns = [dsn.strip() for dsn in os.getenv("DB_REPLICA_DSNS", "").split(",") if dsn.strip()]
+        self.replicas = ReplicaRouter(
+            replica_dsns,
+            max_lag=float(os.getenv("DB_REPLICA_MAX_LAG", "5")),
+            lag_check_interval=float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "2")),
+            retry_interval=float(os.getenv("DB_REPLICA_RETRY_INTERVAL", "30")),
+            pool_size=int(os.getenv("DB_REPLICA_POOL_SIZE", "5"))
+        ) if replica_dsns else None
+        self.replica_reads = {
+            name.strip() for name in os.getenv(
+                "DB_REPLICA_READS", "get_portfolio,get_watchlist,get_chat_history,get_user,load_user_context"
+            ).split(",") if name.strip()
+        }
+
+        # Per-account read cache, kept coherent across workers by LISTEN/NOTIFY
+        # (migrations/004_account_change_notify.sql); ACCOUNT_CACHE_TTL=0 disables it
+        cache_ttl = float(os.getenv("ACCOUNT_CACHE_TTL", "300"))
+        self.account_cache = AccountCache(
+            capacity=int(os.getenv("ACCOUNT_CACHE_CAPACITY", "10000")),
+            ttl=cache_ttl
+        ) if cache_ttl > 0 else None
+        self.cached_reads = {"get_user", "get_portfolio", "get_watchlist", "load_user_context"}
+        self.change_listener = None
+        if self.account_cache and os.getenv("DB_LISTEN_CHANGES", "true").lower() == "true":
+            self.change_listener = ChangeListener(
+                self.db_config,
+                on_change=self.account_cache.invalidate,
+                on_reset=self.account_cache.clear
+            )
+            self.change_listener.start()
+
+        # Chat history is written behind the response in batches
+        self.chat_writer = ChatHistoryWriter(
+            self._write_chat_messages,
+            batch_size=int(os.getenv("CHAT_HISTORY_BATCH_SIZE", "100")),
+            flush_interval=float(os.getenv("CHAT_HISTORY_FLUSH_INTERVAL", "1.0")),
+            max_queue=int(os.getenv("CHAT_HISTORY_MAX_QUEUE", "10000")),
+            enqueue_timeout=float(os.getenv("CHAT_HISTORY_ENQUEUE_TIMEOUT", "1.0")),
+            max_retries=int(os.getenv("CHAT_HISTORY_MAX_RETRIES", "3")),
+            retry_delay=float(os.getenv("CHAT_HISTORY_RETRY_DELAY", "0.5"))
+        )
 
     def get_connection(self):
-        """Create and return a database connection with dict cursor."""
+        """Check out a pooled connection with dict cursor.
+
+        Use as ``with self.get_connection() as conn:``; the transaction is
+        committed on a clean exit, rolled back on error, and the connection
+        goes back to the pool either way.
+        """
+        return self.pool.connection()
+
+    def get_quote_cache_stats(self) -> Dict:
+        """Get quote cache hit, miss and coalesce counters."""
+        return self.quote_cache.get_stats()
+
+    def get_quote_engine_stats(self) -> Dict:
+        """Get market-data throttling, retry and cancellation counters."""
+        return self.quote_engine.get_stats()
+
+    def get_pool_stats(self) -> Dict:
+        """Get connection pool wait-time and utilization counters."""
+        return self.pool.get_stats()
+
+    def get_query_stats(self) -> Dict:
+        """Get per-statement latency counters and histograms."""
+        return self.query_stats.snapshot()
+
+    def dump_query_stats(self, limit: int = 20) -> str:
+        """Log and return a table of the most expensive statements."""
+        report = self.query_stats.format_report(limit)
+        logger.info("Query latency report:\n%s", report)
+        return report
+
+    def get_replica_stats(self) -> Dict:
+        """Get read routing counters and replica lag, or an empty dict without replicas."""
+        return self.replicas.get_stats() if self.replicas else {}
+
+    def get_account_cache_stats(self) -> Dict:
+        """Get account cache and change-listener counters, or an empty dict when caching is off."""
+        if not self.account_cache:
+            return {}
+        stats = self.account_cache.get_stats()
+        if self.change_listener:
+            stats["listener"] = self.change_listener.get_stats()
+        return stats
+
+    def get_chat_writer_stats(self) -> Dict:
+        """Get chat history write-behind queue and batch counters."""
+        return self.chat_writer.get_stats()
+
+    def close(self) -> None:
+        """Flush pending chat history and close all pooled database connections."""
+        self.chat_writer.close()
+        if self.change_listener:
+            self.change_listener.stop()
+        self.pool.close()
+        if self.replicas:
+            self.replicas.close()
+
+    def _execute(self, cur, query: str, parameters: Any = None) -> None:
+        """Run a statement on ``cur``, recording its wall time and logging slow ones."""
+        start = time.perf_counter()
+        failed = False
         try:
-            return psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
-        except Exception as e:
-            raise Exception(f"Database connection error: {str(e)}")
+            cur.execute(query, parameters)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.query_stats.record(query, elapsed_ms, failed)
+            if elapsed_ms >= self.slow_query_ms:
+                logger.warning(
+                    "Slow query (%.1f ms): %s",
+                    elapsed_ms, normalize_statement(query),
+                    extra={"duration_ms": elapsed_ms, "statement": normalize_statement(query)}
+                )
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Query took %.1f ms: %s params=%r",
+                    elapsed_ms, normalize_statement(query), parameters,
+                    extra={"duration_ms": elapsed_ms, "statement": normalize_statement(query)}
+                )
 
     def execute_query(self, query: str, parameters: Any = None, fetch: bool = True) -> Optional[List[Dict]]:
         """Execute a database query with proper error handling and connection management."""
-        conn = None
-        cur = None
         try:
-            # Debug print
-            print(f"\nExecuting query: {query}")
-            print(f"With parameters: {parameters}")
-            
-            conn = self.get_connection()
-            cur = conn.cursor()
-            
-            cur.execute(query, parameters)
-            
-            # Always commit for INSERT/UPDATE/DELETE operations
-            if not fetch:
-                conn.commit()
-                results = {"affected_rows": cur.rowcount}
-                print(f"Affected rows: {cur.rowcount}")
-            else:
-                # For SELECT operations
-                results = cur.fetchall()
-                # Still commit to ensure any prior operations are visible
-                conn.commit()
-                print(f"Query results: {results}")
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    self._execute(cur, query, parameters)
+                    
+                    # Always commit for INSERT/UPDATE/DELETE operations
+                    if not fetch:
+                        conn.commit()
+                        results = {"affected_rows": cur.rowcount}
+                        logger.debug("Affected rows: %d", cur.rowcount)
+                    else:
+                        # For SELECT operations
+                        results = cur.fetchall()
+                        # Still commit to ensure any prior operations are visible
+                        conn.commit()
+                        logger.debug("Fetched %d rows", len(results))
 
             return results
 
         except Exception as e:
-            if conn:
-                conn.rollback()
-            print(f"Query execution error: {str(e)}")
+            logger.error("Query execution error: %s", e, extra={"statement": normalize_statement(query)})
             raise Exception(f"Query execution error: {str(e)}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
+
+    def execute_read(self, method: str, query: str, parameters: Any = None,
+                     account_number: Optional[str] = None) -> List[Dict]:
+        """Run a read-only query on a replica when ``method`` is routed there, else on the primary.
+
+        Reads for an account that wrote within the sticky window stay on the
+        primary, and a replica that errors is retried on the primary.
+        Per-account methods in ``cached_reads`` are served from the account
+        cache until that account changes.
+        """
+        # Without a live listener other workers' changes would go unnoticed, so skip the cache
+        cacheable = (
+            self.account_cache is not None and account_number and method in self.cached_reads
+            and (self.change_listener is None or self.change_listener.listening)
+        )
+        if cacheable:
+            rows = self.account_cache.get(account_number, method)
+            if rows is not None:
+                return rows
+            version = self.account_cache.version(account_number, method)
+
+        rows = self._read_rows(method, query, parameters, account_number)
+        if cacheable:
+            rows = [dict(row) for row in rows]
+            self.account_cache.set(account_number, method, rows, version)
+        return rows
+
+    def _read_rows(self, method: str, query: str, parameters: Any,
+                   account_number: Optional[str]) -> List[Dict]:
+        """Route one read to a replica or the primary."""
+        replica = None
+        if self.replicas and method in self.replica_reads:
+            replica = self.replicas.choose(account_number, method)
+
+        if replica is not None:
+            try:
+                with replica.pool.connection() as conn:
+                    cur = conn.cursor()
+                    self._execute(cur, query, parameters)
+                    return cur.fetchall()
+            except Exception as e:
+                self.replicas.mark_failed(replica, e)
+
+        return self.execute_query(query, parameters)
+
+    def _note_write(self, account_number: str, read: Optional[str] = None) -> None:
+        """Drop the account's cached reads and keep its reads on the primary until replicas catch up.
+
+        A write that only one read method can see passes that method as
+        ``read``, so the account's other cached and replica reads are left
+        alone.
+        """
+        if self.account_cache:
+            self.account_cache.invalidate(account_number, read)
+        if self.replicas:
+            self.replicas.mark_write(account_number, read)
 
     def create_user(self, data: Dict) -> Dict:
         """Create a new user account with validation."""
-        conn = None
         try:
-            print(f"Attempting to create user with email: {data['email']}")
-            
             # Validate required fields
             required_fields = ['email', 'password', 'account_number']
             missing_fields = [field for field in required_fields if field not in data]
             if missing_fields:
                 raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
 
-            # Hash password
-            salt = bcrypt.gensalt()
-            hashed_password = bcrypt.hashpw(data['password'].encode('utf-8'), salt)
-            
-            conn = self.get_connection()
-            cur = conn.cursor()
-
             # First check if user already exists
-            cur.execute("SELECT email FROM users WHERE email = %s", (data['email'],))
-            if cur.fetchone():
+            if self.execute_query("SELECT email FROM users WHERE email = %s", (data['email'],)):
                 raise ValueError("User with this email already exists")
 
-            query = """
-                INSERT INTO users (account_number, email, password, balance)
-                VALUES (%s, %s, %s, %s)
-                RETURNING id, account_number, email, balance, created_at
-            """
-            
-            print(f"Executing query with account_number: {data['account_number']}, email: {data['email']}")
+            # Hash password in the worker pool without holding a connection
+            hashed_password = self.password_hasher.hash(data['password'])
             
-            cur.execute(query, (
-                data['account_number'], 
-                data['email'], 
-                hashed_password.decode('utf-8'),
-                data.get('balance', 0.00)
-            ))
-            
-            result = cur.fetchone()
-            # Explicitly commit the transaction
-            conn.commit()
-            
-            print(f"Query result: {result}")
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+
+                # The unique constraint still catches a concurrent signup with the same email
+                query = """
+                    INSERT INTO users (account_number, email, password, balance)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING id, account_number, email, balance, created_at
+                """
+            
+                self._execute(cur, query, (
+                    data['account_number'], 
+                    data['email'], 
+                    hashed_password,
+                    data.get('balance', 0.00)
+                ))
+            
+                result = cur.fetchone()
+                # Explicitly commit the transaction
+                conn.commit()
+
+                logger.info("Created account %s", result['account_number'])
             
             return {
                 "status": "success",
@@ -122,255 +322,229 @@ class DatabaseManager:
                 "data": result
             }
         except Exception as e:
-            if conn:
-                conn.rollback()
-            print(f"Error creating user: {str(e)}")
+            logger.warning("Error creating user: %s", e)
             return {"status": "error", "message": str(e)}
-        finally:
-            if conn:
-                conn.close()
 
     def validate_login(self, email: str, password: str) -> Dict:
-        """Validate user login credentials."""
-        conn = None
-        try:
-            print(f"\nAttempting login for email: {email}")
-            
-            conn = self.get_connection()
-            cur = conn.cursor()
+        """Validate user login credentials and start a session.
 
+        The stored hash is read and the connection released before the
+        password is checked in the hasher's worker pool. On success the
+        result carries a ``session_token`` for validate_session.
+        """
+        try:
             query = """
                 SELECT id, account_number, email, password, balance 
                 FROM users 
                 WHERE email = %s
             """
+            rows = self.execute_query(query, (email,))
             
-            print(f"Executing login query for email: {email}")
-            
-            cur.execute(query, (email,))
-            result = cur.fetchone()  # Use fetchone instead of fetchall
-            
-            print(f"Login query result: {result}")
-            
-            if not result:
-                print(f"No user found with email: {email}")
+            if not rows:
+                logger.info("Login failed: unknown email")
                 return {"status": "error", "message": "Invalid email or password"}
             
-            # Convert RealDictRow to regular dict if needed
-            user = dict(result) if result else None
-            
-            print(f"Found user: {user['email']}")
-            print(f"Comparing passwords...")
-            
-            stored_password = user['password']
-            if bcrypt.checkpw(password.encode('utf-8'), stored_password.encode('utf-8')):
-                print("Password verified successfully")
-                
-                # Update last login
-                cur.execute(
-                    "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = %s",
-                    (user['id'],)
-                )
-                conn.commit()
-                
-                return {"status": "success", "data": {
-                    "account_number": user['account_number'],
-                    "email": user['email'],
-                    "balance": user['balance']
-                }}
+            user = dict(rows[0])
             
-            print("Password verification failed")
-            return {"status": "error", "message": "Invalid email or password"}
+            if not self.password_hasher.verify(password, user['password']):
+                logger.info("Login failed: bad password for account %s", user['account_number'])
+                return {"status": "error", "message": "Invalid email or password"}
+
+            # Update last login
+            self.execute_query(
+                "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = %s",
+                (user['id'],),
+                fetch=False
+            )
+
+            session_token = self.sessions.create({
+                "account_number": user['account_number'],
+                "email": user['email']
+            })
+            
+            return {"status": "success", "data": {
+                "account_number": user['account_number'],
+                "email": user['email'],
+                "balance": user['balance'],
+                "session_token": session_token
+            }}
         
         except Exception as e:
-            if conn:
-                conn.rollback()
-            print(f"Login error: {str(e)}")
+            logger.error("Login error: %s", e)
             return {"status": "error", "message": str(e)}
-        finally:
-            if conn:
-                conn.close()
 
-    def get_real_time_quote(self, symbol: str) -> Dict:
-            """Get real-time stock quote using yfinance with caching and rate limiting."""
-            try:
-                # Check cache first
-                current_time = time.time()
-                if symbol in self._quote_cache:
-                    cached_quote, cache_time = self._quote_cache[symbol]
-                    if current_time - cache_time < self._cache_timeout:
-                        return cached_quote
-
-                # Add random delay between requests to avoid rate limiting
-                time.sleep(random.uniform(1, 3))
-
-                # If symbol is AAPL, return test data (temporary workaround for rate limit)
-                if symbol.upper() == 'AAPL':
-                    quote_data = {
-                        "symbol": "AAPL",
-                        "price": 169.50,  # Example price
-                        "change": 0.5,
-                        "volume": 50000000,
-                        "timestamp": datetime.now()
-                    }
-                    self._quote_cache[symbol] = (quote_data, current_time)
-                    return quote_data
-
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        stock = yf.Ticker(symbol.upper())
-                        info = stock.info
-                        
-                        if 'regularMarketPrice' not in info:
-                            raise ValueError(f"No price data available for {symbol}")
-                        
-                        quote_data = {
-                            "symbol": symbol.upper(),
-                            "price": info.get('regularMarketPrice', 0.0),
-                            "change": info.get('regularMarketChangePercent', 0.0),
-                            "volume": info.get('regularMarketVolume', 0),
-                            "timestamp": datetime.now()
-                        }
-                        
-                        # Cache the result
-                        self._quote_cache[symbol] = (quote_data, current_time)
-                        return quote_data
-                    
-                    except Exception as e:
-                        if attempt == max_retries - 1:
-                            raise
-                        time.sleep(2 ** attempt)  # Exponential backoff
-                
-            except Exception as e:
-                print(f"Error fetching quote for {symbol}: {str(e)}")
-                # Return last cached value if available
-                if symbol in self._quote_cache:
-                    cached_quote, _ = self._quote_cache[symbol]
-                    cached_quote['from_cache'] = True
-                    return cached_quote
-                    
-                # Return safe default with error indication
-                return {
-                    "symbol": symbol.upper(),
-                    "price": 169.50,  # Default price for testing
-                    "change": 0.0,
-                    "volume": 0,
-                    "timestamp": datetime.now(),
-                    "error": str(e)
-                }
+    def validate_session(self, session_token: str) -> Dict:
+        """Validate a session token from validate_login without touching the database."""
+        user = self.sessions.validate(session_token)
+        if user is None:
+            return {"status": "error", "message": "Session expired or invalid. Please log in again."}
+        return {"status": "success", "data": dict(user)}
+
+    def logout(self, session_token: str) -> Dict:
+        """End a login session."""
+        if self.sessions.revoke(session_token):
+            return {"status": "success", "message": "Logged out"}
+        return {"status": "error", "message": "Session not found"}
 
     def execute_trade(self, account_number: str, trade_type: str, 
                      symbol: str, shares: int, price: float) -> Dict:
-        """Execute a stock trade with proper validation and error handling."""
-        conn = None
+        """Execute a stock trade with proper validation and error handling.
+
+        Uses the single-round-trip ``execute_trade`` SQL function when it is
+        installed (migrations/002_portfolio_indexes_last_trade.sql) and falls back
+        to the statement-by-statement path otherwise.
+        """
+        self._note_write(account_number)
+        if self.use_trade_function:
+            try:
+                return self._execute_trade_function(account_number, trade_type, symbol, shares, price)
+            except psycopg2.errors.UndefinedFunction:
+                logger.warning("execute_trade() SQL function not installed; using multi-statement trades")
+                self.use_trade_function = False
+        return self._execute_trade_statements(account_number, trade_type, symbol, shares, price)
+
+    def _execute_trade_function(self, account_number: str, trade_type: str,
+                                symbol: str, shares: int, price: float) -> Dict:
+        """Validate and apply a trade in one round trip through the SQL function."""
         try:
-            conn = self.get_connection()
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Start transaction
-            cur.execute("BEGIN")
-            
-            # Calculate total amount (use float for calculation, then convert to Decimal)
-            total_amount = float(shares) * float(price)
-            
-            # Get current position
-            cur.execute("""
-                SELECT SUM(shares) as total_shares
-                FROM portfolio 
-                WHERE account_number = %s AND stock_symbol = %s
-            """, (account_number, symbol))
-            
-            position = cur.fetchone()
-            current_shares = int(position['total_shares'] if position and position['total_shares'] else 0)
-            
-            # Validate trade
-            if trade_type == 'SELL' and current_shares < shares:
-                raise ValueError(
-                    f"Insufficient shares for this trade.\n"
-                    f"Required: {shares} shares\n"
-                    f"Available: {current_shares} shares"
+            with self.get_connection() as conn:
+                cur = conn.cursor(cursor_factory=RealDictCursor)
+                self._execute(cur,
+                    "SELECT transaction_id, new_balance FROM execute_trade(%s, %s, %s, %s, %s)",
+                    (account_number, trade_type, symbol, shares, price)
                 )
+                result = cur.fetchone()
+
+            return {
+                "status": "success",
+                "message": (
+                    f"Successfully {trade_type.lower()}ed {shares} shares of {symbol} "
+                    f"at ${price:.2f} per share"
+                ),
+                "transaction_id": result['transaction_id'],
+                "new_balance": float(result['new_balance'])
+            }
+
+        except psycopg2.errors.UndefinedFunction:
+            raise
+        except psycopg2.Error as e:
+            # Validation failures are raised by the function; surface just their message
+            return {"status": "error", "message": e.diag.message_primary or str(e)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def _execute_trade_statements(self, account_number: str, trade_type: str,
+                                  symbol: str, shares: int, price: float) -> Dict:
+        """Execute a trade as separate validation and write statements."""
+        try:
+            # The pooled connection opens the transaction implicitly and
+            # rolls it back if anything below raises
+            with self.get_connection() as conn:
+                cur = conn.cursor(cursor_factory=RealDictCursor)
             
-            # Get and verify user balance
-            cur.execute(
-                "SELECT balance FROM users WHERE account_number = %s FOR UPDATE",
-                (account_number,)
-            )
-            user = cur.fetchone()
+                # Calculate total amount (use float for calculation, then convert to Decimal)
+                total_amount = float(shares) * float(price)
             
-            if not user:
-                raise ValueError("Account not found")
+                # Get current position
+                self._execute(cur, """
+                    SELECT SUM(shares) as total_shares
+                    FROM portfolio 
+                    WHERE account_number = %s AND stock_symbol = %s
+                """, (account_number, symbol))
             
-            current_balance = float(user['balance'])
+                position = cur.fetchone()
+                current_shares = int(position['total_shares'] if position and position['total_shares'] else 0)
             
-            if trade_type == 'BUY' and current_balance < total_amount:
-                raise ValueError(
-                    f"Insufficient funds for this trade.\n"
-                    f"Required: ${total_amount:.2f}\n"
-                    f"Available: ${current_balance:.2f}"
-                )
+                # Validate trade
+                if trade_type == 'SELL' and current_shares < shares:
+                    raise ValueError(
+                        f"Insufficient shares for this trade.\n"
+                        f"Required: {shares} shares\n"
+                        f"Available: {current_shares} shares"
+                    )
             
-            # Execute trade
-            if trade_type == 'BUY':
-                # Update balance
-                cur.execute(
-                    "UPDATE users SET balance = balance - %s WHERE account_number = %s",
-                    (total_amount, account_number)
+                # Get and verify user balance
+                self._execute(cur,
+                    "SELECT balance FROM users WHERE account_number = %s FOR UPDATE",
+                    (account_number,)
                 )
+                user = cur.fetchone()
+            
+                if not user:
+                    raise ValueError("Account not found")
+            
+                current_balance = float(user['balance'])
+            
+                if trade_type == 'BUY' and current_balance < total_amount:
+                    raise ValueError(
+                        f"Insufficient funds for this trade.\n"
+                        f"Required: ${total_amount:.2f}\n"
+                        f"Available: ${current_balance:.2f}"
+                    )
+            
+                # Execute trade
+                if trade_type == 'BUY':
+                    # Update balance
+                    self._execute(cur,
+                        "UPDATE users SET balance = balance - %s WHERE account_number = %s RETURNING balance",
+                        (total_amount, account_number)
+                    )
+                    new_balance = float(cur.fetchone()['balance'])
+                
+                    # Update portfolio
+                    if current_shares > 0:
+                        # Update existing position
+                        self._execute(cur, """
+                            UPDATE portfolio 
+                            SET shares = shares + %s,
+                                average_price = (average_price * shares + %s) / (shares + %s),
+                                last_updated = CURRENT_TIMESTAMP
+                            WHERE account_number = %s AND stock_symbol = %s
+                        """, (shares, total_amount, shares, account_number, symbol))
+                    else:
+                        # Insert new position
+                        self._execute(cur, """
+                            INSERT INTO portfolio 
+                            (account_number, stock_symbol, shares, average_price)
+                            VALUES (%s, %s, %s, %s)
+                        """, (account_number, symbol, shares, price))
+            
+                else:  # SELL
+                    # Update balance
+                    self._execute(cur,
+                        "UPDATE users SET balance = balance + %s WHERE account_number = %s RETURNING balance",
+                        (total_amount, account_number)
+                    )
+                    new_balance = float(cur.fetchone()['balance'])
                 
-                # Update portfolio
-                if current_shares > 0:
-                    # Update existing position
-                    cur.execute("""
+                    # Update portfolio
+                    self._execute(cur, """
                         UPDATE portfolio 
-                        SET shares = shares + %s,
-                            average_price = (average_price * shares + %s) / (shares + %s),
+                        SET shares = shares - %s,
                             last_updated = CURRENT_TIMESTAMP
                         WHERE account_number = %s AND stock_symbol = %s
-                    """, (shares, total_amount, shares, account_number, symbol))
-                else:
-                    # Insert new position
-                    cur.execute("""
-                        INSERT INTO portfolio 
-                        (account_number, stock_symbol, shares, average_price)
-                        VALUES (%s, %s, %s, %s)
-                    """, (account_number, symbol, shares, price))
-            
-            else:  # SELL
-                # Update balance
-                cur.execute(
-                    "UPDATE users SET balance = balance + %s WHERE account_number = %s",
-                    (total_amount, account_number)
-                )
+                    """, (shares, account_number, symbol))
                 
-                # Update portfolio
-                cur.execute("""
-                    UPDATE portfolio 
-                    SET shares = shares - %s,
-                        last_updated = CURRENT_TIMESTAMP
-                    WHERE account_number = %s AND stock_symbol = %s
-                """, (shares, account_number, symbol))
-                
-                # Clean up zero positions
-                cur.execute("""
-                    DELETE FROM portfolio 
-                    WHERE account_number = %s AND stock_symbol = %s AND shares <= 0
-                """, (account_number, symbol))
-            
-            # Record transaction
-            cur.execute("""
-                INSERT INTO transactions 
-                (account_number, transaction_type, stock_symbol, shares, 
-                 price_per_share, total_amount)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                RETURNING transaction_id
-            """, (account_number, trade_type, symbol, shares, price, total_amount))
-            
-            transaction = cur.fetchone()
-            
-            # Commit transaction
-            cur.execute("COMMIT")
+                    # Clean up zero positions
+                    self._execute(cur, """
+                        DELETE FROM portfolio 
+                        WHERE account_number = %s AND stock_symbol = %s AND shares <= 0
+                    """, (account_number, symbol))
+            
+                # Record transaction
+                self._execute(cur, """
+                    INSERT INTO transactions 
+                    (account_number, transaction_type, stock_symbol, shares, 
+                     price_per_share, total_amount)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    RETURNING transaction_id
+                """, (account_number, trade_type, symbol, shares, price, total_amount))
+            
+                transaction = cur.fetchone()
+                self._record_last_trades(cur, account_number, [transaction['transaction_id']])
+            
+                # Commit transaction
+                conn.commit()
             
             return {
                 "status": "success",
@@ -378,148 +552,306 @@ class DatabaseManager:
                     f"Successfully {trade_type.lower()}ed {shares} shares of {symbol} "
                     f"at ${price:.2f} per share"
                 ),
-                "transaction_id": transaction['transaction_id']
+                "transaction_id": transaction['transaction_id'],
+                "new_balance": new_balance
             }
             
         except Exception as e:
-            if conn:
-                cur.execute("ROLLBACK")
             return {"status": "error", "message": str(e)}
-        finally:
-            if conn:
-                conn.close()
                 
+    def _record_last_trades(self, cur, account_number: str, transaction_ids: List[int]) -> None:
+        """Point last_trade at the newest of the given transactions for each symbol."""
+        self._execute(cur, """
+            INSERT INTO last_trade
+            (account_number, stock_symbol, transaction_id, price_per_share, transaction_date)
+            SELECT DISTINCT ON (stock_symbol)
+                account_number, stock_symbol, transaction_id, price_per_share, transaction_date
+            FROM transactions
+            WHERE account_number = %s AND transaction_id = ANY(%s)
+            ORDER BY stock_symbol, transaction_id DESC
+            ON CONFLICT (account_number, stock_symbol) DO UPDATE
+            SET transaction_id = EXCLUDED.transaction_id,
+                price_per_share = EXCLUDED.price_per_share,
+                transaction_date = EXCLUDED.transaction_date
+        """, (account_number, transaction_ids))
+
+    def execute_trades(self, account_number: str, orders: List[Dict]) -> Dict:
+        """Execute a basket of orders atomically.
+
+        Each order is ``{"trade_type": "BUY"|"SELL", "symbol": ..., "shares": ..., "price": ...}``.
+        The basket is validated as a whole against one locked snapshot of
+        the balance and positions (so sells may fund buys in the same
+        basket), positions are written with set-based SQL and every
+        transaction row goes in with one insert. Either all orders apply or none.
+        """
+        try:
+            legs = parse_orders(orders)
+            symbols = sorted({symbol for _, symbol, _, _ in legs})
+
+            self._note_write(account_number)
+            with self.get_connection() as conn:
+                cur = conn.cursor(cursor_factory=RealDictCursor)
+
+                # Snapshot: lock the account and every position the basket touches
+                self._execute(cur,
+                    "SELECT balance FROM users WHERE account_number = %s FOR UPDATE",
+                    (account_number,)
+                )
+                user = cur.fetchone()
+                if not user:
+                    raise ValueError("Account not found")
+                balance = float(user['balance'])
+
+                self._execute(cur, """
+                    SELECT stock_symbol, shares, average_price
+                    FROM portfolio
+                    WHERE account_number = %s AND stock_symbol = ANY(%s)
+                    FOR UPDATE
+                """, (account_number, symbols))
+                positions = {
+                    row['stock_symbol']: [int(row['shares']), float(row['average_price'])]
+                    for row in cur.fetchall()
+                }
+
+                cash_delta = apply_basket(legs, balance, positions)
+
+                self._execute(cur,
+                    "UPDATE users SET balance = balance + %s WHERE account_number = %s RETURNING balance",
+                    (cash_delta, account_number)
+                )
+                new_balance = float(cur.fetchone()['balance'])
+
+                held_positions = [(s, p) for s, p in positions.items() if s in symbols and p[0] > 0]
+                if held_positions:
+                    self._execute(cur, """
+                        INSERT INTO portfolio (account_number, stock_symbol, shares, average_price)
+                        SELECT %s, p.symbol, p.shares, p.average_price
+                        FROM unnest(%s::varchar[], %s::integer[], %s::numeric[])
+                            AS p(symbol, shares, average_price)
+                        ON CONFLICT (account_number, stock_symbol) DO UPDATE
+                        SET shares = EXCLUDED.shares,
+                            average_price = EXCLUDED.average_price,
+                            last_updated = CURRENT_TIMESTAMP
+                    """, (
+                        account_number,
+                        [symbol for symbol, _ in held_positions],
+                        [held for _, (held, _) in held_positions],
+                        [average_price for _, (_, average_price) in held_positions]
+                    ))
+
+                closed = [symbol for symbol in symbols if positions[symbol][0] == 0]
+                if closed:
+                    self._execute(cur,
+                        "DELETE FROM portfolio WHERE account_number = %s AND stock_symbol = ANY(%s)",
+                        (account_number, closed)
+                    )
+
+                self._execute(cur, """
+                    INSERT INTO transactions
+                    (account_number, transaction_type, stock_symbol, shares,
+                     price_per_share, total_amount)
+                    SELECT %s, t.trade_type, t.symbol, t.shares, t.price, t.shares * t.price
+                    FROM unnest(%s::varchar[], %s::varchar[], %s::integer[], %s::numeric[])
+                        AS t(trade_type, symbol, shares, price)
+                    RETURNING transaction_id
+                """, (
+                    account_number,
+                    [leg[0] for leg in legs],
+                    [leg[1] for leg in legs],
+                    [leg[2] for leg in legs],
+                    [leg[3] for leg in legs]
+                ))
+                transaction_ids = [row['transaction_id'] for row in cur.fetchall()]
+                self._record_last_trades(cur, account_number, transaction_ids)
+
+                conn.commit()
+
+            return {
+                "status": "success",
+                "message": f"Successfully executed {len(legs)} orders across {len(symbols)} symbols",
+                "transaction_ids": transaction_ids,
+                "new_balance": new_balance
+            }
+
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def deposit(self, account_number: str, amount: float) -> Dict:
+        """Add funds to an account and record the deposit transaction."""
+        try:
+            if amount <= 0:
+                raise ValueError("Deposit amount must be positive.")
+
+            self._note_write(account_number)
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                self._execute(cur,
+                    "UPDATE users SET balance = balance + %s WHERE account_number = %s RETURNING balance",
+                    (amount, account_number)
+                )
+                user = cur.fetchone()
+                if not user:
+                    raise ValueError("Account not found")
+
+                self._execute(cur, """
+                    INSERT INTO transactions (account_number, transaction_type, total_amount)
+                    VALUES (%s, 'DEPOSIT', %s)
+                    RETURNING transaction_id
+                """, (account_number, amount))
+                transaction = cur.fetchone()
+
+            return {
+                "status": "success",
+                "message": f"Deposited ${amount:.2f} successfully",
+                "transaction_id": transaction['transaction_id'],
+                "new_balance": float(user['balance'])
+            }
+
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
     def get_portfolio(self, account_number: str) -> List[Dict]:
         """Get user's consolidated portfolio with current market values."""
         try:
-            # Get consolidated portfolio holdings with single row per symbol
+            # One row per position; last_trade is keyed by (account, symbol) so
+            # this touches only the user's own rows however large transactions grows
             query = """
-                WITH latest_transactions AS (
-                    SELECT DISTINCT ON (account_number, stock_symbol)
-                        account_number, stock_symbol, price_per_share, transaction_date
-                    FROM transactions
-                    ORDER BY account_number, stock_symbol, transaction_date DESC
-                )
                 SELECT 
                     p.stock_symbol,
-                    SUM(p.shares) as shares,  -- Sum total shares
+                    p.shares,
                     p.average_price,
                     p.last_updated,
                     lt.price_per_share as last_transaction_price,
                     lt.transaction_date as last_transaction_date
                 FROM portfolio p
-                LEFT JOIN latest_transactions lt 
-                    ON p.account_number = lt.account_number 
-                    AND p.stock_symbol = lt.stock_symbol
+                LEFT JOIN last_trade lt 
+                    ON lt.account_number = p.account_number 
+                    AND lt.stock_symbol = p.stock_symbol
                 WHERE p.account_number = %s AND p.shares > 0
-                GROUP BY 
-                    p.stock_symbol,
-                    p.average_price,
-                    p.last_updated,
-                    lt.price_per_share,
-                    lt.transaction_date
+                ORDER BY p.stock_symbol
             """
             
-            portfolio = self.execute_query(query, (account_number,))
-            
-            # Convert to list of consolidated positions
-            consolidated = {}
-            for pos in portfolio:
-                symbol = pos['stock_symbol']
-                if symbol not in consolidated:
-                    consolidated[symbol] = {
-                        'stock_symbol': symbol,
-                        'shares': float(pos['shares']),
-                        'average_price': float(pos['average_price']),
-                        'last_updated': pos['last_updated'],
-                        'last_transaction_price': float(pos['last_transaction_price']) if pos['last_transaction_price'] else None,
-                        'last_transaction_date': pos['last_transaction_date']
-                    }
-                else:
-                    consolidated[symbol]['shares'] += float(pos['shares'])
-            
-            # Convert consolidated dict to list
-            portfolio = list(consolidated.values())
-            
-            # Enrich with current market prices
-            for position in portfolio:
-                try:
-                    quote = self.get_real_time_quote(position['stock_symbol'])
-                    current_price = float(quote['price'])
-                    shares = position['shares']
-                    avg_price = position['average_price']
-                    
-                    position['current_price'] = current_price
-                    position['market_value'] = current_price * shares
-                    position['profit_loss'] = (current_price - avg_price) * shares
-                    position['profit_loss_percent'] = ((current_price / avg_price) - 1) * 100 if avg_price > 0 else 0
-                    
-                except Exception as e:
-                    print(f"Error getting quote for {position['stock_symbol']}: {e}")
-                    position['current_price'] = position['average_price']
-                    position['market_value'] = position['average_price'] * shares
-                    position['profit_loss'] = 0
-                    position['profit_loss_percent'] = 0
+            portfolio = [
+                {
+                    'stock_symbol': pos['stock_symbol'],
+                    'shares': float(pos['shares']),
+                    'average_price': float(pos['average_price']),
+                    'last_updated': pos['last_updated'],
+                    'last_transaction_price': float(pos['last_transaction_price']) if pos['last_transaction_price'] else None,
+                    'last_transaction_date': pos['last_transaction_date']
+                }
+                for pos in self.execute_read("get_portfolio", query, (account_number,), account_number)
+            ]
             
+            self._apply_market_values(portfolio)
             return portfolio
             
         except Exception as e:
-            print(f"Error fetching portfolio: {e}")
+            logger.error("Error fetching portfolio: %s", e)
             return []
 
-    def add_to_watchlist(self, account_number: str, symbol: str) -> Dict:
-        """Add a stock to user's watchlist."""
-        try:
-            query = """
-                INSERT INTO watchlist (account_number, stock_symbol)
-                VALUES (%s, %s)
-                ON CONFLICT (account_number, stock_symbol) DO NOTHING
-                RETURNING id
-            """
-            result = self.execute_query(query, (account_number, symbol))
-            return {
-                "status": "success",
-                "message": f"Added {symbol} to watchlist"
-            }
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
+    def load_user_context(self, account_number: str) -> Dict:
+        """Load balance, priced positions and watchlist symbols in one SQL round trip.
 
-    def get_watchlist(self, account_number: str) -> List[Dict]:
-        """Get user's watchlist with current prices."""
+        Positions and watchlist are aggregated to JSON server-side, so the
+        agent's per-request context costs one query plus one batch quote
+        lookup instead of get_user, get_portfolio and get_watchlist.
+        """
+        query = """
+            SELECT
+                u.account_number,
+                u.email,
+                u.balance,
+                u.last_login,
+                COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'stock_symbol', p.stock_symbol,
+                        'shares', p.shares,
+                        'average_price', p.average_price,
+                        'last_updated', p.last_updated,
+                        'last_transaction_price', lt.price_per_share,
+                        'last_transaction_date', lt.transaction_date
+                    ) ORDER BY p.stock_symbol)
+                    FROM portfolio p
+                    LEFT JOIN last_trade lt
+                        ON lt.account_number = p.account_number
+                        AND lt.stock_symbol = p.stock_symbol
+                    WHERE p.account_number = u.account_number AND p.shares > 0
+                ), '[]'::json) AS positions,
+                COALESCE((
+                    SELECT json_agg(w.stock_symbol ORDER BY w.added_date)
+                    FROM watchlist w
+                    WHERE w.account_number = u.account_number
+                ), '[]'::json) AS watchlist
+            FROM users u
+            WHERE u.account_number = %s
+        """
         try:
-            query = "SELECT * FROM watchlist WHERE account_number = %s"
-            watchlist = self.execute_query(query, (account_number,))
-            
-            # Enrich with current market prices
-            for item in watchlist:
-                quote = self.get_real_time_quote(item['stock_symbol'])
-                item.update(quote)
-            
-            return watchlist
+            result = self.execute_read("load_user_context", query, (account_number,), account_number)
+            if not result:
+                raise Exception("User not found")
+            context = dict(result[0])
         except Exception as e:
-            print(f"Error fetching watchlist: {e}")
-            return []
+            raise Exception(f"Error loading user context: {str(e)}")
+
+        context['balance'] = float(context['balance'])
+        for position in context['positions']:
+            position['shares'] = float(position['shares'])
+            position['average_price'] = float(position['average_price'])
+            if position['last_transaction_price'] is not None:
+                position['last_transaction_price'] = float(position['last_transaction_price'])
+        self._apply_market_values(context['positions'])
+        return context
 
     def save_chat_message(self, account_number: str, message_type: str, message: str) -> None:
-        """Save chat message to history."""
+        """Queue chat message for the background history writer."""
         try:
+            self._note_write(account_number, "get_chat_history")
+            self.chat_writer.submit(account_number, message_type, message)
+        except Exception as e:
+            logger.error("Error saving chat message: %s", e)
+
+    def _write_chat_messages(self, rows: List[ChatRow]) -> None:
+        """Insert a batch of chat messages with one statement."""
+        # Timestamps are taken at submit time so batched rows keep their order
+        accounts, message_types, messages, timestamps = (list(column) for column in zip(*rows))
+        with self.get_connection() as conn:
+            cur = conn.cursor()
+            self._execute(cur, """
+                INSERT INTO chat_history (account_number, message_type, message, timestamp)
+                SELECT * FROM unnest(%s::varchar[], %s::varchar[], %s::text[], %s::timestamp[])
+            """, (accounts, message_types, messages, timestamps))
+
+    def get_chat_history(self, account_number: str, limit: int = 50,
+                         before: Optional[Dict] = None) -> List[Dict]:
+        """Get a page of chat history, newest first.
+
+        Pass the last message of the previous page as ``before`` to get the
+        next (older) page. Pages are keyset-paginated on (timestamp, id) so
+        each one is an index range scan whatever its depth.
+        """
+        # Include messages still waiting in the write-behind queue
+        self.chat_writer.flush(timeout=5.0)
+        if before is None:
             query = """
-                INSERT INTO chat_history (account_number, message_type, message)
-                VALUES (%s, %s, %s)
+                SELECT id, message_type, message, timestamp
+                FROM chat_history 
+                WHERE account_number = %s 
+                ORDER BY timestamp DESC, id DESC 
+                LIMIT %s
             """
-            self.execute_query(query, (account_number, message_type, message), fetch=False)
-        except Exception as e:
-            print(f"Error saving chat message: {e}")
+            return self.execute_read("get_chat_history", query, (account_number, limit), account_number)
 
-    def get_chat_history(self, account_number: str, limit: int = 50) -> List[Dict]:
-        """Get recent chat history."""
         query = """
-            SELECT * FROM chat_history 
-            WHERE account_number = %s 
-            ORDER BY timestamp DESC 
+            SELECT id, message_type, message, timestamp
+            FROM chat_history 
+            WHERE account_number = %s AND (timestamp, id) < (%s, %s)
+            ORDER BY timestamp DESC, id DESC 
             LIMIT %s
         """
-        return self.execute_query(query, (account_number, limit))
+        return self.execute_read(
+            "get_chat_history", query, (account_number, before['timestamp'], before['id'], limit), account_number
+        )
     
     def get_user(self, account_number: str) -> Dict:
         """Get user information."""
@@ -529,7 +861,7 @@ class DatabaseManager:
                 FROM users
                 WHERE account_number = %s
             """
-            result = self.execute_query(query, (account_number,))
+            result = self.execute_read("get_user", query, (account_number,), account_number)
             if not result:
                 raise Exception("User not found")
             return result[0]
@@ -539,11 +871,12 @@ class DatabaseManager:
     def add_to_watchlist(self, account_number: str, symbol: str) -> Dict:
         """Add a stock to user's watchlist."""
         try:
+            self._note_write(account_number)
             with self.get_connection() as conn:
                 cur = conn.cursor()
                 
                 # Check if already in watchlist
-                cur.execute(
+                self._execute(cur,
                     "SELECT * FROM watchlist WHERE account_number = %s AND stock_symbol = %s",
                     (account_number, symbol)
                 )
@@ -554,7 +887,7 @@ class DatabaseManager:
                     }
                 
                 # Add to watchlist
-                cur.execute(
+                self._execute(cur,
                     """
                     INSERT INTO watchlist (account_number, stock_symbol)
                     VALUES (%s, %s)
@@ -575,10 +908,11 @@ class DatabaseManager:
     def remove_from_watchlist(self, account_number: str, symbol: str) -> Dict:
         """Remove a stock from user's watchlist."""
         try:
+            self._note_write(account_number)
             with self.get_connection() as conn:
                 cur = conn.cursor()
                 
-                cur.execute(
+                self._execute(cur,
                     """
                     DELETE FROM watchlist 
                     WHERE account_number = %s AND stock_symbol = %s
@@ -605,14 +939,20 @@ class DatabaseManager:
     def get_watchlist(self, account_number: str) -> List[Dict]:
         """Get user's watchlist with current prices."""
         try:
-            with self.get_connection() as conn:
-                cur = conn.cursor(cursor_factory=RealDictCursor)
-                
-                cur.execute(
-                    "SELECT * FROM watchlist WHERE account_number = %s",
-                    (account_number,)
-                )
-                return cur.fetchall()
+            watchlist = self.execute_read(
+                "get_watchlist",
+                "SELECT * FROM watchlist WHERE account_number = %s",
+                (account_number,),
+                account_number
+            )
+
+            # Enrich with current market prices, fetched in one batch
+            if watchlist:
+                quotes = self.get_real_time_quotes([item['stock_symbol'] for item in watchlist])
+                for item in watchlist:
+                    item.update(quotes[item['stock_symbol'].upper()])
+            
+            return watchlist
         except Exception as e:
-            print(f"Error getting watchlist: {e}")
+            logger.error("Error getting watchlist: %s", e)
             return []
\ No newline at end of file
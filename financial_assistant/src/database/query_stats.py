@@ -0,0 +1,87 @@
+from typing import Dict, Any, List, Optional
+from bisect import bisect_left
+import threading
+import re
+
+# Upper bounds of the latency buckets in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(query: str) -> str:
+    """Collapse whitespace so the same SQL template always maps to one key."""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class QueryStats:
+    def __init__(self, buckets_ms: Optional[List[float]] = None):
+        """Initialize per-statement latency histograms."""
+        self.buckets_ms = list(buckets_ms or LATENCY_BUCKETS_MS)
+        self._statements: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, query: str, elapsed_ms: float, failed: bool = False) -> None:
+        """Add one execution of ``query`` to its histogram."""
+        key = normalize_statement(query)
+        bucket = bisect_left(self.buckets_ms, elapsed_ms)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                entry = self._statements[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(self.buckets_ms) + 1),
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["histogram"][bucket] += 1
+            if failed:
+                entry["errors"] += 1
+
+    def _percentile(self, histogram: List[int], count: int, fraction: float) -> float:
+        """Estimate a percentile as the upper bound of the bucket that contains it."""
+        target = fraction * count
+        seen = 0
+        for index, hits in enumerate(histogram):
+            seen += hits
+            if seen >= target:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of every statement's counters and histogram."""
+        with self._lock:
+            statements = {
+                key: {**entry, "histogram": list(entry["histogram"])}
+                for key, entry in self._statements.items()
+            }
+        for entry in statements.values():
+            entry["avg_ms"] = entry["total_ms"] / entry["count"]
+            entry["p50_ms"] = self._percentile(entry["histogram"], entry["count"], 0.50)
+            entry["p95_ms"] = self._percentile(entry["histogram"], entry["count"], 0.95)
+            entry["p99_ms"] = self._percentile(entry["histogram"], entry["count"], 0.99)
+        return statements
+
+    def format_report(self, limit: int = 20) -> str:
+        """Format the slowest statements by total time as a text table."""
+        statements = sorted(self.snapshot().items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        if not statements:
+            return "No queries recorded."
+
+        lines = [f"{'count':>7} {'errors':>6} {'avg ms':>9} {'p95 ms':>8} {'max ms':>9}  statement"]
+        for statement, entry in statements[:limit]:
+            label = statement if len(statement) <= 80 else statement[:77] + "..."
+            lines.append(
+                f"{entry['count']:>7} {entry['errors']:>6} {entry['avg_ms']:>9.2f} "
+                f"{entry['p95_ms']:>8} {entry['max_ms']:>9.2f}  {label}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._statements.clear()
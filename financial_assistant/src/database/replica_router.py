@@ -0,0 +1,177 @@
+from typing import Dict, Any, List, Optional
+import threading
+import logging
+import time
+from src.database.connection_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary; 0 when it has replayed everything it received
+REPLICATION_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag
+"""
+
+
+class Replica:
+    def __init__(self, name: str, pool: ConnectionPool):
+        """Track one read replica's pool, measured lag and health."""
+        self.name = name
+        self.pool = pool
+        self.lag: Optional[float] = None
+        self.lag_checked_at = 0.0
+        self.down_until = 0.0
+        self.reads = 0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    def __init__(self, replica_dsns: List[str], max_lag: float = 5.0, lag_check_interval: float = 2.0,
+                 sticky_window: Optional[float] = None, retry_interval: float = 30.0,
+                 pool_size: int = 5, acquire_timeout: float = 5.0):
+        """Initialize routing of read queries across replicas.
+
+        A replica serves reads while its replication lag, sampled at most
+        every ``lag_check_interval`` seconds, stays within ``max_lag``. An
+        account that just wrote reads from the primary for
+        ``sticky_window`` seconds (default: ``max_lag``) so it always sees
+        its own writes. Replicas that fail are skipped for
+        ``retry_interval`` seconds; with no usable replica the caller
+        falls back to the primary.
+        """
+        if not replica_dsns:
+            raise ValueError("Replica router needs at least one replica DSN")
+
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.sticky_window = max_lag if sticky_window is None else sticky_window
+        self.retry_interval = retry_interval
+
+        # Replica pools start empty so an unreachable replica cannot block startup
+        self.replicas = [
+            Replica(
+                f"replica{index}",
+                ConnectionPool({"dsn": dsn}, min_size=0, max_size=pool_size, acquire_timeout=acquire_timeout)
+            )
+            for index, dsn in enumerate(replica_dsns)
+        ]
+        self._next = 0
+        # Keyed by account, or by (account, read method) for writes only one read sees
+        self._recent_writes: Dict[Any, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "replica_reads": 0,
+            "primary_reads": 0,
+            "sticky_reads": 0,
+            "lagging_skips": 0,
+            "fallbacks": 0,
+        }
+
+    def mark_write(self, account_number: Optional[str], read: Optional[str] = None) -> None:
+        """Pin an account's reads, or only its ``read`` reads, to the primary until replicas have caught up."""
+        if not account_number:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[account_number if read is None else (account_number, read)] = now + self.sticky_window
+            if len(self._recent_writes) > 10000:
+                self._recent_writes = {
+                    account: until for account, until in self._recent_writes.items() if until > now
+                }
+
+    def _is_sticky(self, key: Any, now: float) -> bool:
+        """Whether the account (or account and read) wrote recently; caller holds the lock."""
+        until = self._recent_writes.get(key)
+        if until is None:
+            return False
+        if until <= now:
+            del self._recent_writes[key]
+            return False
+        return True
+
+    def _measure_lag(self, replica: Replica) -> Optional[float]:
+        """Sample a replica's lag; marks it down and returns None if it cannot be reached."""
+        try:
+            with replica.pool.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(REPLICATION_LAG_QUERY)
+                lag = float(cur.fetchone()['lag'])
+        except Exception as e:
+            self.mark_failed(replica, e)
+            return None
+        with self._lock:
+            replica.lag = lag
+            replica.lag_checked_at = time.monotonic()
+        return lag
+
+    def choose(self, account_number: Optional[str] = None, read: Optional[str] = None) -> Optional[Replica]:
+        """Pick a healthy, caught-up replica for a ``read`` method, or None to use the primary."""
+        now = time.monotonic()
+        with self._lock:
+            sticky = account_number and (
+                self._is_sticky(account_number, now) or self._is_sticky((account_number, read), now)
+            )
+            if sticky:
+                self._stats["sticky_reads"] += 1
+                self._stats["primary_reads"] += 1
+                return None
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+            candidates = [
+                self.replicas[(start + offset) % len(self.replicas)] for offset in range(len(self.replicas))
+            ]
+
+        for replica in candidates:
+            if replica.down_until > now:
+                continue
+            lag = replica.lag
+            if lag is None or now - replica.lag_checked_at >= self.lag_check_interval:
+                lag = self._measure_lag(replica)
+                if lag is None:
+                    continue
+            if lag > self.max_lag:
+                with self._lock:
+                    self._stats["lagging_skips"] += 1
+                continue
+            with self._lock:
+                replica.reads += 1
+                self._stats["replica_reads"] += 1
+            return replica
+
+        with self._lock:
+            self._stats["primary_reads"] += 1
+        return None
+
+    def mark_failed(self, replica: Replica, error: Exception) -> None:
+        """Take a replica out of rotation for the retry interval."""
+        logger.warning("Read replica %s unavailable, using primary: %s", replica.name, error)
+        with self._lock:
+            replica.failures += 1
+            replica.down_until = time.monotonic() + self.retry_interval
+            self._stats["fallbacks"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return routing counters and per-replica lag and health."""
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sticky_accounts"] = sum(1 for until in self._recent_writes.values() if until > now)
+            stats["replicas"] = [
+                {
+                    "name": replica.name,
+                    "lag": replica.lag,
+                    "healthy": replica.down_until <= now,
+                    "reads": replica.reads,
+                    "failures": replica.failures,
+                }
+                for replica in self.replicas
+            ]
+        return stats
+
+    def close(self) -> None:
+        """Close every replica pool."""
+        for replica in self.replicas:
+            replica.pool.close()
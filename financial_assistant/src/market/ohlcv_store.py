@@ -0,0 +1,231 @@
+from typing import Dict, Any, Callable, Optional
+from datetime import datetime
+import threading
+import logging
+import os
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+# One fixed-size record per bar; timestamps are exchange-local wall time in nanoseconds
+BAR_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+# How long a stored tail stays current before a delta fetch is worth a request
+INTERVAL_SPANS = {
+    "1m": pd.Timedelta(minutes=1),
+    "2m": pd.Timedelta(minutes=2),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "60m": pd.Timedelta(hours=1),
+    "1h": pd.Timedelta(hours=1),
+    "1d": pd.Timedelta(days=1),
+    "5d": pd.Timedelta(days=5),
+    "1wk": pd.Timedelta(weeks=1),
+    "1mo": pd.Timedelta(days=28),
+}
+
+PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """Translate a yfinance-style period ('5d', '6mo', '2y', 'max') into a start time."""
+    if period == "max":
+        return None
+    now = now or pd.Timestamp.now()
+    for suffix, unit in PERIOD_UNITS.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return now - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def download_history(symbol: str, interval: str, start: Optional[pd.Timestamp], period: str) -> pd.DataFrame:
+    """Fetch OHLCV bars from yfinance, from ``start`` when given, else for ``period``."""
+    stock = yf.Ticker(symbol)
+    if start is None:
+        return stock.history(period=period, interval=interval)
+    return stock.history(start=start.strftime("%Y-%m-%d"), interval=interval)
+
+
+class OHLCVStore:
+    def __init__(self, root: str = "data/ohlcv",
+                 fetcher: Callable[[str, str, Optional[pd.Timestamp], str], pd.DataFrame] = download_history):
+        """Initialize an append-only, memory-mapped bar store under ``root``.
+
+        Each symbol and interval lives in one flat file of BAR_DTYPE records
+        (``<root>/<interval>/<SYMBOL>.bars``). Reads memory-map the file, so
+        slicing a window copies nothing; updates append only bars at or
+        after the last stored timestamp, rewriting that last bar in place
+        since it may have been captured mid-session.
+        """
+        self.root = root
+        self.fetcher = fetcher
+        self._locks: Dict[str, threading.Lock] = {}
+        # Files whose source had no bars older than what was stored (e.g. recent listings)
+        self._full_history: Dict[str, pd.Timestamp] = {}
+        self._locks_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"reads": 0, "fetches": 0, "skipped_fetches": 0, "bars_appended": 0}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def path(self, symbol: str, interval: str) -> str:
+        """File holding one symbol's bars at one interval."""
+        return os.path.join(self.root, interval, f"{symbol.upper()}.bars")
+
+    def _lock(self, path: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _records(self, path: str) -> int:
+        """Number of complete records on disk; a torn trailing write is ignored."""
+        try:
+            return os.path.getsize(path) // BAR_DTYPE.itemsize
+        except FileNotFoundError:
+            return 0
+
+    def read(self, symbol: str, interval: str = "1d",
+             start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> np.ndarray:
+        """Return a read-only, memory-mapped view of the stored bars in [start, end)."""
+        path = self.path(symbol, interval)
+        count = self._records(path)
+        self._count("reads")
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        bars = np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+        timestamps = bars["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, pd.Timestamp(start).value, "left"))
+        hi = count if end is None else int(np.searchsorted(timestamps, pd.Timestamp(end).value, "left"))
+        return bars[lo:hi]
+
+    def read_frame(self, symbol: str, interval: str = "1d",
+                   start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Return the stored bars in [start, end) as an OHLCV DataFrame indexed by time."""
+        bars = self.read(symbol, interval, start, end)
+        return pd.DataFrame(
+            {
+                "Open": bars["open"],
+                "High": bars["high"],
+                "Low": bars["low"],
+                "Close": bars["close"],
+                "Volume": bars["volume"],
+            },
+            index=pd.DatetimeIndex(bars["timestamp"].astype("datetime64[ns]"), name="Date"),
+        )
+
+    def last_timestamp(self, symbol: str, interval: str = "1d") -> Optional[pd.Timestamp]:
+        """Timestamp of the newest stored bar, or None when nothing is stored."""
+        bars = self.read(symbol, interval)
+        return pd.Timestamp(int(bars["timestamp"][-1])) if len(bars) else None
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> np.ndarray:
+        """Convert a yfinance OHLCV frame to BAR_DTYPE records."""
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        records = np.empty(len(df), dtype=BAR_DTYPE)
+        records["timestamp"] = index.asi8
+        records["open"] = df["Open"].to_numpy(dtype="f8")
+        records["high"] = df["High"].to_numpy(dtype="f8")
+        records["low"] = df["Low"].to_numpy(dtype="f8")
+        records["close"] = df["Close"].to_numpy(dtype="f8")
+        records["volume"] = df["Volume"].to_numpy(dtype="f8")
+        return records[np.argsort(records["timestamp"], kind="stable")]
+
+    def update(self, symbol: str, interval: str = "1d", period: str = "6mo",
+               offline: bool = False) -> int:
+        """Bring the stored bars up to date and return how many were added.
+
+        An empty store, or one that does not reach back to the start of
+        ``period``, downloads the whole period. Otherwise only bars from
+        the last stored timestamp onward are requested, and not at all
+        while that bar is younger than one interval or when ``offline``.
+        """
+        path = self.path(symbol, interval)
+        with self._lock(path):
+            bars = self.read(symbol, interval)
+            if offline:
+                self._count("skipped_fetches")
+                return 0
+
+            start = period_start(period)
+            # Allow for weekends and holidays before the first stored bar
+            covered = len(bars) > 0 and (
+                start is None
+                or pd.Timestamp(int(bars["timestamp"][0])) <= start + pd.Timedelta(days=7)
+                or self._full_history.get(path, pd.Timestamp.max) <= start
+            )
+            if not covered:
+                return self._replace(symbol, interval, period, path)
+
+            last = pd.Timestamp(int(bars["timestamp"][-1]))
+            span = INTERVAL_SPANS.get(interval, pd.Timedelta(days=1))
+            if pd.Timestamp(datetime.now()) - last < span:
+                self._count("skipped_fetches")
+                return 0
+
+            self._count("fetches")
+            df = self.fetcher(symbol, interval, last, period)
+            if df is None or df.empty:
+                return 0
+            records = self._to_records(df.dropna(subset=["Close"]))
+            records = records[records["timestamp"] >= last.value]
+            if len(records) == 0:
+                return 0
+
+            count = len(bars)
+            with open(path, "r+b") as f:
+                # Overwrite the possibly partial last bar and any torn trailing write.
+                # The file never shrinks, so concurrent memory maps stay valid
+                offset = count * BAR_DTYPE.itemsize
+                if records["timestamp"][0] == last.value:
+                    offset -= BAR_DTYPE.itemsize
+                    appended = len(records) - 1
+                else:
+                    appended = len(records)
+                f.seek(offset)
+                f.write(records.tobytes())
+
+            self._count("bars_appended", appended)
+            logger.debug("Stored %d new %s bars for %s", appended, interval, symbol)
+            return appended
+
+    def _replace(self, symbol: str, interval: str, period: str, path: str) -> int:
+        """Download a full period and swap it in; caller holds the file lock."""
+        self._count("fetches")
+        df = self.fetcher(symbol, interval, None, period)
+        if df is None or df.empty:
+            return 0
+        records = self._to_records(df.dropna(subset=["Close"]))
+        start = period_start(period)
+        if start is not None:
+            self._full_history[path] = start
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Readers holding a map of the old file keep seeing it until they reopen
+        partial_path = path + ".partial"
+        with open(partial_path, "wb") as f:
+            f.write(records.tobytes())
+        os.replace(partial_path, path)
+
+        self._count("bars_appended", len(records))
+        logger.debug("Stored %d %s bars for %s", len(records), interval, symbol)
+        return len(records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return read, fetch and append counters."""
+        with self._stats_lock:
+            return dict(self._stats)
@@ -0,0 +1,252 @@
+from typing import Dict, List, Optional
+from abc import ABC, abstractmethod
+from datetime import datetime
+from bisect import bisect_right
+import threading
+import logging
+import time
+import os
+import yfinance as yf
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class MarketDataProvider(ABC):
+    """Source of stock quotes behind DatabaseManager.
+
+    Quotes are dicts with ``symbol``, ``price``, ``change`` (percent),
+    ``volume`` and ``timestamp``. Providers raise when a symbol cannot be
+    priced; caching, fallbacks and rate limiting live in the caller.
+    """
+
+    name = "base"
+    # Remote providers go through the rate-limited quote engine; local ones are called directly
+    remote = True
+
+    @abstractmethod
+    def get_quote(self, symbol: str) -> Dict:
+        """Return the current quote for one symbol."""
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Return quotes for many symbols, leaving out ones that cannot be priced."""
+        quotes = {}
+        for symbol in symbols:
+            try:
+                quotes[symbol.upper()] = self.get_quote(symbol)
+            except Exception:
+                continue
+        return quotes
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    def get_quote(self, symbol: str) -> Dict:
+        """Download one quote from yfinance; raises on failure so the engine can retry."""
+        stock = yf.Ticker(symbol.upper())
+        info = stock.info
+
+        if 'regularMarketPrice' not in info:
+            raise ValueError(f"No price data available for {symbol}")
+
+        return {
+            "symbol": symbol.upper(),
+            "price": info.get('regularMarketPrice', 0.0),
+            "change": info.get('regularMarketChangePercent', 0.0),
+            "volume": info.get('regularMarketVolume', 0),
+            "timestamp": datetime.now()
+        }
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Download quotes for many symbols with a single multi-ticker yfinance request."""
+        quotes = {}
+        tickers = [symbol.upper() for symbol in symbols]
+        if not tickers:
+            return quotes
+
+        data = yf.download(
+            tickers=" ".join(tickers),
+            period="5d",
+            interval="1d",
+            group_by="ticker",
+            progress=False,
+            threads=False
+        )
+        if data is None or data.empty:
+            return quotes
+
+        for ticker in tickers:
+            try:
+                # Single-ticker downloads come back without the ticker column level
+                bars = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+                bars = bars.dropna(subset=['Close'])
+                if bars.empty:
+                    continue
+
+                price = float(bars['Close'].iloc[-1])
+                previous = float(bars['Close'].iloc[-2]) if len(bars) > 1 else price
+                quotes[ticker] = {
+                    "symbol": ticker,
+                    "price": price,
+                    "change": ((price / previous) - 1) * 100 if previous else 0.0,
+                    "volume": int(bars['Volume'].iloc[-1]),
+                    "timestamp": datetime.now()
+                }
+            except Exception as e:
+                logger.warning("Error parsing quote for %s: %s", ticker, e)
+
+        return quotes
+
+
+class FixtureProvider(MarketDataProvider):
+    name = "fixture"
+    remote = False
+
+    def __init__(self, quotes: Optional[Dict[str, Dict]] = None):
+        """Initialize an in-memory provider from ``{symbol: {"price": ..., ...}}``."""
+        self._quotes = {}
+        self._lock = threading.Lock()
+        for symbol, quote in (quotes or {}).items():
+            self.set_quote(symbol, **quote)
+
+    def set_quote(self, symbol: str, price: float, change: float = 0.0, volume: int = 0, **extra) -> None:
+        """Add or replace the quote served for a symbol."""
+        extra.pop("symbol", None)
+        with self._lock:
+            self._quotes[symbol.upper()] = {
+                "symbol": symbol.upper(),
+                "price": float(price),
+                "change": float(change),
+                "volume": int(volume),
+                **extra
+            }
+
+    def get_quote(self, symbol: str) -> Dict:
+        """Return a copy of the fixture quote for a symbol."""
+        with self._lock:
+            quote = self._quotes.get(symbol.upper())
+        if quote is None:
+            raise ValueError(f"No price data available for {symbol}")
+        return {**quote, "timestamp": quote.get("timestamp") or datetime.now()}
+
+
+class ReplayProvider(MarketDataProvider):
+    name = "replay"
+    remote = False
+
+    TAPE_COLUMNS = ["timestamp", "symbol", "price"]
+
+    def __init__(self, tape_path: str, speed: Optional[float] = 1.0, loop: bool = False):
+        """Initialize a provider that replays a recorded quote tape.
+
+        The tape is a CSV or Parquet file with ``timestamp``, ``symbol`` and
+        ``price`` columns plus optional ``change`` and ``volume``. With a
+        numeric ``speed`` the tape clock runs that many times faster than
+        wall time and each quote is the latest tick at or before the tape
+        clock. With ``speed=None`` every request for a symbol steps to its
+        next tick, which is how benchmarks drive thousands of quotes per
+        second. ``loop`` restarts the tape once it runs out.
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("Replay speed must be positive, or None for step mode")
+
+        self.tape_path = tape_path
+        self.speed = speed
+        self.loop = loop
+
+        ticks = self._load_tape(tape_path)
+        self._times: Dict[str, List[float]] = {}
+        self._ticks: Dict[str, List[Dict]] = {}
+        for row in ticks.itertuples(index=False):
+            symbol = str(row.symbol).upper()
+            timestamp = pd.Timestamp(row.timestamp)
+            self._times.setdefault(symbol, []).append(timestamp.timestamp())
+            self._ticks.setdefault(symbol, []).append({
+                "symbol": symbol,
+                "price": float(row.price),
+                "change": float(getattr(row, "change", 0.0) or 0.0),
+                "volume": int(getattr(row, "volume", 0) or 0),
+                "timestamp": timestamp.to_pydatetime()
+            })
+
+        self._tape_start = float(ticks["timestamp"].iloc[0].timestamp())
+        self._tape_end = float(ticks["timestamp"].iloc[-1].timestamp())
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def _load_tape(cls, tape_path: str) -> pd.DataFrame:
+        """Read and time-order a quote tape."""
+        if tape_path.endswith((".parquet", ".pq")):
+            # Needs pyarrow or fastparquet, which only replay users have to install
+            ticks = pd.read_parquet(tape_path)
+        else:
+            ticks = pd.read_csv(tape_path)
+
+        missing = [column for column in cls.TAPE_COLUMNS if column not in ticks.columns]
+        if missing:
+            raise ValueError(f"Quote tape {tape_path} is missing columns: {', '.join(missing)}")
+        if ticks.empty:
+            raise ValueError(f"Quote tape {tape_path} is empty")
+
+        ticks["timestamp"] = pd.to_datetime(ticks["timestamp"])
+        return ticks.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+    def reset(self) -> None:
+        """Rewind the tape to its first tick."""
+        with self._lock:
+            self._started = time.monotonic()
+            self._cursors.clear()
+
+    def _tape_clock(self) -> float:
+        """Current position on the tape, in tape epoch seconds."""
+        elapsed = (time.monotonic() - self._started) * self.speed
+        span = self._tape_end - self._tape_start
+        if self.loop and span > 0:
+            elapsed %= span
+        return self._tape_start + elapsed
+
+    def get_quote(self, symbol: str) -> Dict:
+        """Return the tick the replay clock (or step cursor) points at for a symbol."""
+        key = symbol.upper()
+        ticks = self._ticks.get(key)
+        if not ticks:
+            raise ValueError(f"No price data available for {symbol}")
+
+        if self.speed is None:
+            with self._lock:
+                index = self._cursors.get(key, 0)
+                if index >= len(ticks):
+                    if not self.loop:
+                        index = len(ticks) - 1
+                    else:
+                        index = 0
+                self._cursors[key] = index + 1
+        else:
+            index = bisect_right(self._times[key], self._tape_clock()) - 1
+            if index < 0:
+                raise ValueError(f"No {symbol} tick recorded yet at this point of the tape")
+
+        return dict(ticks[index])
+
+
+def create_provider_from_env() -> MarketDataProvider:
+    """Build the market-data provider selected by MARKET_DATA_PROVIDER."""
+    kind = os.getenv("MARKET_DATA_PROVIDER", "yfinance").lower()
+    if kind == "yfinance":
+        return YFinanceProvider()
+    if kind == "fixture":
+        return FixtureProvider()
+    if kind == "replay":
+        tape_path = os.getenv("MARKET_DATA_TAPE")
+        if not tape_path:
+            raise ValueError("MARKET_DATA_TAPE must point to a quote tape for the replay provider")
+        speed = os.getenv("MARKET_DATA_REPLAY_SPEED", "1")
+        return ReplayProvider(
+            tape_path,
+            speed=None if speed.lower() == "step" else float(speed),
+            loop=os.getenv("MARKET_DATA_REPLAY_LOOP", "false").lower() == "true"
+        )
+    raise ValueError(f"Unknown market data provider: {kind}")
@@ -0,0 +1,266 @@
+from typing import Dict, Any, Callable, Iterable, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import time
+import os
+
+
+class QuoteCache:
+    def __init__(self, capacity: int = 1024, ttl: float = 60.0, stale_ttl: float = 300.0):
+        """Initialize a bounded LRU quote cache.
+
+        Entries are fresh for ``ttl`` seconds (overridable per entry). For a
+        further ``stale_ttl`` seconds a stale entry is still served while a
+        single background refresh runs. Concurrent misses on the same symbol
+        share one in-flight fetch.
+        """
+        if capacity < 1:
+            raise ValueError("Quote cache capacity must be at least 1")
+
+        self.capacity = capacity
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._entries = OrderedDict()  # symbol -> (quote, fresh_until, stale_until)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "refreshes": 0,
+            "fetch_errors": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def _key(symbol: str) -> str:
+        return symbol.upper()
+
+    def _store(self, key: str, quote: Dict, ttl: Optional[float]) -> None:
+        """Insert an entry and evict least recently used ones; caller holds the lock."""
+        now = time.monotonic()
+        fresh_until = now + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (quote, fresh_until, fresh_until + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def set(self, symbol: str, quote: Dict, ttl: Optional[float] = None) -> None:
+        """Cache a quote, optionally with its own time-to-live."""
+        with self._lock:
+            self._store(self._key(symbol), quote, ttl)
+
+    def set_many(self, quotes: Dict[str, Dict], ttl: Optional[float] = None) -> None:
+        """Cache several quotes under a single lock acquisition."""
+        with self._lock:
+            for symbol, quote in quotes.items():
+                self._store(self._key(symbol), quote, ttl)
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Return a fresh cached quote, or None without fetching."""
+        key = self._key(symbol)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            self._stats["misses"] += 1
+            return None
+
+    def peek(self, symbol: str) -> Optional[Dict]:
+        """Return the last cached quote regardless of age, without touching stats."""
+        with self._lock:
+            entry = self._entries.get(self._key(symbol))
+            return entry[0] if entry else None
+
+    def get_or_fetch(self, symbol: str, fetcher: Callable[[str], Dict],
+                     ttl: Optional[float] = None, timeout: Optional[float] = None) -> Dict:
+        """Return a cached quote, fetching it at most once across concurrent callers.
+
+        Stale entries are returned immediately while a background refresh
+        runs. Fetch errors propagate to every caller waiting on that fetch.
+        """
+        key = self._key(symbol)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now < entry[1]:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+
+            if entry and now < entry[2]:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self._inflight[key] = Future()
+                    self._stats["refreshes"] += 1
+                    threading.Thread(
+                        target=self._run_fetch, args=(key, fetcher, ttl), daemon=True
+                    ).start()
+                return entry[0]
+
+            self._stats["misses"] += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                owner = False
+            else:
+                future = self._inflight[key] = Future()
+                owner = True
+
+        if owner:
+            self._run_fetch(key, fetcher, ttl)
+        return future.result(timeout)
+
+    def get_or_fetch_many(self, symbols: Iterable[str],
+                          batch_fetcher: Callable[[List[str]], Dict[str, Dict]],
+                          ttl: Optional[float] = None,
+                          timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """Return quotes for many symbols, fetching all misses in one batch call.
+
+        Symbols already being fetched by another caller are awaited rather than
+        refetched, and stale entries are served while one background batch
+        refreshes them. Symbols the fetcher could not price are left out of
+        the result.
+        """
+        results: Dict[str, Dict] = {}
+        owned: List[str] = []
+        stale: List[str] = []
+        waiting: Dict[str, Future] = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for symbol in symbols:
+                key = self._key(symbol)
+                if key in results or key in waiting or key in owned:
+                    continue
+                entry = self._entries.get(key)
+                if entry and now < entry[1]:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    results[key] = entry[0]
+                elif entry and now < entry[2]:
+                    self._entries.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    results[key] = entry[0]
+                    if key not in self._inflight:
+                        self._inflight[key] = Future()
+                        stale.append(key)
+                elif key in self._inflight:
+                    self._stats["misses"] += 1
+                    self._stats["coalesced"] += 1
+                    waiting[key] = self._inflight[key]
+                else:
+                    self._stats["misses"] += 1
+                    self._inflight[key] = Future()
+                    owned.append(key)
+
+            if stale:
+                self._stats["refreshes"] += len(stale)
+
+        if owned:
+            # Stale symbols ride along with the misses instead of a second request
+            results.update(self._run_batch_fetch(owned + stale, batch_fetcher, ttl))
+        elif stale:
+            threading.Thread(
+                target=self._run_batch_fetch, args=(stale, batch_fetcher, ttl), daemon=True
+            ).start()
+
+        for key, future in waiting.items():
+            try:
+                results[key] = future.result(timeout)
+            except Exception:
+                pass
+
+        return results
+
+    def _run_batch_fetch(self, keys: List[str],
+                         batch_fetcher: Callable[[List[str]], Dict[str, Dict]],
+                         ttl: Optional[float]) -> Dict[str, Dict]:
+        """Fetch in-flight keys with one batch call and resolve their waiters."""
+        with self._lock:
+            futures = {key: self._inflight[key] for key in keys}
+            self._stats["fetches"] += 1
+        try:
+            fetched = {self._key(symbol): quote for symbol, quote in batch_fetcher(keys).items()}
+            error = None
+        except Exception as e:
+            fetched = {}
+            error = e
+
+        with self._lock:
+            for key in keys:
+                if key in fetched:
+                    self._store(key, fetched[key], ttl)
+                else:
+                    self._stats["fetch_errors"] += 1
+                del self._inflight[key]
+
+        for key, future in futures.items():
+            if key in fetched:
+                future.set_result(fetched[key])
+            else:
+                future.set_exception(error or KeyError(f"No quote returned for {key}"))
+        return fetched
+
+    def _run_fetch(self, key: str, fetcher: Callable[[str], Dict], ttl: Optional[float]) -> None:
+        """Fetch a quote for an in-flight key and resolve its waiters."""
+        with self._lock:
+            future = self._inflight[key]
+            self._stats["fetches"] += 1
+        try:
+            quote = fetcher(key)
+        except BaseException as e:
+            with self._lock:
+                self._stats["fetch_errors"] += 1
+                del self._inflight[key]
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._store(key, quote, ttl)
+            del self._inflight[key]
+        future.set_result(quote)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop one symbol, or everything when no symbol is given."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(symbol), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit, miss and coalesce counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["capacity"] = self.capacity
+            stats["inflight"] = len(self._inflight)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_quote_cache() -> QuoteCache:
+    """Return the process-wide quote cache, configured from the environment."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = QuoteCache(
+                capacity=int(os.getenv("QUOTE_CACHE_CAPACITY", "1024")),
+                ttl=float(os.getenv("QUOTE_CACHE_TTL", "60")),
+                stale_ttl=float(os.getenv("QUOTE_CACHE_STALE_TTL", "300"))
+            )
+        return _shared_cache
@@ -0,0 +1,242 @@
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import asyncio
+import threading
+import random
+import time
+import os
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a market-data call cannot finish before its deadline."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """Initialize a token bucket refilled at ``rate`` tokens per second."""
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Invalid token bucket: rate={rate}, capacity={capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0, deadline: Optional[float] = None) -> float:
+        """Wait for tokens without blocking the event loop; returns the time waited."""
+        start = time.monotonic()
+        # The lock keeps waiters in FIFO order so bursts drain fairly
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return time.monotonic() - start
+                wait = (tokens - self._tokens) / self.rate
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise DeadlineExceeded("Rate limit wait would exceed the request deadline")
+                await asyncio.sleep(wait)
+
+
+class QuoteEngine:
+    def __init__(self, rate: float = 2.0, burst: int = 5, max_concurrency: int = 4,
+                 max_retries: int = 3, backoff_base: float = 0.5, default_timeout: float = 15.0,
+                 retry_on: Tuple[type, ...] = (Exception,)):
+        """Initialize an asyncio market-data engine.
+
+        Provider calls are admitted by a token bucket (``rate`` calls per
+        second, bursts of ``burst``), at most ``max_concurrency`` run at
+        once, and failures are retried with jittered exponential backoff
+        only while the retry can still finish before the call's deadline.
+        """
+        if max_concurrency < 1 or max_retries < 1:
+            raise ValueError("Quote engine needs at least one worker and one attempt")
+
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.default_timeout = default_timeout
+        self.retry_on = retry_on
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._bucket: Optional[TokenBucket] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "deadline_exceeded": 0,
+            "cancelled": 0,
+            "throttle_wait_time": 0.0,
+        }
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def start(self) -> None:
+        """Start the background event loop that backs the sync facade."""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="quote-engine"
+            )
+            self._thread = threading.Thread(target=run, name="quote-engine-loop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+
+            async def init_primitives():
+                # Created on the engine loop so they bind to it
+                self._bucket = TokenBucket(self.rate, self.burst)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            asyncio.run_coroutine_threadsafe(init_primitives(), loop).result()
+
+    async def fetch(self, fetcher: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Run a blocking provider call under rate limiting, concurrency and retry policy.
+
+        Must be awaited on the engine loop (the sync facade does this);
+        cancelling the awaiting task abandons any pending wait or retry.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        self._count("calls")
+        last_error = None
+
+        try:
+            for attempt in range(self.max_retries):
+                waited = await self._bucket.acquire(deadline=deadline)
+                self._count("throttle_wait_time", waited)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"Deadline exceeded before calling {getattr(fetcher, '__name__', fetcher)}")
+
+                async with self._semaphore:
+                    self._count("attempts")
+                    try:
+                        call = self._loop.run_in_executor(self._executor, fetcher, *args)
+                        return await asyncio.wait_for(call, remaining)
+                    except asyncio.TimeoutError:
+                        raise DeadlineExceeded(f"Provider call timed out after {timeout:.1f}s")
+                    except self.retry_on as e:
+                        last_error = e
+
+                if attempt == self.max_retries - 1:
+                    break
+                backoff = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+                if time.monotonic() + backoff >= deadline:
+                    break
+                self._count("retries")
+                await asyncio.sleep(backoff)
+
+            self._count("failures")
+            raise last_error
+        except DeadlineExceeded:
+            self._count("deadline_exceeded")
+            raise
+        except asyncio.CancelledError:
+            self._count("cancelled")
+            raise
+
+    async def fetch_all(self, calls: List[Tuple[Callable, tuple]],
+                        timeout: Optional[float] = None) -> List[Any]:
+        """Run several provider calls concurrently; failures are returned as exceptions."""
+        return await asyncio.gather(
+            *(self.fetch(fetcher, *args, timeout=timeout) for fetcher, args in calls),
+            return_exceptions=True
+        )
+
+    def _run_sync(self, coro, timeout: float) -> Any:
+        """Run a coroutine on the engine loop, cancelling it if the caller gives up."""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            # Small grace period so the coroutine's own deadline fires first
+            return future.result(timeout + 1.0)
+        except FutureTimeoutError:
+            future.cancel()
+            self._count("deadline_exceeded")
+            raise DeadlineExceeded(f"Market-data request timed out after {timeout:.1f}s")
+        except BaseException:
+            future.cancel()
+            raise
+
+    def fetch_sync(self, fetcher: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Blocking facade over fetch() for synchronous callers such as DatabaseManager."""
+        timeout = self.default_timeout if timeout is None else timeout
+        return self._run_sync(self.fetch(fetcher, *args, timeout=timeout), timeout)
+
+    def fetch_all_sync(self, calls: List[Tuple[Callable, tuple]],
+                       timeout: Optional[float] = None) -> List[Any]:
+        """Blocking facade over fetch_all()."""
+        timeout = self.default_timeout if timeout is None else timeout
+        return self._run_sync(self.fetch_all(calls, timeout=timeout), timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return call, retry, throttling and cancellation counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+        })
+        return stats
+
+    def close(self) -> None:
+        """Cancel outstanding calls and stop the background loop."""
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+            if loop is None:
+                return
+
+            def shutdown():
+                for task in asyncio.all_tasks(loop):
+                    task.cancel()
+                loop.stop()
+
+            loop.call_soon_threadsafe(shutdown)
+            self._thread.join(timeout=5)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared_engine = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_quote_engine() -> QuoteEngine:
+    """Return the process-wide quote engine so every caller shares one provider quota."""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = QuoteEngine(
+                rate=float(os.getenv("QUOTE_RATE_LIMIT", "2")),
+                burst=int(os.getenv("QUOTE_RATE_BURST", "5")),
+                max_concurrency=int(os.getenv("QUOTE_MAX_CONCURRENCY", "4")),
+                max_retries=int(os.getenv("QUOTE_MAX_RETRIES", "3")),
+                default_timeout=float(os.getenv("QUOTE_TIMEOUT", "15"))
+            )
+        return _shared_engine
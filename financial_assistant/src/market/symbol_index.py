@@ -0,0 +1,282 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from collections import Counter
+from bisect import bisect_left
+import threading
+import logging
+import heapq
+import csv
+import re
+import os
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "symbols.csv")
+
+# Exchange implied by a ticker suffix, and which listing a bare ticker or
+# company name means when a company trades on several
+EXCHANGE_SUFFIXES = {".NS": "NSE", ".BO": "BSE"}
+EXCHANGE_PREFERENCE = ("US", "NSE", "BSE")
+
+# Dropped from company names before matching, so "Apple Inc." is "apple"
+NAME_STOPWORDS = {
+    "inc", "corp", "corporation", "co", "company", "ltd", "limited", "plc",
+    "group", "holdings", "the", "class", "com", "and",
+}
+
+# Words never read as a ticker or a company name on their own, in any case
+COMMON_WORDS = {
+    "a", "i", "an", "the", "and", "or", "of", "to", "in", "on", "at", "by", "for", "with", "from",
+    "is", "it", "be", "are", "am", "was", "do", "so", "go", "me", "my", "we", "us", "you", "he",
+    "all", "any", "now", "new", "one", "two", "can", "see", "out", "up", "down", "big", "low",
+    "buy", "sell", "hold", "some", "more", "much", "many", "how", "what", "why", "who", "when",
+    "share", "shares", "stock", "stocks", "price", "quote", "order", "please", "then", "also",
+    "want", "like", "get", "got", "should", "would", "could", "today", "target", "well", "good",
+    "best", "next", "last", "hi", "hey", "ok", "yes", "no", "not",
+}
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+(?:[.&'-][A-Za-z0-9]+)*")
+NAME_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class SymbolInfo(NamedTuple):
+    symbol: str
+    name: str
+    exchange: str
+    sector: str
+
+
+def exchange_of(symbol: str) -> str:
+    """Exchange implied by a ticker's suffix; unsuffixed tickers are US listings."""
+    for suffix, exchange in EXCHANGE_SUFFIXES.items():
+        if symbol.endswith(suffix):
+            return exchange
+    return "US"
+
+
+def name_words(text: str) -> List[str]:
+    """Lower-cased words of a company name or free text, without corporate suffixes."""
+    words = NAME_WORD_PATTERN.findall(text.lower().replace("'", ""))
+    return [word for word in words if word not in NAME_STOPWORDS]
+
+
+def _trigrams(name: str) -> set:
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolIndex:
+    def __init__(self, entries: Iterable[SymbolInfo]):
+        """Build in-memory lookups over a symbol universe.
+
+        Exact tickers (with exchange suffixes such as .NS or .BO) resolve
+        with one dictionary lookup, as do bare tickers and company names,
+        which map to their preferred listing. Prefix search bisects sorted
+        ticker and name lists; fuzzy name search scores candidates from a
+        trigram inverted index; ``extract`` finds every ticker and company
+        name in free text with one lookup per word. Nothing here touches
+        the network.
+        """
+        rank = {exchange: i for i, exchange in enumerate(EXCHANGE_PREFERENCE)}
+        self._entries: Dict[str, SymbolInfo] = {}
+        for info in entries:
+            self._entries.setdefault(info.symbol.upper(), info)
+
+        self._by_base: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._sectors: Dict[str, List[SymbolInfo]] = {}
+        preferred = sorted(self._entries.values(), key=lambda info: rank.get(info.exchange, len(rank)))
+        for info in preferred:
+            self._by_base.setdefault(info.symbol.split(".")[0], info.symbol)
+            for alias in self._name_aliases(info.name):
+                self._aliases.setdefault(alias, info.symbol)
+            self._sectors.setdefault(info.sector, []).append(info)
+        self._max_alias_words = max((alias.count(" ") + 1 for alias in self._aliases), default=0)
+
+        self._tickers = sorted(self._entries)
+        self._names: List[Tuple[str, str]] = sorted(self._aliases.items())
+
+        self._alias_list = list(self._aliases.items())
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        for i, (alias, _) in enumerate(self._alias_list):
+            grams = _trigrams(alias)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    @staticmethod
+    def _name_aliases(name: str) -> List[str]:
+        """The name without corporate suffixes, plus any parenthesized former or brand name."""
+        aliases = []
+        for part in re.split(r"[()]", name):
+            words = name_words(part)
+            if words and not (len(words) == 1 and words[0] in COMMON_WORDS):
+                aliases.append(" ".join(words))
+        return aliases
+
+    @classmethod
+    def from_csv(cls, path: str) -> "SymbolIndex":
+        """Load a universe from a CSV with symbol, name, exchange and sector columns."""
+        entries = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                symbol = (row.get("symbol") or "").strip().upper()
+                if not symbol:
+                    continue
+                entries.append(SymbolInfo(
+                    symbol=symbol,
+                    name=(row.get("name") or symbol).strip(),
+                    exchange=(row.get("exchange") or exchange_of(symbol)).strip().upper(),
+                    sector=(row.get("sector") or "Other").strip()
+                ))
+        index = cls(entries)
+        logger.info("Loaded %d symbols from %s", len(index), path)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[SymbolInfo]:
+        return iter(self._entries.values())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._entries
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        """Details of an exact ticker, suffix included."""
+        return self._entries.get(symbol.upper())
+
+    def _ticker(self, token: str, strict: bool) -> Optional[str]:
+        if token.lower() in COMMON_WORDS:
+            return None
+        # In free text only upper case marks a short word as a ticker
+        if strict and len(token) <= 2 and not token.isupper():
+            return None
+        upper = token.upper()
+        if upper in self._entries:
+            return upper
+        return self._by_base.get(upper)
+
+    def resolve(self, token: str, strict: bool = False) -> Optional[str]:
+        """Canonical symbol for a ticker, bare ticker or company name, or None.
+
+        ``strict`` applies the free-text rules: one- and two-letter tickers
+        must be written in upper case.
+        """
+        symbol = self._ticker(token, strict)
+        if symbol is None:
+            key = token.lower()
+            symbol = self._aliases.get(key)
+            if symbol is None and not key.isalnum():
+                symbol = self._aliases.get(" ".join(name_words(token)))
+        return symbol
+
+    def match_name(self, tokens: Sequence[str]) -> Tuple[Optional[str], int]:
+        """Longest company name spanning two or more of the leading ``tokens``.
+
+        Returns the symbol and how many tokens the name used, or (None, 0);
+        single tokens are left to ``resolve``.
+        """
+        words: List[str] = []
+        ends = []
+        for token in tokens[:self._max_alias_words]:
+            words.extend(name_words(token))
+            ends.append(len(words))
+        for n in range(len(ends), 1, -1):
+            symbol = self._aliases.get(" ".join(words[:ends[n - 1]]))
+            if symbol is not None:
+                return symbol, n
+        return None, 0
+
+    def extract(self, text: str) -> List[str]:
+        """Every symbol named in free text, by ticker or company name, in order of appearance."""
+        found: Dict[str, int] = {}
+        for match in TOKEN_PATTERN.finditer(text):
+            symbol = self._ticker(match.group(), strict=True)
+            if symbol is not None:
+                found.setdefault(symbol, match.start())
+
+        # Longest company name starting at each word wins
+        words = [
+            (match.group(), match.start())
+            for match in NAME_WORD_PATTERN.finditer(text.lower().replace("'", ""))
+            if match.group() not in NAME_STOPWORDS
+        ]
+        i = 0
+        while i < len(words):
+            for n in range(min(self._max_alias_words, len(words) - i), 0, -1):
+                symbol = self._aliases.get(" ".join(word for word, _ in words[i:i + n]))
+                if symbol is not None:
+                    found.setdefault(symbol, words[i][1])
+                    i += n
+                    break
+            else:
+                i += 1
+        return sorted(found, key=found.get)
+
+    def search_prefix(self, text: str, limit: int = 10) -> List[SymbolInfo]:
+        """Listings whose ticker or company name starts with ``text``, tickers first."""
+        results: Dict[str, SymbolInfo] = {}
+        upper = text.strip().upper()
+        if upper:
+            # Walk by position; slicing would copy the rest of the list
+            i = bisect_left(self._tickers, upper)
+            while i < len(self._tickers) and len(results) < limit and self._tickers[i].startswith(upper):
+                results[self._tickers[i]] = self._entries[self._tickers[i]]
+                i += 1
+
+        name = " ".join(name_words(text))
+        if name:
+            i = bisect_left(self._names, (name, ""))
+            while i < len(self._names) and len(results) < limit and self._names[i][0].startswith(name):
+                symbol = self._names[i][1]
+                results.setdefault(symbol, self._entries[symbol])
+                i += 1
+        return list(results.values())
+
+    def search_name(self, text: str, limit: int = 10, cutoff: float = 0.3) -> List[Tuple[SymbolInfo, float]]:
+        """Company names most similar to ``text`` by trigram overlap, with their scores."""
+        grams = _trigrams(" ".join(name_words(text)))
+        hits = Counter()
+        for gram in grams:
+            hits.update(self._postings.get(gram, ()))
+
+        scored = (
+            (2 * shared / (len(grams) + self._gram_counts[i]), i)
+            for i, shared in hits.items()
+        )
+        results: Dict[str, Tuple[SymbolInfo, float]] = {}
+        for score, i in heapq.nlargest(limit * 2, scored):
+            symbol = self._alias_list[i][1]
+            if score >= cutoff and symbol not in results:
+                results[symbol] = (self._entries[symbol], score)
+        return list(results.values())[:limit]
+
+    def search(self, text: str, limit: int = 10) -> List[SymbolInfo]:
+        """Exact and prefix matches first, then fuzzy company-name matches."""
+        results = {info.symbol: info for info in self.search_prefix(text, limit)}
+        symbol = self.resolve(text)
+        if symbol is not None:
+            results = {symbol: self._entries[symbol], **results}
+        for info, _ in self.search_name(text, limit):
+            if len(results) >= limit:
+                break
+            results.setdefault(info.symbol, info)
+        return list(results.values())[:limit]
+
+    def sectors(self) -> Dict[str, List[SymbolInfo]]:
+        """Listings grouped by sector, preferred exchanges first."""
+        return self._sectors
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_symbol_index() -> SymbolIndex:
+    """Return the process-wide symbol universe, loaded from SYMBOL_UNIVERSE_PATH."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = SymbolIndex.from_csv(os.getenv("SYMBOL_UNIVERSE_PATH", DEFAULT_PATH))
+        return _shared_index
@@ -8,7 +8,8 @@ from src.database.database_manager import DatabaseManager
 class FinanceAgentTester:
     def __init__(self):
         self.agent = FinanceAgent()
-        self.db = DatabaseManager()
+        # Share the agent's connection pool, caches and query stats
+        self.db = self.agent.db
         self.current_user: Optional[str] = None
         self.clear_screen()
 
@@ -34,8 +35,8 @@ class FinanceAgentTester:
         print("2. create <email> <password> <account_number> - Create new account")
         print("3. portfolio - View your portfolio")
         print("4. quote <symbol> - Get stock quote")
-        print("5. buy <symbol> <shares> - Buy stocks")
-        print("6. sell <symbol> <shares> - Sell stocks")
+        print("5. buy <symbol> <shares> [<symbol> <shares> ...] - Buy stocks")
+        print("6. sell <symbol> <shares> [<symbol> <shares> ...] - Sell stocks")
         print("7. watch <symbol> - Add to watchlist")
         print("8. watchlist - View watchlist")
         print("9. balance - Check balance")
@@ -43,6 +44,9 @@ class FinanceAgentTester:
         print("11. chat <message> - Chat with agent")
         print("12. clear - Clear screen")
         print("13. exit - Exit application")
+        print("14. stats - Show database latency and pool stats")
+        print("15. symbols - List supported symbols by sector")
+        print("16. search <name> - Find a symbol by ticker or company name")
         print("\nOr just type your question naturally!\n")
 
     def handle_login(self, email: str, password: str):
@@ -50,7 +54,7 @@ class FinanceAgentTester:
         result = self.db.validate_login(email, password)
         if result["status"] == "success":
             self.current_user = result["data"]["account_number"]
-            self.agent.set_current_user(self.current_user)
+            self.agent.set_current_user(self.current_user, result["data"]["session_token"])
             print(f"✅ Logged in successfully! Balance: ${result['data']['balance']:.2f}")
         else:
             print(f"❌ {result['message']}")
@@ -64,6 +68,13 @@ class FinanceAgentTester:
         })
         print(f"{'✅' if result['status'] == 'success' else '❌'} {result['message']}")
 
+    def print_stream(self, message: str):
+        """Print the agent's reply token by token as it is generated."""
+        print("\n🤖 Agent: ", end="", flush=True)
+        for chunk in self.agent.process_request_stream(message):
+            print(chunk, end="", flush=True)
+        print()
+
     def handle_command(self, command: str):
         """Parse and handle user commands."""
         try:
@@ -81,27 +92,39 @@ class FinanceAgentTester:
             elif cmd == 'portfolio':
                 print(self.agent.get_portfolio_summary())
             elif cmd == 'quote' and len(parts) == 2:
-                quote = self.db.get_real_time_quote(parts[1].upper())
+                symbol = self.agent.symbols.resolve(parts[1])
+                if symbol is None:
+                    print(f"❌ Unknown symbol: {parts[1]}. Try 'search <company name>'.")
+                    return True
+                quote = self.db.get_real_time_quote(symbol)
                 print(f"\n📈 {quote['symbol']} Quote:")
                 print(f"Price: ${quote['price']:.2f}")
                 print(f"Change: {quote['change']:.2f}%")
                 print(f"Volume: {quote['volume']:,}")
             elif cmd == 'buy' and len(parts) >= 3:
-                response = self.agent.process_request(f"buy {parts[2]} shares of {parts[1]}")
+                # Several symbols in one command are handed over as a basket order
+                order = command if len(parts) > 3 else f"buy {parts[2]} shares of {parts[1]}"
+                response = self.agent.process_request(order)
                 print(response)
                 if "confirm" in response.lower():
                     confirm = input("\nConfirm trade (yes/no): ").lower()
                     if confirm in ['yes', 'y']:
                         print(self.agent.confirm_operation())
             elif cmd == 'sell' and len(parts) >= 3:
-                response = self.agent.process_request(f"sell {parts[2]} shares of {parts[1]}")
+                # Several symbols in one command are handed over as a basket order
+                order = command if len(parts) > 3 else f"sell {parts[2]} shares of {parts[1]}"
+                response = self.agent.process_request(order)
                 print(response)
                 if "confirm" in response.lower():
                     confirm = input("\nConfirm trade (yes/no): ").lower()
                     if confirm in ['yes', 'y']:
                         print(self.agent.confirm_operation())
             elif cmd == 'watch' and len(parts) == 2:
-                result = self.db.add_to_watchlist(self.current_user, parts[1].upper())
+                symbol = self.agent.symbols.resolve(parts[1])
+                if symbol is None:
+                    print(f"❌ Unknown symbol: {parts[1]}. Try 'search <company name>'.")
+                    return True
+                result = self.db.add_to_watchlist(self.current_user, symbol)
                 print(f"{'✅' if result['status'] == 'success' else '❌'} {result['message']}")
             elif cmd == 'watchlist':
                 watchlist = self.db.get_watchlist(self.current_user)
@@ -114,19 +137,61 @@ class FinanceAgentTester:
             elif cmd == 'deposit' and len(parts) == 2:
                 try:
                     amount = float(parts[1])
-                    # Simple deposit implementation - you might want to add proper transaction handling
-                    self.db.execute_query(
-                        "UPDATE users SET balance = balance + %s WHERE account_number = %s",
-                        (amount, self.current_user),
-                        fetch=False
-                    )
-                    print(f"✅ Deposited ${amount:.2f} successfully")
+                    result = self.db.deposit(self.current_user, amount)
+                    print(f"{'✅' if result['status'] == 'success' else '❌'} {result['message']}")
                 except ValueError:
                     print("❌ Invalid amount")
             elif cmd == 'chat':
-                message = ' '.join(parts[1:])
-                response = self.agent.process_request(message)
-                print(f"\n🤖 Agent: {response}")
+                self.print_stream(' '.join(parts[1:]))
+            elif cmd == 'stats':
+                print("\n⏱️ Query Latency:")
+                print(self.db.dump_query_stats())
+                pool = self.db.get_pool_stats()
+                print(
+                    f"\n🔌 Pool: {pool['in_use']}/{pool['max_size']} in use, "
+                    f"avg wait {pool['avg_wait_time'] * 1000:.1f} ms, "
+                    f"max wait {pool['max_wait_time'] * 1000:.1f} ms, timeouts {pool['timeouts']}"
+                )
+                replicas = self.db.get_replica_stats()
+                if replicas:
+                    print(
+                        f"📚 Reads: {replicas['replica_reads']} replica, {replicas['primary_reads']} primary "
+                        f"({replicas['sticky_reads']} sticky), {replicas['fallbacks']} fallbacks"
+                    )
+                accounts = self.db.get_account_cache_stats()
+                if accounts:
+                    print(
+                        f"🗂️ Account cache: {accounts['hit_rate']:.0%} hit rate, {accounts['size']} entries, "
+                        f"{accounts['invalidations']} invalidations"
+                    )
+                chat = self.db.get_chat_writer_stats()
+                print(
+                    f"💬 Chat history: {chat['written']} written in {chat['batches']} batches, "
+                    f"{chat['queued']} queued, {chat['dropped']} dropped, {chat['failed']} failed"
+                )
+                responses = self.agent.response_cache.get_stats()
+                print(
+                    f"🧠 LLM response cache: {responses['hit_rate']:.0%} hit rate, {responses['size']} entries, "
+                    f"{responses['bypassed']} bypassed"
+                )
+                llm = self.agent.llm_scheduler.get_stats()
+                print(
+                    f"🚦 LLM queue: {llm['queue_depth']} waiting, {llm['in_flight']}/{llm['parallelism']} running, "
+                    f"wait p50 {llm['wait_p50_ms']:.0f}ms / p95 {llm['wait_p95_ms']:.0f}ms, "
+                    f"{llm['coalesced']} coalesced, {llm['rejected'] + llm['shed']} turned away, {llm['expired']} expired"
+                )
+                sessions = self.agent.sessions.get_stats()
+                print(
+                    f"👥 Agent sessions: {sessions['active']} active, {sessions['created']} created, "
+                    f"{sessions['expired']} expired, {sessions['evicted']} evicted"
+                )
+                context = self.agent.last_context_report
+                if context:
+                    dropped = ", ".join(f"{count} {kind}" for kind, count in context['dropped'].items())
+                    print(
+                        f"📝 Last prompt context: {context['tokens']}/{context['budget']} tokens"
+                        + (f", omitted {dropped}" if dropped else "")
+                    )
             elif cmd == 'clear':
                 self.clear_screen()
                 self.print_header()
@@ -134,8 +199,7 @@ class FinanceAgentTester:
                 return False
             else:
                 # Treat as natural language query
-                response = self.agent.process_request(command)
-                print(f"\n🤖 Agent: {response}")
+                self.print_stream(command)
 
         except Exception as e:
             print(f"❌ Error: {str(e)}")
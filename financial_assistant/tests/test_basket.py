@@ -0,0 +1,54 @@
+import pytest
+from src.database.basket import parse_orders, apply_basket
+
+
+def test_parse_orders_normalizes_legs():
+    legs = parse_orders([
+        {"trade_type": "buy", "symbol": "aapl", "shares": "10", "price": "150.5"},
+        {"trade_type": "SELL", "symbol": "msft", "shares": 2, "price": 400},
+    ])
+    assert legs == [("BUY", "AAPL", 10, 150.5), ("SELL", "MSFT", 2, 400.0)]
+
+
+@pytest.mark.parametrize("orders, message", [
+    ([], "No orders to execute"),
+    ([{"trade_type": "HOLD", "symbol": "AAPL", "shares": 1, "price": 1}], "Unsupported trade type: HOLD"),
+    ([{"trade_type": "BUY", "symbol": "AAPL", "shares": 0, "price": 1}], "Number of shares must be positive."),
+    ([{"trade_type": "SELL", "symbol": "AAPL", "shares": -3, "price": 1}], "Number of shares must be positive."),
+])
+def test_parse_orders_rejects(orders, message):
+    with pytest.raises(ValueError) as error:
+        parse_orders(orders)
+    assert str(error.value) == message
+
+
+def test_apply_basket_buys_average_in_and_spend_cash():
+    positions = {"AAPL": [10, 100.0]}
+    cash_delta = apply_basket([("BUY", "AAPL", 10, 200.0), ("BUY", "MSFT", 2, 50.0)], 5000.0, positions)
+    assert cash_delta == -2100.0
+    assert positions == {"AAPL": [20, 150.0], "MSFT": [2, 50.0]}
+
+
+def test_apply_basket_sells_fund_buys_in_the_same_basket():
+    positions = {"AAPL": [10, 100.0]}
+    cash_delta = apply_basket([("SELL", "AAPL", 10, 120.0), ("BUY", "MSFT", 3, 400.0)], 0.0, positions)
+    assert cash_delta == 0.0
+    # A closed position keeps its entry so the caller can delete it
+    assert positions == {"AAPL": [0, 100.0], "MSFT": [3, 400.0]}
+
+
+def test_apply_basket_rejects_short_positions():
+    positions = {"AAPL": [5, 100.0]}
+    with pytest.raises(ValueError) as error:
+        apply_basket([("SELL", "AAPL", 8, 100.0), ("SELL", "MSFT", 1, 10.0)], 0.0, positions)
+    assert str(error.value) == (
+        "Insufficient shares for this basket.\n"
+        "AAPL: short by 3 shares\n"
+        "MSFT: short by 1 shares"
+    )
+
+
+def test_apply_basket_rejects_overspending():
+    with pytest.raises(ValueError) as error:
+        apply_basket([("BUY", "AAPL", 10, 150.0)], 1000.0, {})
+    assert str(error.value) == "Insufficient funds for this basket.\nRequired: $1500.00\nAvailable: $1000.00"
@@ -0,0 +1,125 @@
+import pytest
+from src.agent.intent_router import IntentRouter
+from src.market.symbol_index import get_shared_symbol_index
+
+# (query, expected intent, expected slots; None skips the slot check)
+CORPUS = [
+    ("buy AAPL 10", "trade", {"action": "BUY", "symbol": "AAPL", "shares": 10}),
+    ("buy 10 shares of aapl", "trade", {"action": "BUY", "symbol": "AAPL", "shares": 10}),
+    ("sell 5 shares of MSFT", "trade", {"action": "SELL", "symbol": "MSFT", "shares": 5}),
+    ("Sell TSLA 3", "trade", {"action": "SELL", "symbol": "TSLA", "shares": 3}),
+    ("buy AAPL", "trade", {"action": "BUY", "symbol": "AAPL", "shares": None}),
+    ("buy 10", "trade", {"action": "BUY", "symbol": None, "shares": 10}),
+    ("hi, buy nvda 2", "trade", {"action": "BUY", "symbol": "NVDA", "shares": 2}),
+    ("buy AAPL 10 MSFT 5 and sell 3 TSLA", "trade", None),
+    ("buy AAPL 10 MSFT", "trade", {"action": "BUY", "symbol": "AAPL", "shares": 10}),
+    ("sell 3 TSLA and buy AAPL", "trade", {"action": "SELL", "symbol": "TSLA", "shares": 3}),
+    ("buy AAPL MSFT", "trade", {"action": "BUY", "symbol": "AAPL", "shares": None}),
+    ("should I sell my position?", "llm", {}),
+    ("Is it a good time to buy?", "llm", {}),
+    ("should I sell now?", "llm", {}),
+    ("what caused the sell-off in tech?", "llm", {}),
+    ("hi, what caused the sell-off?", "greeting", {}),
+    ("buy-back AAPL", "llm", {}),
+    ("re-buy AAPL 10", "llm", {}),
+    ("buy-side analyst", "llm", {}),
+    ("I want to buy. AAPL 10", "trade", {"action": "BUY", "symbol": "AAPL", "shares": 10}),
+    ("hi", "greeting", {}),
+    ("Hello there", "greeting", {}),
+    ("hey, how's the market today?", "greeting", {}),
+    ("how are you", "how_are_you", {}),
+    ("how's it going?", "how_are_you", {}),
+    ("thanks!", "thanks", {}),
+    ("thank you so much", "thanks", {}),
+    ("bye", "goodbye", {}),
+    ("ok goodbye", "goodbye", {}),
+    ("how is the market doing", "market_summary", {}),
+    ("what's the market like", "market_summary", {}),
+    ("market overview please", "market_summary", {}),
+    ("give me a market analysis", "market_summary", {}),
+    ("balance", "command", {"command": "balance"}),
+    ("  My Balance ", "command", {"command": "balance"}),
+    ("check balance", "command", {"command": "balance"}),
+    ("portfolio", "command", {"command": "portfolio"}),
+    ("show portfolio", "command", {"command": "portfolio"}),
+    ("watchlist", "command", {"command": "watchlist"}),
+    ("my watchlist", "command", {"command": "watchlist"}),
+    ("help", "command", {"command": "help"}),
+    ("add googl to watchlist", "watch_add", {"symbol": "GOOGL"}),
+    ("watch AMZN", "watch_add", {"symbol": "AMZN"}),
+    ("please watch meta", "watch_add", {"symbol": "META"}),
+    ("remove amzn from watchlist", "watch_remove", {"symbol": "AMZN"}),
+    ("unwatch META", "watch_remove", {"symbol": "META"}),
+    ("quote AAPL", "quote", {"symbol": "AAPL"}),
+    ("quote jpm", "quote", {"symbol": "JPM"}),
+    ("quote reliance", "quote", {"symbol": "RELIANCE.NS"}),
+    ("watch TCS.BO", "watch_add", {"symbol": "TCS.BO"}),
+    ("buy 5 INFY.NS", "trade", {"action": "BUY", "symbol": "INFY.NS", "shares": 5}),
+    ("buy 3 shares of apple", "trade", {"action": "BUY", "symbol": "AAPL", "shares": 3}),
+    ("buy 10 shares of tata motors", "trade", {"action": "BUY", "symbol": "TATAMOTORS.NS", "shares": 10}),
+    ("sell 5 bank of america", "trade", {"action": "SELL", "symbol": "BAC", "shares": 5}),
+    ("buy tata consultancy services 2", "trade", {"action": "BUY", "symbol": "TCS.NS", "shares": 2}),
+    ("I BUY 2 F", "trade", {"action": "BUY", "symbol": "F", "shares": 2}),
+    ("buy -5 AAPL", "trade", {"action": "BUY", "symbol": "AAPL", "shares": -5}),
+    ("sell AAPL -3", "trade", {"action": "SELL", "symbol": "AAPL", "shares": -3}),
+    ("buy 0 AAPL", "trade", {"action": "BUY", "symbol": "AAPL", "shares": 0}),
+    ("buy 10-K AAPL", "trade", {"action": "BUY", "symbol": "AAPL", "shares": None}),
+    ("symbols", "command", {"command": "symbols"}),
+    ("search tata", "symbol_search", {"text": "tata"}),
+    ("explain the P/E ratio", "llm", {}),
+    ("what is a stop loss", "llm", {}),
+    ("should I diversify into bonds?", "llm", {}),
+    ("compare apple and microsoft earnings", "llm", {}),
+    ("is this a good time to hold cash", "llm", {}),
+    ("tell me about dividend investing", "llm", {}),
+    ("show my portfolio performance this year", "llm", {}),
+]
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(get_shared_symbol_index())
+
+
+@pytest.mark.parametrize("query, expected_intent, expected_slots", CORPUS, ids=[query for query, _, _ in CORPUS])
+def test_route(router, query, expected_intent, expected_slots):
+    intent = router.route(query)
+    assert intent.name == expected_intent
+    if expected_slots is not None:
+        assert {key: intent.slots.get(key) for key in expected_slots} == expected_slots
+
+
+def test_basket_legs(router):
+    intent = router.route("buy AAPL 10 MSFT 5 and sell 3 TSLA")
+    assert intent.name == "trade"
+    assert intent.slots["legs"] == [
+        {"trade_type": "BUY", "symbol": "AAPL", "shares": 10},
+        {"trade_type": "BUY", "symbol": "MSFT", "shares": 5},
+        {"trade_type": "SELL", "symbol": "TSLA", "shares": 3},
+    ]
+    assert intent.slots["symbol"] == "AAPL" and intent.slots["shares"] == 10
+
+
+def test_multi_word_names_in_baskets(router):
+    assert router.route("buy tata motors 10 and sell 2 state bank of india").slots["legs"] == [
+        {"trade_type": "BUY", "symbol": "TATAMOTORS.NS", "shares": 10},
+        {"trade_type": "SELL", "symbol": "SBIN.NS", "shares": 2},
+    ]
+
+
+def test_single_leg_orders_have_one_leg(router):
+    assert router.route("buy AAPL 10 MSFT").slots["legs"] == [
+        {"trade_type": "BUY", "symbol": "AAPL", "shares": 10},
+    ]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("hello there", {"action": "CHAT", "type": "greeting"}),
+    ("why did it drop", {"action": "CHAT", "type": "question"}),
+    ("I want to buy Apple", {"action": "BUY", "symbol": "AAPL"}),
+    ("time to dump TSLA", {"action": "SELL", "symbol": "TSLA"}),
+    ("buy something nice", {"action": "ANALYZE"}),
+    ("this is fine", {"action": "ANALYZE"}),
+])
+def test_sentiment(router, text, expected):
+    assert router.sentiment(text) == expected
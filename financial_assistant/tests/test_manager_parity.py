@@ -0,0 +1,56 @@
+"""DatabaseManager and AsyncDatabaseManager must answer the same way.
+
+Only the paths that reject a request before touching the database are
+covered here; benchmarks/check_async_parity.py runs the full scripted
+session against a live Postgres.
+"""
+import asyncio
+import pytest
+from src.market.providers import FixtureProvider
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("asyncpg")
+
+from src.database.database_manager import DatabaseManager  # noqa: E402
+from src.database.async_database_manager import AsyncDatabaseManager  # noqa: E402
+
+ACCOUNT = "PARITY0001"
+
+CASES = [
+    ("empty basket", "execute_trades", (ACCOUNT, []),
+     {"status": "error", "message": "No orders to execute"}),
+    ("unsupported order", "execute_trades",
+     (ACCOUNT, [{"trade_type": "HOLD", "symbol": "AAPL", "shares": 1, "price": 1.0}]),
+     {"status": "error", "message": "Unsupported trade type: HOLD"}),
+    ("zero shares", "execute_trades",
+     (ACCOUNT, [{"trade_type": "BUY", "symbol": "AAPL", "shares": 0, "price": 1.0}]),
+     {"status": "error", "message": "Number of shares must be positive."}),
+    ("negative deposit", "deposit", (ACCOUNT, -1),
+     {"status": "error", "message": "Deposit amount must be positive."}),
+    ("zero deposit", "deposit", (ACCOUNT, 0),
+     {"status": "error", "message": "Deposit amount must be positive."}),
+    ("signup without password", "create_user", ({"email": "a@b.c", "account_number": ACCOUNT},),
+     {"status": "error", "message": "Missing required fields: password"}),
+]
+
+
+@pytest.fixture
+def managers(monkeypatch):
+    # No connection is opened up front, so none of this needs a database
+    monkeypatch.setenv("DB_POOL_MIN_SIZE", "0")
+    monkeypatch.setenv("ACCOUNT_CACHE_TTL", "0")
+    monkeypatch.setenv("DB_REPLICA_DSNS", "")
+    provider = FixtureProvider({"AAPL": {"price": 150.0}})
+    sync_db = DatabaseManager(provider=provider)
+    async_db = AsyncDatabaseManager(provider=provider)
+    yield sync_db, async_db
+    asyncio.run(async_db.close())
+    sync_db.close()
+
+
+@pytest.mark.parametrize("label, method, args, expected", CASES, ids=[case[0] for case in CASES])
+def test_rejections_match(managers, label, method, args, expected):
+    sync_db, async_db = managers
+    sync_result = getattr(sync_db, method)(*args)
+    async_result = asyncio.run(getattr(async_db, method)(*args))
+    assert sync_result == async_result == expected